@@ -6,25 +6,26 @@ Open source video upscaling application using AI models
 
 import sys
 import os
+import importlib.util
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
-    try:
-        import gradio
-        import torch
-        import cv2
-        import numpy
-        return True
-    except ImportError as e:
-        print(f"ERROR: Missing required dependency: {e}")
+    # find_spec only locates the modules, it does not execute them, so this
+    # check stays fast even though torch/gradio take seconds to import
+    missing = [m for m in ("gradio", "torch", "cv2", "numpy") if importlib.util.find_spec(m) is None]
+
+    if missing:
+        print(f"ERROR: Missing required dependency: {', '.join(missing)}")
         print("\nPlease run the installation script:")
         print("  Windows: install.bat")
         print("  Linux/macOS: ./install.sh")
         return False
 
+    return True
+
 def main():
     """Main application entry point"""
     print("=" * 50)
@@ -5,10 +5,40 @@ where functional_tensor was merged into functional.
 """
 import os
 import sys
+from pathlib import Path
+
+# Records which degradations.py was patched (path and mtime), so repeated
+# launches skip importing basicsr and scanning the file
+SENTINEL_FILE = Path.home() / '.cache' / 'video-upscaler-pro' / 'basicsr_patched_v1'
+
+
+def _sentinel_is_valid():
+    """Check that the sentinel matches the current, unmodified patched file"""
+    try:
+        patched_file, mtime = SENTINEL_FILE.read_text(encoding='utf-8').splitlines()
+        return os.stat(patched_file).st_mtime_ns == int(mtime)
+    except (OSError, ValueError):
+        return False
+
+
+def _write_sentinel(degradations_file):
+    """Remember that degradations_file is patched"""
+    try:
+        SENTINEL_FILE.parent.mkdir(parents=True, exist_ok=True)
+        mtime = os.stat(degradations_file).st_mtime_ns
+        SENTINEL_FILE.write_text(f"{degradations_file}\n{mtime}\n", encoding='utf-8')
+    except OSError:
+        pass
+
 
 def fix_basicsr_imports():
     """Fix the torchvision import in basicsr degradations.py"""
 
+    # A reinstalled basicsr changes the file's mtime, so it gets re-patched
+    if _sentinel_is_valid():
+        print("basicsr is already patched!")
+        return True
+
     # Find the basicsr installation
     # Try importing first, but if it fails due to the import error, find it manually
     try:
@@ -47,6 +77,7 @@ def fix_basicsr_imports():
     # Check if already patched
     if 'PATCHED FOR TORCHVISION 0.20+' in content:
         print("File is already patched!")
+        _write_sentinel(degradations_file)
         return True
 
     # Replace the problematic import
@@ -64,6 +95,8 @@ except (ImportError, ModuleNotFoundError):
         with open(degradations_file, 'w', encoding='utf-8') as f:
             f.write(content)
 
+        _write_sentinel(degradations_file)
+
         print("Successfully patched basicsr!")
         print("The import error should now be fixed.")
         return True
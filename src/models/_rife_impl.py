@@ -0,0 +1,1171 @@
+"""
+RIFE Model Implementation
+Heavy part of models.rife_model, loaded on first attribute access
+"""
+
+import hashlib
+import importlib.util
+import torch
+import numpy as np
+import cv2
+from typing import Optional, List, Tuple
+import logging
+
+from utils.model_downloader import get_model_dir
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Try importing RIFE (if installed from pip or locally)
+    import sys
+    import os
+
+    # RIFE might not be available as a pip package
+    # We'll implement a basic version or require manual installation
+    RIFE_AVAILABLE = False
+
+    # Check if RIFE is available in the local installation
+    # User needs to clone: https://github.com/megvii-research/ECCV2022-RIFE
+
+except ImportError:
+    RIFE_AVAILABLE = False
+    logger.warning("RIFE not available. See installation instructions.")
+
+
+def _cv2_cuda_available() -> bool:
+    """Check whether OpenCV was built with CUDA and sees a device"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _nvof_available() -> bool:
+    """
+    Check for NVIDIA hardware optical flow (NVOFA) through OpenCV
+
+    Needs an OpenCV build with the CUDA optflow module and a Turing or
+    newer GPU (compute capability 7.5+), where the flow engine is a
+    dedicated block that leaves the CUDA cores free.
+    """
+    if not _cv2_cuda_available() or not hasattr(cv2.cuda, 'NvidiaOpticalFlow_2_0_create'):
+        return False
+    try:
+        info = cv2.cuda.DeviceInfo()
+        return (info.majorVersion(), info.minorVersion()) >= (7, 5)
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _warp_blend(first, second, flows, base, norm, timesteps: Tuple[float, ...]):
+    """
+    Warp every pair towards each timestep and blend the two warps
+
+    Kept as a free function so it can be wrapped by torch.compile.
+
+    Args:
+        first: (N, 3, H, W) float first frames
+        second: (N, 3, H, W) float second frames
+        flows: (N, H, W, 2) flow from first to second, in pixels
+        base: Pixel coordinate grid from _get_torch_grid
+        norm: Grid normalization from _get_torch_grid
+        timesteps: Positions of the intermediate frames in (0, 1)
+
+    Returns:
+        torch.Tensor: (T, N, H, W, 3) uint8 frames
+    """
+    import torch.nn.functional as F
+
+    steps = []
+    for t in timesteps:
+        grid_fwd = (base + flows * t) * norm - 1
+        grid_back = (base - flows * (1 - t)) * norm - 1
+
+        warped1 = F.grid_sample(first, grid_fwd, mode='bilinear', padding_mode='border', align_corners=True)
+        warped2 = F.grid_sample(second, grid_back, mode='bilinear', padding_mode='border', align_corners=True)
+
+        blended = torch.lerp(warped1, warped2, t).round_().clamp_(0, 255)
+        steps.append(blended.to(torch.uint8).permute(0, 2, 3, 1))
+
+    return torch.stack(steps)
+
+
+class _WarpBlendModule(torch.nn.Module):
+    """_warp_blend with fixed timesteps, as a module for TensorRT export"""
+
+    def __init__(self, timesteps: Tuple[float, ...]):
+        super().__init__()
+        self.timesteps = tuple(timesteps)
+
+    def forward(self, first, second, flows, base, norm):
+        return _warp_blend(first, second, flows, base, norm, self.timesteps)
+
+
+class RIFEModel:
+    """RIFE model wrapper for frame interpolation"""
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        scale: float = 1.0,
+        device: str = 'cuda',
+        fp16: bool = False,
+        flow_backend: str = 'auto'
+    ):
+        """
+        Initialize RIFE model
+
+        Args:
+            model_path: Path to RIFE model weights
+            scale: Scale factor for output
+            device: 'cuda' or 'cpu'
+            fp16: Use FP16 (half precision)
+            flow_backend: Optical flow for the fallback interpolation:
+                          'farneback', 'dis' (OpenCV DIS, fast on CPU),
+                          'nvof' (NVIDIA hardware optical flow) or 'auto'
+                          (nvof when available, dis on CPU)
+        """
+        self.device = device
+        self.scale = scale
+        self.fp16 = fp16
+        self.model = None
+
+        # Batched GPU warp/blend, replaced by a compiled version in compile_model()
+        self._warp_blend = _warp_blend
+        self.compiled = False
+
+        # TensorRT warp/blend engine for one (batch, size, timesteps) shape;
+        # _trt_shape is its (height, width, max_batch)
+        self._trt_key = None
+        self._trt_warp = None
+        self._trt_timesteps = None
+        self._trt_shape = None
+
+        if flow_backend == 'auto':
+            if device == 'cuda':
+                flow_backend = 'nvof' if _nvof_available() else 'farneback'
+            else:
+                flow_backend = 'dis'
+        elif flow_backend == 'nvof' and not _nvof_available():
+            logger.warning("NVIDIA hardware optical flow not available, using Farneback")
+            flow_backend = 'farneback'
+        self.flow_backend = flow_backend
+
+        # NVOF sessions are created per frame size
+        self._nvof = {}
+
+        # Pixel coordinate grids keyed by (height, width)
+        self._grid_cache = {}
+        self._torch_grid_cache = {}
+
+        # Reusable staging buffers for the batched GPU path
+        self._host_buffers = {}
+        self._device_buffers = {}
+
+        # Reusable flow estimator and its output buffer
+        self._flow = cv2.FarnebackOpticalFlow.create(
+            numLevels=3,
+            pyrScale=0.5,
+            fastPyramids=False,
+            winSize=15,
+            numIters=3,
+            polyN=5,
+            polySigma=1.2,
+            flags=0
+        )
+        if flow_backend == 'dis':
+            # DIS is ~10x faster than Farneback on the CPU at similar
+            # accuracy, and has the same calc() interface
+            self._flow = cv2.DISOpticalFlow_create(cv2.DISOPTICAL_FLOW_PRESET_FAST)
+        self._flow_buf = None
+
+        # OpenCV CUDA path (only with a CUDA-enabled OpenCV build)
+        self._cuda_flow = None
+        self._cuda_grid_cache = {}
+        if device == 'cuda' and flow_backend == 'farneback' and _cv2_cuda_available():
+            self._cuda_flow = cv2.cuda_FarnebackOpticalFlow.create(
+                numLevels=3,
+                pyrScale=0.5,
+                fastPyramids=False,
+                winSize=15,
+                numIters=3,
+                polyN=5,
+                polySigma=1.2,
+                flags=0
+            )
+            logger.info("Using OpenCV CUDA for optical flow interpolation")
+
+        if not RIFE_AVAILABLE:
+            logger.warning(
+                "RIFE not available. Please install RIFE:\n"
+                "  1. Clone: git clone https://github.com/megvii-research/ECCV2022-RIFE\n"
+                "  2. Follow installation instructions in the repo\n"
+                "  3. Or use the simplified version below"
+            )
+            # Use simplified interpolation as fallback
+            self._use_simple_interpolation = True
+        else:
+            self._use_simple_interpolation = False
+            self._load_model(model_path)
+
+    def _load_model(self, model_path: Optional[str] = None):
+        """
+        Load RIFE model
+
+        Args:
+            model_path: Path to model weights
+        """
+        try:
+            # This would load the actual RIFE model
+            # Since RIFE is not a simple pip package, we provide a fallback
+            logger.info("Loading RIFE model...")
+
+            # TODO: Implement actual RIFE model loading
+            # For now, we'll use optical flow-based interpolation
+            self._use_simple_interpolation = True
+
+            logger.info("RIFE model loaded (using fallback implementation)")
+
+        except Exception as e:
+            logger.error(f"Failed to load RIFE model: {e}")
+            logger.warning("Using simple interpolation fallback")
+            self._use_simple_interpolation = True
+
+    def interpolate_frames(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        num_intermediates: int = 1,
+        timestep: Optional[float] = None
+    ) -> List[np.ndarray]:
+        """
+        Interpolate frames between frame1 and frame2
+
+        Args:
+            frame1: First frame (BGR, numpy array)
+            frame2: Second frame (BGR, numpy array)
+            num_intermediates: Number of intermediate frames to generate
+            timestep: Specific timestep (0-1, None = evenly spaced)
+
+        Returns:
+            list: List of interpolated frames
+        """
+        if self._use_simple_interpolation:
+            return self._simple_interpolation(frame1, frame2, num_intermediates, timestep)
+        else:
+            return self._rife_interpolation(frame1, frame2, num_intermediates, timestep)
+
+    def _simple_interpolation(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        num_intermediates: int = 1,
+        timestep: Optional[float] = None,
+        flow_inputs: Optional[tuple] = None
+    ) -> List[np.ndarray]:
+        """
+        Simple optical flow-based interpolation (fallback)
+
+        Args:
+            frame1: First frame
+            frame2: Second frame
+            num_intermediates: Number of frames to generate
+            timestep: Specific timestep (0-1)
+            flow_inputs: Precomputed (_flow_input(frame1), _flow_input(frame2))
+
+        Returns:
+            list: Interpolated frames
+        """
+        result = []
+
+        if timestep is not None:
+            # Generate single frame at specific timestep
+            timesteps = [timestep]
+        else:
+            # Generate evenly spaced frames
+            timesteps = [(i + 1) / (num_intermediates + 1) for i in range(num_intermediates)]
+
+        if self._cuda_flow is not None:
+            try:
+                return self._simple_interpolation_cuda(frame1, frame2, timesteps)
+            except cv2.error as e:
+                logger.warning(f"OpenCV CUDA interpolation failed, using CPU: {e}")
+                self._cuda_flow = None
+
+        height, width = frame1.shape[:2]
+        flow = self._estimate_flow(frame1, frame2, flow_inputs)
+
+        # Mesh grid is shared by every timestep and every call at this size
+        x, y = self._get_grid(height, width)
+        flow_x = flow[..., 0]
+        flow_y = flow[..., 1]
+
+        # Warp maps are rewritten in place for each timestep
+        map_x = np.empty((height, width), dtype=np.float32)
+        map_y = np.empty((height, width), dtype=np.float32)
+        map_x_back = np.empty((height, width), dtype=np.float32)
+        map_y_back = np.empty((height, width), dtype=np.float32)
+
+        # Backward warp is scratch only; the forward warp buffer becomes the
+        # returned frame, so it has to be fresh for each timestep
+        warped2 = np.empty_like(frame2)
+
+        for t in timesteps:
+            # Calculate warped coordinates
+            np.multiply(flow_x, t, out=map_x)
+            np.add(x, map_x, out=map_x)
+            np.multiply(flow_y, t, out=map_y)
+            np.add(y, map_y, out=map_y)
+
+            # Warp first frame forward. Samples that fall outside the frame
+            # take the edge colour instead of black, so pans don't darken
+            # the borders of the blend
+            warped1 = cv2.remap(frame1, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+            # Warp second frame backward: x - flow * (1 - t) is the forward
+            # map minus the flow, a single pass per axis
+            np.subtract(map_x, flow_x, out=map_x_back)
+            np.subtract(map_y, flow_y, out=map_y_back)
+            cv2.remap(frame2, map_x_back, map_y_back, cv2.INTER_LINEAR, dst=warped2, borderMode=cv2.BORDER_REPLICATE)
+
+            # Blend warped frames in place - warped1 is already a fresh
+            # buffer, so the blend needs no third frame-sized allocation
+            interpolated = cv2.addWeighted(warped1, 1 - t, warped2, t, 0, dst=warped1)
+
+            result.append(interpolated)
+
+        return result
+
+    def _simple_interpolation_cuda(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        timesteps: List[float]
+    ) -> List[np.ndarray]:
+        """
+        Optical flow interpolation on the GPU with OpenCV CUDA
+
+        Same algorithm as the CPU path. Both frames are uploaded once, every
+        operation runs on one stream, and only the results are downloaded.
+
+        Args:
+            frame1: First frame
+            frame2: Second frame
+            timesteps: Timesteps (0-1) to generate
+
+        Returns:
+            list: Interpolated frames
+        """
+        height, width = frame1.shape[:2]
+        stream = cv2.cuda_Stream()
+
+        gpu1 = cv2.cuda_GpuMat()
+        gpu2 = cv2.cuda_GpuMat()
+        gpu1.upload(frame1, stream)
+        gpu2.upload(frame2, stream)
+
+        # Half-resolution flow, as on the CPU
+        gray1 = cv2.cuda.cvtColor(gpu1, cv2.COLOR_BGR2GRAY, stream=stream)
+        gray2 = cv2.cuda.cvtColor(gpu2, cv2.COLOR_BGR2GRAY, stream=stream)
+        small1 = cv2.cuda.pyrDown(gray1, stream=stream)
+        small2 = cv2.cuda.pyrDown(gray2, stream=stream)
+        flow_small = self._cuda_flow.calc(small1, small2, None, stream)
+
+        # Per-axis flow at full resolution; the x2 vector scale is folded
+        # into the map weights below
+        flow_x, flow_y = [
+            cv2.cuda.resize(channel, (width, height), interpolation=cv2.INTER_LINEAR, stream=stream)
+            for channel in cv2.cuda.split(flow_small, stream=stream)
+        ]
+
+        grid_x, grid_y = self._get_cuda_grid(height, width, stream)
+
+        downloads = []
+        for t in timesteps:
+            # Warp first frame forward
+            map_x = cv2.cuda.addWeighted(flow_x, 2.0 * t, grid_x, 1.0, 0.0, stream=stream)
+            map_y = cv2.cuda.addWeighted(flow_y, 2.0 * t, grid_y, 1.0, 0.0, stream=stream)
+            warped1 = cv2.cuda.remap(gpu1, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE, stream=stream)
+
+            # Warp second frame backward
+            map_x = cv2.cuda.addWeighted(flow_x, -2.0 * (1 - t), grid_x, 1.0, 0.0, stream=stream)
+            map_y = cv2.cuda.addWeighted(flow_y, -2.0 * (1 - t), grid_y, 1.0, 0.0, stream=stream)
+            warped2 = cv2.cuda.remap(gpu2, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE, stream=stream)
+
+            # Blend warped frames
+            interpolated = cv2.cuda.addWeighted(warped1, 1 - t, warped2, t, 0.0, stream=stream)
+            downloads.append(interpolated.download(stream))
+
+        stream.waitForCompletion()
+
+        return downloads
+
+    def _get_cuda_grid(self, height: int, width: int, stream):
+        """
+        Get cached pixel coordinate grids uploaded to the GPU
+
+        Args:
+            height: Frame height
+            width: Frame width
+            stream: cv2.cuda_Stream used for the upload
+
+        Returns:
+            tuple: (x, y) cv2.cuda_GpuMat coordinate grids
+        """
+        key = (height, width)
+        grid = self._cuda_grid_cache.get(key)
+
+        if grid is None:
+            grid = []
+            for host in self._get_grid(height, width):
+                gpu = cv2.cuda_GpuMat()
+                gpu.upload(host, stream)
+                grid.append(gpu)
+            grid = tuple(grid)
+            self._cuda_grid_cache[key] = grid
+
+        return grid
+
+    def _flow_input(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Prepare a frame for flow estimation (half-resolution grayscale)
+
+        Flow is calculated at half resolution - the flow field is smooth, so
+        this costs ~4x less and loses very little accuracy. In a sequence
+        every frame is the second frame of one pair and the first of the
+        next, so callers can compute this once per frame and pass it on.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.flow_backend == 'nvof':
+            # The hardware engine is fast enough for full resolution
+            return gray
+        return cv2.pyrDown(gray)
+
+    def _estimate_flow(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        flow_inputs: Optional[tuple] = None
+    ) -> np.ndarray:
+        """
+        Estimate dense optical flow from frame1 to frame2
+
+        Args:
+            frame1: First frame (BGR)
+            frame2: Second frame (BGR)
+            flow_inputs: Precomputed (_flow_input(frame1), _flow_input(frame2))
+
+        Returns:
+            numpy.ndarray: Flow field (H, W, 2), float32, in pixels
+        """
+        if flow_inputs is None:
+            flow_inputs = (self._flow_input(frame1), self._flow_input(frame2))
+        small1, small2 = flow_inputs
+
+        height, width = frame1.shape[:2]
+
+        if self.flow_backend == 'nvof':
+            return self._estimate_flow_nvof(small1, small2)
+
+        if self._flow_buf is None or self._flow_buf.shape[:2] != small1.shape:
+            self._flow_buf = np.empty(small1.shape + (2,), dtype=np.float32)
+
+        flow_small = self._flow.calc(small1, small2, self._flow_buf)
+
+        # Back to full resolution (vectors scale with the image)
+        flow = cv2.resize(flow_small, (width, height), interpolation=cv2.INTER_LINEAR)
+        flow *= 2.0
+
+        return flow
+
+    def _estimate_flow_nvof(self, gray1: np.ndarray, gray2: np.ndarray) -> np.ndarray:
+        """
+        Estimate dense optical flow on the NVIDIA optical flow engine
+
+        Args:
+            gray1: First frame, full-resolution grayscale
+            gray2: Second frame, full-resolution grayscale
+
+        Returns:
+            numpy.ndarray: Flow field (H, W, 2), float32, in pixels
+        """
+        height, width = gray1.shape[:2]
+        nvof = self._nvof.get((height, width))
+
+        if nvof is None:
+            nvof = cv2.cuda.NvidiaOpticalFlow_2_0_create(
+                (width, height),
+                perfPreset=getattr(cv2.cuda, 'NvidiaOpticalFlow_2_0_NV_OF_PERF_LEVEL_FAST', 20)
+            )
+            self._nvof[(height, width)] = nvof
+
+        # Flow of gray1's pixels towards gray2, one vector per pixel
+        flow, _ = nvof.calc(gray1, gray2, None)
+        flow = nvof.convertToFloat(flow, None)
+        if isinstance(flow, cv2.cuda_GpuMat):
+            flow = flow.download()
+
+        return flow
+
+    def _get_grid(self, height: int, width: int):
+        """
+        Get cached float32 pixel coordinate grids for a frame size
+
+        Args:
+            height: Frame height
+            width: Frame width
+
+        Returns:
+            tuple: (x, y) coordinate arrays of shape (height, width)
+        """
+        key = (height, width)
+        grid = self._grid_cache.get(key)
+
+        if grid is None:
+            grid = np.meshgrid(
+                np.arange(width, dtype=np.float32),
+                np.arange(height, dtype=np.float32)
+            )
+            self._grid_cache[key] = grid
+
+        return grid
+
+    def _rife_interpolation(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        num_intermediates: int = 1,
+        timestep: Optional[float] = None
+    ) -> List[np.ndarray]:
+        """
+        RIFE-based interpolation (when RIFE is available)
+
+        Args:
+            frame1: First frame
+            frame2: Second frame
+            num_intermediates: Number of frames to generate
+            timestep: Specific timestep
+
+        Returns:
+            list: Interpolated frames
+        """
+        # This would use the actual RIFE model
+        # For now, fall back to simple interpolation
+        return self._simple_interpolation(frame1, frame2, num_intermediates, timestep)
+
+    def interpolate_sequence(
+        self,
+        frames: List[np.ndarray],
+        multiplier: int = 2
+    ) -> List[np.ndarray]:
+        """
+        Interpolate a sequence of frames
+
+        Args:
+            frames: List of input frames
+            multiplier: FPS multiplier (2 = double fps, 4 = quadruple, etc.)
+
+        Returns:
+            list: Interpolated sequence
+        """
+        if multiplier == 1:
+            return frames
+
+        num_intermediates = multiplier - 1
+
+        if self._use_simple_interpolation and self.device == 'cuda' and torch.cuda.is_available():
+            try:
+                return self._batch_interpolate(frames, num_intermediates)
+            except RuntimeError as e:
+                logger.warning(f"Batched GPU interpolation failed, using per-pair CPU path: {e}")
+
+        result = []
+
+        # Rolling flow input: each frame is converted once, not once per pair
+        next_input = self._flow_input(frames[0]) if self._use_simple_interpolation else None
+
+        for i in range(len(frames) - 1):
+            # Add original frame
+            result.append(frames[i])
+
+            # Add interpolated frames
+            if self._use_simple_interpolation:
+                prev_input, next_input = next_input, self._flow_input(frames[i + 1])
+                interpolated = self._simple_interpolation(
+                    frames[i],
+                    frames[i + 1],
+                    num_intermediates,
+                    flow_inputs=(prev_input, next_input)
+                )
+            else:
+                interpolated = self.interpolate_frames(
+                    frames[i],
+                    frames[i + 1],
+                    num_intermediates
+                )
+            result.extend(interpolated)
+
+        # Add last frame
+        result.append(frames[-1])
+
+        return result
+
+    def interpolate_frames_batched(
+        self,
+        pairs: List[Tuple[np.ndarray, np.ndarray]],
+        num_intermediates: int = 1
+    ) -> List[List[np.ndarray]]:
+        """
+        Interpolate several frame pairs in one call
+
+        On CUDA the warp and blend of all pairs run as one batch per
+        timestep. Consecutive pairs that share a frame (pairs[k][1] is
+        pairs[k + 1][0], as when walking through a video) convert and
+        upload that frame only once.
+
+        Args:
+            pairs: (frame1, frame2) pairs of same-sized BGR frames
+            num_intermediates: Number of intermediate frames per pair
+
+        Returns:
+            list: For each pair, the list of interpolated frames
+        """
+        if not pairs:
+            return []
+
+        if not self._use_simple_interpolation:
+            return [self.interpolate_frames(frame1, frame2, num_intermediates) for frame1, frame2 in pairs]
+
+        # Flow inputs by frame identity, so shared frames are converted once
+        flow_inputs = {}
+
+        def flow_input(frame):
+            key = id(frame)
+            if key not in flow_inputs:
+                flow_inputs[key] = self._flow_input(frame)
+            return flow_inputs[key]
+
+        if self.device == 'cuda' and torch.cuda.is_available():
+            try:
+                return self._warp_pairs_gpu(pairs, num_intermediates, flow_input)
+            except RuntimeError as e:
+                logger.warning(f"Batched GPU interpolation failed, using per-pair CPU path: {e}")
+
+        return [
+            self._simple_interpolation(
+                frame1,
+                frame2,
+                num_intermediates,
+                flow_inputs=(flow_input(frame1), flow_input(frame2))
+            )
+            for frame1, frame2 in pairs
+        ]
+
+    def _batch_interpolate(
+        self,
+        frames: List[np.ndarray],
+        num_intermediates: int,
+        pairs_per_batch: int = 8
+    ) -> List[np.ndarray]:
+        """
+        Interpolate a sequence with the warp and blend batched on the GPU
+
+        Args:
+            frames: List of input frames (BGR)
+            num_intermediates: Number of frames to generate per pair
+            pairs_per_batch: Frame pairs sent to the GPU at once
+
+        Returns:
+            list: Interpolated sequence
+        """
+        result = []
+        flow_inputs = {}
+
+        def flow_input(frame):
+            key = id(frame)
+            if key not in flow_inputs:
+                flow_inputs[key] = self._flow_input(frame)
+            return flow_inputs[key]
+
+        for start in range(0, len(frames) - 1, pairs_per_batch):
+            end = min(start + pairs_per_batch, len(frames) - 1)
+            pairs = list(zip(frames[start:end], frames[start + 1:end + 1]))
+
+            for (frame, _), interpolated in zip(pairs, self._warp_pairs_gpu(pairs, num_intermediates, flow_input)):
+                result.append(frame)
+                result.extend(interpolated)
+
+            # Only the frame shared with the next batch is still needed
+            flow_inputs = {id(frames[end]): flow_input(frames[end])}
+
+        result.append(frames[-1])
+
+        return result
+
+    def _warp_pairs_gpu(
+        self,
+        pairs: List[Tuple[np.ndarray, np.ndarray]],
+        num_intermediates: int,
+        flow_input
+    ) -> List[List[np.ndarray]]:
+        """
+        Warp and blend a batch of frame pairs on the GPU
+
+        Optical flow is still estimated per pair on the CPU, but all pairs
+        are uploaded together and warped and blended with a single
+        grid_sample call per timestep.
+
+        Args:
+            pairs: (frame1, frame2) pairs of same-sized BGR frames
+            num_intermediates: Number of frames to generate per pair
+            flow_input: Callable returning the flow input of a frame
+
+        Returns:
+            list: For each pair, the list of interpolated frames
+        """
+        device = torch.device(self.device)
+        height, width = pairs[0][0].shape[:2]
+        timesteps = [(i + 1) / (num_intermediates + 1) for i in range(num_intermediates)]
+        base, norm = self._get_torch_grid(height, width, device)
+
+        # A chain of consecutive pairs uploads each frame once
+        chained = all(pairs[k][1] is pairs[k + 1][0] for k in range(len(pairs) - 1))
+        if chained:
+            frames = [pairs[0][0]] + [frame2 for _, frame2 in pairs]
+        else:
+            frames = [frame for pair in pairs for frame in pair]
+
+        # Stage frames and flows in reused (pinned on CUDA) host buffers
+        host = self._staging_buffer(self._host_buffers, 'frames', (len(frames), height, width, 3), torch.uint8, device)
+        np.stack(frames, out=host.numpy())
+
+        flows_host = self._staging_buffer(self._host_buffers, 'flows', (len(pairs), height, width, 2), torch.float32, device)
+        np.stack([
+            self._estimate_flow(frame1, frame2, (flow_input(frame1), flow_input(frame2)))
+            for frame1, frame2 in pairs
+        ], out=flows_host.numpy())
+
+        with torch.no_grad():
+            if device.type == 'cuda':
+                frames_dev = self._staging_buffer(self._device_buffers, 'frames', tuple(host.shape), torch.uint8, device)
+                flows = self._staging_buffer(self._device_buffers, 'flows', tuple(flows_host.shape), torch.float32, device)
+                frames_dev.copy_(host, non_blocking=True)
+                flows.copy_(flows_host, non_blocking=True)
+            else:
+                frames_dev, flows = host, flows_host
+
+            # NHWC upload viewed as NCHW is already channels_last
+            batch = frames_dev.permute(0, 3, 1, 2).float().contiguous(memory_format=torch.channels_last)
+            if chained:
+                first, second = batch[:-1], batch[1:]
+            else:
+                first, second = batch[0::2], batch[1::2]
+
+            args = (first, second, flows, base, norm, tuple(timesteps))
+            if self._trt_fits(height, width, len(pairs), args[-1]):
+                steps = self._trt_warp(*args[:-1])
+            else:
+                try:
+                    steps = self._warp_blend(*args)
+                except Exception as e:
+                    if not self.compiled:
+                        raise
+                    logger.warning(f"Compiled warp failed, using eager mode: {e}")
+                    self._warp_blend = _warp_blend
+                    self.compiled = False
+                    steps = _warp_blend(*args)
+
+            # One device-to-host copy for all timesteps
+            steps = steps.cpu().numpy()
+
+        return [list(steps[:, offset]) for offset in range(len(pairs))]
+
+    def _trt_fits(self, height: int, width: int, num_pairs: int, timesteps: Tuple[float, ...]) -> bool:
+        """
+        Check whether the TensorRT engine was built for this batch
+
+        The engine only accepts its own frame size and at most the batch
+        size it was built for; anything else (a clip of another resolution,
+        a larger batch) goes through the eager or compiled warp instead.
+        """
+        if self._trt_warp is None or timesteps != self._trt_timesteps:
+            return False
+        trt_height, trt_width, max_batch = self._trt_shape
+        return (height, width) == (trt_height, trt_width) and num_pairs <= max_batch
+
+    def compile_model(self) -> bool:
+        """
+        Compile the batched GPU warp/blend with torch.compile
+
+        Fuses the grid math, both grid_samples and the blend of every
+        timestep into few kernels; 'reduce-overhead' also captures them in
+        a CUDA graph. Compilation happens on the first batch; if it fails
+        there, interpolation continues in eager mode.
+
+        Returns:
+            bool: True if the warp/blend will run compiled
+        """
+        if self.compiled:
+            return True
+
+        if self.device != 'cuda' or not torch.cuda.is_available():
+            return False
+
+        try:
+            self._warp_blend = torch.compile(_warp_blend, mode='reduce-overhead', fullgraph=False, dynamic=False)
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager mode: {e}")
+            return False
+
+        self.compiled = True
+        logger.info("RIFE warp/blend compiled (mode=reduce-overhead)")
+
+        return True
+
+    def compile_tensorrt(self, frame_size: tuple, batch_size: int, num_intermediates: int) -> bool:
+        """
+        Build a TensorRT engine for the batched warp/blend with torch_tensorrt
+
+        CUDA only, and only when torch_tensorrt is installed. The engine is
+        specialised for the frame size, the number of intermediate frames
+        and up to batch_size pairs per call, and saved under the model
+        directory so later runs on the same resolution load it instead of
+        rebuilding. Any failure leaves the eager (or compiled) path in place.
+
+        Args:
+            frame_size: Frame size (width, height)
+            batch_size: Maximum number of pairs per call
+            num_intermediates: Number of intermediate frames per pair
+
+        Returns:
+            bool: True if the TensorRT engine is in use
+        """
+        if self.device != 'cuda' or not torch.cuda.is_available():
+            return False
+        if importlib.util.find_spec('torch_tensorrt') is None:
+            logger.info("torch_tensorrt not installed, skipping TensorRT")
+            return False
+
+        import torch_tensorrt
+
+        width, height = frame_size
+        timesteps = tuple((i + 1) / (num_intermediates + 1) for i in range(num_intermediates))
+        arch = '.'.join(map(str, torch.cuda.get_device_capability()))
+        key = f"rife-warp-{batch_size}x{height}x{width}-t{num_intermediates}-sm{arch}"
+        engine_path = get_model_dir().parent / 'tensorrt' / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.ep"
+
+        if self._trt_key == key:
+            return True
+
+        device = torch.device(self.device)
+        base, norm = self._get_torch_grid(height, width, device)
+        example = (
+            torch.zeros(batch_size, 3, height, width, device=device),
+            torch.zeros(batch_size, 3, height, width, device=device),
+            torch.zeros(batch_size, height, width, 2, device=device),
+            base,
+            norm
+        )
+
+        try:
+            if engine_path.exists():
+                trt_model = torch_tensorrt.load(str(engine_path)).module()
+                logger.info(f"Loaded TensorRT engine: {engine_path}")
+            else:
+                logger.info(f"Building TensorRT warp engine for {batch_size}x{width}x{height} (first run only)...")
+                # The last batch of a video can hold fewer pairs
+                trt_inputs = [
+                    torch_tensorrt.Input(
+                        min_shape=(1,) + tuple(tensor.shape[1:]),
+                        opt_shape=tuple(tensor.shape),
+                        max_shape=tuple(tensor.shape)
+                    )
+                    for tensor in example[:3]
+                ] + [torch_tensorrt.Input(tuple(tensor.shape)) for tensor in example[3:]]
+                trt_model = torch_tensorrt.compile(
+                    _WarpBlendModule(timesteps).eval(),
+                    ir='dynamo',
+                    inputs=trt_inputs,
+                    enabled_precisions={torch.float32}
+                )
+                engine_path.parent.mkdir(parents=True, exist_ok=True)
+                torch_tensorrt.save(trt_model, str(engine_path), inputs=list(example))
+
+            with torch.inference_mode():
+                trt_model(*example)
+
+        except Exception as e:
+            logger.warning(f"TensorRT compilation failed, using eager mode: {e}")
+            return False
+
+        self._trt_key = key
+        self._trt_warp = trt_model
+        self._trt_timesteps = timesteps
+        self._trt_shape = (height, width, batch_size)
+        logger.info("RIFE warp/blend running on TensorRT")
+
+        return True
+
+    def _staging_buffer(self, pool: dict, name: str, shape: tuple, dtype, device):
+        """
+        Get a reusable buffer, reallocated only when a larger one is needed
+
+        Host buffers (pool is self._host_buffers) are page-locked when
+        device is CUDA, so uploads from them are asynchronous DMA; device
+        buffers live on the device. The last batch of a video is usually
+        smaller, so the returned tensor is a leading slice.
+
+        Args:
+            pool: self._host_buffers or self._device_buffers
+            name: Buffer slot
+            shape: Required shape (first dimension may vary)
+            dtype: torch dtype
+            device: torch device of the model
+
+        Returns:
+            torch.Tensor: Buffer of exactly `shape`
+        """
+        buffer = pool.get(name)
+
+        if buffer is None or tuple(buffer.shape[1:]) != tuple(shape[1:]) or buffer.shape[0] < shape[0]:
+            if pool is self._device_buffers:
+                buffer = torch.empty(shape, dtype=dtype, device=device)
+            else:
+                buffer = torch.empty(shape, dtype=dtype, pin_memory=device.type == 'cuda')
+            pool[name] = buffer
+
+        return buffer[:shape[0]]
+
+    def _get_torch_grid(self, height: int, width: int, device):
+        """
+        Get the cached pixel grid and pixel -> [-1, 1] scale for grid_sample
+
+        Args:
+            height: Frame height
+            width: Frame width
+            device: torch device
+
+        Returns:
+            tuple: (base grid (H, W, 2), normalisation (2,))
+        """
+        key = (height, width, str(device))
+        grid = self._torch_grid_cache.get(key)
+
+        if grid is None:
+            ys, xs = torch.meshgrid(
+                torch.arange(height, device=device, dtype=torch.float32),
+                torch.arange(width, device=device, dtype=torch.float32),
+                indexing='ij'
+            )
+            base = torch.stack((xs, ys), dim=-1)
+            norm = torch.tensor(
+                [2.0 / max(width - 1, 1), 2.0 / max(height - 1, 1)],
+                device=device
+            )
+            grid = (base, norm)
+            self._torch_grid_cache[key] = grid
+
+        return grid
+
+    def estimate_vram_usage(self, resolution: tuple) -> float:
+        """
+        Estimate VRAM usage in GB
+
+        Args:
+            resolution: (width, height)
+
+        Returns:
+            float: Estimated VRAM in GB
+        """
+        width, height = resolution
+        pixels = width * height
+
+        # Base usage
+        base_usage = 1.0
+
+        # Additional per megapixel
+        per_megapixel = 0.3 if self.fp16 else 0.5
+
+        megapixels = pixels / (1024 * 1024)
+        estimated = base_usage + (megapixels * per_megapixel)
+
+        return estimated
+
+    def clear_cache(self):
+        """Clear CUDA cache"""
+        if self.device == 'cuda' and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.synchronize()
+
+
+def create_rife_model(
+    device: str = 'cuda',
+    fp16: bool = True,
+    model_path: Optional[str] = None,
+    flow_backend: str = 'auto'
+) -> RIFEModel:
+    """
+    Factory function to create RIFE model
+
+    Args:
+        device: 'cuda' or 'cpu'
+        fp16: Use half precision
+        model_path: Path to model weights
+        flow_backend: 'farneback', 'dis', 'nvof' or 'auto'
+
+    Returns:
+        RIFEModel: Initialized model
+    """
+    return RIFEModel(
+        model_path=model_path,
+        device=device,
+        fp16=fp16,
+        flow_backend=flow_backend
+    )
+
+
+class SimpleFrameInterpolator:
+    """
+    Simple frame interpolator using OpenCV
+    Fallback when RIFE is not available
+    """
+
+    def __init__(self, device: str = 'cuda'):
+        """
+        Initialize simple interpolator
+
+        Args:
+            device: Device (not used for OpenCV)
+        """
+        self.device = device
+        self._use_torch = device == 'cuda' and torch.cuda.is_available()
+        logger.info("Using simple OpenCV-based frame interpolation")
+
+    def interpolate(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        alpha: float = 0.5
+    ) -> np.ndarray:
+        """
+        Simple linear interpolation between two frames
+
+        Args:
+            frame1: First frame
+            frame2: Second frame
+            alpha: Interpolation factor (0.5 = middle)
+
+        Returns:
+            numpy.ndarray: Interpolated frame
+        """
+        return cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
+
+    def interpolate_frames(
+        self,
+        frame1: np.ndarray,
+        frame2: np.ndarray,
+        num_intermediates: int = 1
+    ) -> List[np.ndarray]:
+        """
+        Blend evenly spaced intermediate frames between two frames
+
+        Args:
+            frame1: First frame
+            frame2: Second frame
+            num_intermediates: Number of frames to generate
+
+        Returns:
+            list: Interpolated frames
+        """
+        timesteps = np.linspace(0, 1, num_intermediates + 2, dtype=np.float32)[1:-1]
+        return [cv2.addWeighted(frame1, 1 - t, frame2, t, 0, dtype=cv2.CV_8U) for t in timesteps]
+
+    def interpolate_frames_batched(
+        self,
+        pairs: List[Tuple[np.ndarray, np.ndarray]],
+        num_intermediates: int = 1
+    ) -> List[List[np.ndarray]]:
+        """
+        Interpolate several frame pairs (same interface as RIFEModel)
+
+        Args:
+            pairs: (frame1, frame2) pairs
+            num_intermediates: Number of intermediate frames per pair
+
+        Returns:
+            list: For each pair, the list of interpolated frames
+        """
+        if self._use_torch and pairs:
+            return self._blend_pairs_gpu(pairs, num_intermediates)
+
+        return [self.interpolate_frames(frame1, frame2, num_intermediates) for frame1, frame2 in pairs]
+
+    def _blend_pairs_gpu(
+        self,
+        pairs: List[Tuple[np.ndarray, np.ndarray]],
+        num_intermediates: int
+    ) -> List[List[np.ndarray]]:
+        """
+        Blend all pairs of a batch on the GPU with one lerp per timestep
+
+        Consecutive pairs that share a frame upload it once; everything
+        comes back in a single download.
+
+        Args:
+            pairs: (frame1, frame2) pairs of same-sized frames
+            num_intermediates: Number of frames to generate per pair
+
+        Returns:
+            list: For each pair, the list of interpolated frames
+        """
+        chained = all(pairs[k][1] is pairs[k + 1][0] for k in range(len(pairs) - 1))
+        if chained:
+            frames = [pairs[0][0]] + [frame2 for _, frame2 in pairs]
+        else:
+            frames = [frame for pair in pairs for frame in pair]
+
+        timesteps = torch.linspace(0, 1, num_intermediates + 2)[1:-1].tolist()
+
+        with torch.no_grad():
+            batch = torch.from_numpy(np.stack(frames)).pin_memory().to(self.device, non_blocking=True).float()
+            if chained:
+                first, second = batch[:-1], batch[1:]
+            else:
+                first, second = batch[0::2], batch[1::2]
+
+            # (timesteps, pairs, H, W, C)
+            blended = torch.stack([torch.lerp(first, second, t) for t in timesteps])
+            blended = blended.round_().clamp_(0, 255).to(torch.uint8).cpu().numpy()
+
+        return [[blended[step, offset] for step in range(len(timesteps))] for offset in range(len(pairs))]
+
+    def interpolate_sequence(
+        self,
+        frames: List[np.ndarray],
+        multiplier: int = 2
+    ) -> List[np.ndarray]:
+        """
+        Interpolate a sequence of frames
+
+        Args:
+            frames: Input frames
+            multiplier: FPS multiplier
+
+        Returns:
+            list: Interpolated frames
+        """
+        if multiplier == 1:
+            return frames
+
+        result = []
+        num_intermediates = multiplier - 1
+
+        for i in range(len(frames) - 1):
+            result.append(frames[i])
+
+            # Add interpolated frames
+            result.extend(self.interpolate_frames(frames[i], frames[i + 1], num_intermediates))
+
+        result.append(frames[-1])
+
+        return result
@@ -3,24 +3,169 @@ Real-ESRGAN Model Wrapper
 Wrapper for Real-ESRGAN super-resolution model
 """
 
-import torch
-import numpy as np
-import cv2
-from typing import Optional, Union
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from typing import List, Optional, Union, TYPE_CHECKING
 import logging
 
-try:
-    from basicsr.archs.rrdbnet_arch import RRDBNet
-    from realesrgan import RealESRGANer
-    REALESRGAN_AVAILABLE = True
-except ImportError:
-    REALESRGAN_AVAILABLE = False
-    logging.warning("Real-ESRGAN not available. Please install: pip install realesrgan basicsr")
+from utils.model_downloader import download_model, get_model_dir
 
-from utils.model_downloader import download_model
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
 
 logger = logging.getLogger(__name__)
 
+# Input shapes captured as CUDA graphs per model. Each graph holds a
+# private memory pool; shapes beyond the limit run eagerly
+CUDA_GRAPH_CACHE_SIZE = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _check_realesrgan() -> bool:
+    """
+    Check whether Real-ESRGAN and basicsr are installed
+
+    torch, basicsr and realesrgan are only imported once a model is actually
+    built, so merely importing this module stays cheap.
+
+    Returns:
+        bool: True if both packages can be found
+    """
+    available = all(
+        importlib.util.find_spec(name) is not None
+        for name in ('basicsr', 'realesrgan')
+    )
+    if not available:
+        logging.warning("Real-ESRGAN not available. Please install: pip install realesrgan basicsr")
+    return available
+
+
+@contextlib.contextmanager
+def _skip_weight_init():
+    """
+    Skip random weight initialization while a network is being built
+
+    RRDBNet runs Kaiming init on every conv, and Conv2d/Linear run
+    reset_parameters, only for RealESRGANer to overwrite all of it with the
+    checkpoint right away. Not thread-safe: the patches are process-wide.
+    """
+    import torch
+
+    targets = [
+        (torch.nn.init, 'kaiming_normal_'),
+        (torch.nn.Conv2d, 'reset_parameters'),
+        (torch.nn.Linear, 'reset_parameters'),
+    ]
+    saved = [(owner, name, vars(owner).get(name)) for owner, name in targets]
+
+    def _noop(*args, **kwargs):
+        return args[0] if args else None
+
+    try:
+        for owner, name in targets:
+            setattr(owner, name, _noop)
+        yield
+    finally:
+        for owner, name, original in saved:
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+
+def _snapshot_is_fresh(snapshot_path: Path, model_path: Path) -> bool:
+    """Check that a weights snapshot exists and is newer than its checkpoint"""
+    try:
+        return snapshot_path.stat().st_mtime >= model_path.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _save_snapshot(model, snapshot_path: Path):
+    """
+    Save a model's weights as a flat snapshot for fast reloading
+
+    The original .pth checkpoints may use the legacy serialization format,
+    which cannot be memory-mapped. The snapshot uses the zip format, so
+    later loads can use torch.load(mmap=True) and skip the unpickle copy.
+
+    Args:
+        model: Loaded model (on CPU)
+        snapshot_path: Output path
+    """
+    import torch
+
+    temp_path = snapshot_path.with_suffix('.pt.tmp')
+    try:
+        state_dict = {k: v.contiguous() for k, v in model.state_dict().items()}
+        torch.save({'params_ema': state_dict}, temp_path)
+        os.replace(temp_path, snapshot_path)
+        logger.info(f"Saved weights snapshot: {snapshot_path}")
+    except Exception as e:
+        logger.warning(f"Could not save weights snapshot: {e}")
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _preloaded_upsampler(model, scale: int, tile: int, tile_pad: int, pre_pad: int):
+    """
+    Wrap an already-loaded model in a CPU RealESRGANer
+
+    RealESRGANer.__init__ always reads the checkpoint from disk. This sets up
+    the same state with a model whose weights are already in place.
+    """
+    import torch
+    from realesrgan import RealESRGANer
+
+    upsampler = RealESRGANer.__new__(RealESRGANer)
+    upsampler.scale = scale
+    upsampler.tile_size = tile
+    upsampler.tile_pad = tile_pad
+    upsampler.pre_pad = pre_pad
+    upsampler.mod_scale = None
+    upsampler.half = False
+    upsampler.device = torch.device('cpu')
+    upsampler.model = model.eval()
+
+    return upsampler
+
+
+@functools.lru_cache(maxsize=None)
+def _total_vram_gb(device_index: int = 0) -> float:
+    """
+    Total VRAM of a CUDA device in GB (0.0 without CUDA)
+
+    Cached: the device properties query can initialize the CUDA context,
+    and the answer never changes while the process runs.
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        return 0.0
+    return torch.cuda.get_device_properties(device_index).total_memory / (1024**3)
+
+
+def _configure_inductor_cache():
+    """
+    Point TorchInductor at a persistent cache directory
+
+    Compiled kernels then survive restarts, so only the first run pays the
+    full compile time. An explicit TORCHINDUCTOR_CACHE_DIR is left alone.
+    """
+    if 'TORCHINDUCTOR_CACHE_DIR' in os.environ:
+        return
+
+    cache_dir = get_model_dir().parent / 'inductor'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ['TORCHINDUCTOR_CACHE_DIR'] = str(cache_dir)
+
 
 class RealESRGANModel:
     """Real-ESRGAN model wrapper"""
@@ -33,7 +178,9 @@ class RealESRGANModel:
         tile_size: int = 0,
         tile_pad: int = 10,
         pre_pad: int = 0,
-        fp16: bool = False
+        fp16: bool = False,
+        residual_diff_threshold: float = 0.05,
+        dtype: Optional[torch.dtype] = None
     ):
         """
         Initialize Real-ESRGAN model
@@ -46,15 +193,37 @@ class RealESRGANModel:
             tile_pad: Padding for tiles
             pre_pad: Pre-padding for input
             fp16: Use FP16 (half precision)
+            residual_diff_threshold: First-block difference below which the
+                                     RRDB trunk output of the previous frame
+                                     is reused (see set_residual_cache)
+            dtype: Weight/compute dtype, overrides fp16 (e.g. torch.bfloat16)
         """
-        if not REALESRGAN_AVAILABLE:
+        if not _check_realesrgan():
             raise ImportError("Real-ESRGAN not available. Please install required packages.")
 
+        import torch
+        from basicsr.archs.rrdbnet_arch import RRDBNet
+        from realesrgan import RealESRGANer
+
         self.scale = scale
         self.model_name = model_name
         self.device = device
         self.tile_size = tile_size
+        self.tile_shape = (tile_size, tile_size) if tile_size > 0 else None
+        self._tile_outputs = {}
         self.fp16 = fp16
+        self.quantized = False
+        self.compiled = False
+        self.max_batch_size = 16
+        self._pinned = {}
+        self._copy_stream = None
+        self._compute_stream = None
+        self.residual_diff_threshold = residual_diff_threshold
+        self._trunk_cache = None
+        self._trt_key = None
+        self._eager_model = None
+        self.use_cuda_graphs = False
+        self._cuda_graphs = {}
 
         # Download model if needed
         logger.info(f"Loading Real-ESRGAN model: {model_name}")
@@ -71,18 +240,28 @@ class RealESRGANModel:
             num_block = 23
             num_feat = 64
 
-        # Create model
-        model = RRDBNet(
-            num_in_ch=3,
-            num_out_ch=3,
-            num_feat=num_feat,
-            num_block=num_block,
-            num_grow_ch=32,
-            scale=scale
-        )
+        # Create model (weights come from the checkpoint, skip random init)
+        with _skip_weight_init():
+            model = RRDBNet(
+                num_in_ch=3,
+                num_out_ch=3,
+                num_feat=num_feat,
+                num_block=num_block,
+                num_grow_ch=32,
+                scale=scale
+            )
 
-        # Initialize upsampler
-        try:
+        # Initialize upsampler - the checkpoint is read once on the CPU and
+        # the model moved afterwards, so a CUDA failure needs no reload
+        snapshot_path = Path(model_path).with_suffix('.pt')
+
+        if _snapshot_is_fresh(snapshot_path, Path(model_path)):
+            # Memory-map the snapshot and adopt its tensors as parameters
+            state_dict = torch.load(snapshot_path, map_location='cpu', mmap=True, weights_only=True)
+            model.load_state_dict(state_dict['params_ema'], strict=True, assign=True)
+            self.upsampler = _preloaded_upsampler(model, scale, tile_size, tile_pad, pre_pad)
+            logger.info(f"Loaded weights snapshot: {snapshot_path}")
+        else:
             self.upsampler = RealESRGANer(
                 scale=scale,
                 model_path=str(model_path),
@@ -90,9 +269,16 @@ class RealESRGANModel:
                 tile=tile_size,
                 tile_pad=tile_pad,
                 pre_pad=pre_pad,
-                half=fp16,
-                device=device
+                half=False,
+                device=torch.device('cpu')
             )
+            _save_snapshot(self.upsampler.model, snapshot_path)
+
+        if dtype is None:
+            dtype = torch.float16 if fp16 else torch.float32
+
+        try:
+            self._move_upsampler(device, dtype)
             logger.info(f"Real-ESRGAN model loaded successfully on {device}")
 
         except (torch.cuda.CudaError, RuntimeError) as e:
@@ -102,20 +288,36 @@ class RealESRGANModel:
                 logger.warning("Your GPU may be too new for this PyTorch version")
 
                 self.device = 'cpu'
-                self.upsampler = RealESRGANer(
-                    scale=scale,
-                    model_path=str(model_path),
-                    model=model,
-                    tile=tile_size,
-                    tile_pad=tile_pad,
-                    pre_pad=pre_pad,
-                    half=False,  # CPU doesn't support half precision
-                    device='cpu'
-                )
+                self._move_upsampler('cpu', torch.float32)  # CPU doesn't support half precision
                 logger.info(f"Real-ESRGAN model loaded successfully on CPU (fallback mode)")
             else:
                 raise
 
+    def _move_upsampler(self, device: str, dtype: torch.dtype):
+        """
+        Move the loaded upsampler model to a device / precision
+
+        Args:
+            device: 'cuda' or 'cpu'
+            dtype: Weight dtype (float32, float16 or bfloat16)
+        """
+        import torch
+
+        # Move before casting: the copy to CPU needs no CUDA kernels
+        model = self.upsampler.model.to(device)
+        model = model.to(dtype)
+
+        if device == 'cuda':
+            # NHWC lets cuDNN pick tensor-core convolution kernels
+            model = model.to(memory_format=torch.channels_last)
+
+        self.upsampler.model = model
+        self.upsampler.device = torch.device(device)
+        # RealESRGANer only knows FP16; BF16 inputs are cast under autocast
+        self.upsampler.half = dtype == torch.float16
+        self.dtype = dtype
+        self.fp16 = dtype != torch.float32
+
     def upscale_image(
         self,
         image: np.ndarray,
@@ -131,13 +333,33 @@ class RealESRGANModel:
         Returns:
             numpy.ndarray: Upscaled image (BGR format)
         """
+        import cv2
+        import numpy as np
+        import torch
+
         try:
             # Ensure image is in correct format
             if image.dtype != np.uint8:
                 image = (image * 255).astype(np.uint8)
 
+            if self._trunk_cache is not None:
+                self._trunk_cache.next_frame()
+
             # Upscale using Real-ESRGAN
-            output, _ = self.upsampler.enhance(image, outscale=outscale)
+            with torch.inference_mode():
+                if image.ndim == 3 and image.shape[2] == 3:
+                    output = self._enhance_tensor(image[None])[0]
+                    if outscale is not None and outscale != float(self.scale):
+                        h, w = image.shape[:2]
+                        output = cv2.resize(
+                            output,
+                            (int(w * outscale), int(h * outscale)),
+                            interpolation=cv2.INTER_LANCZOS4
+                        )
+                else:
+                    # Grayscale / alpha images go through the generic path
+                    with torch.autocast('cuda', dtype=torch.bfloat16, enabled=self.dtype == torch.bfloat16):
+                        output, _ = self.upsampler.enhance(image, outscale=outscale)
 
             return output
 
@@ -153,6 +375,419 @@ class RealESRGANModel:
                 interpolation=cv2.INTER_LANCZOS4
             )
 
+    def upscale_batch(
+        self,
+        images: List[np.ndarray],
+        passes: int = 1,
+        output_size: Optional[tuple] = None
+    ) -> List[np.ndarray]:
+        """
+        Upscale several same-sized images with one forward pass per batch
+
+        With passes > 1 the model is applied repeatedly (e.g. 4x twice for
+        16x) and the final resize to output_size is done on the device, so
+        intermediate results never go back to the host.
+
+        Batches larger than max_batch_size are split. If a batch runs out of
+        GPU memory, max_batch_size is halved and the batch retried.
+
+        Args:
+            images: Input images (BGR format, uint8, same shape)
+            passes: Number of times to apply the model
+            output_size: Final (width, height) (None = model output size)
+
+        Returns:
+            list: Upscaled images (BGR format)
+        """
+        import numpy as np
+        import torch
+
+        batchable = all(
+            image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3
+            and image.shape == images[0].shape
+            for image in images
+        )
+        if not batchable:
+            return [self._upscale_single(image, passes, output_size) for image in images]
+
+        outputs = []
+        start = 0
+
+        # max_batch_size can shrink mid-loop (out of memory), so advance by
+        # the size of each chunk rather than a precomputed step
+        while start < len(images):
+            chunk = images[start:start + self.max_batch_size]
+            start += len(chunk)
+
+            if self._trunk_cache is not None:
+                self._trunk_cache.next_frame()
+
+            try:
+                with torch.inference_mode():
+                    outputs.extend(self._enhance_tensor(np.stack(chunk), passes, output_size))
+
+            except torch.cuda.OutOfMemoryError:
+                self.clear_cache()
+                if len(chunk) == 1:
+                    logger.warning("Out of memory upscaling a single frame, using CPU-side fallback")
+                    outputs.extend(self._upscale_single(image, passes, output_size) for image in chunk)
+                    continue
+
+                self.max_batch_size = max(1, len(chunk) // 2)
+                logger.warning(f"Out of memory with {len(chunk)} frames per batch, reducing to {self.max_batch_size}")
+                outputs.extend(self.upscale_batch(chunk, passes, output_size))
+
+            except Exception as e:
+                logger.error(f"Error upscaling batch: {e}")
+                outputs.extend(self._upscale_single(image, passes, output_size) for image in chunk)
+
+        return outputs
+
+    def _upscale_single(self, image: np.ndarray, passes: int = 1, output_size: Optional[tuple] = None) -> np.ndarray:
+        """Per-image fallback for upscale_batch, going through upscale_image"""
+        import cv2
+
+        for _ in range(passes):
+            image = self.upscale_image(image)
+
+        if output_size is not None and (image.shape[1], image.shape[0]) != tuple(output_size):
+            image = cv2.resize(image, tuple(output_size), interpolation=cv2.INTER_LANCZOS4)
+
+        return image
+
+    def _enhance_tensor(
+        self,
+        images: np.ndarray,
+        passes: int = 1,
+        output_size: Optional[tuple] = None
+    ) -> np.ndarray:
+        """
+        Run the network on BGR uint8 frames, doing the conversions in torch
+
+        Same result as RealESRGANer.enhance for 3-channel 8-bit input, but
+        the frames are uploaded as uint8 (4x less data than float32) and
+        normalised and reordered on the device. On CUDA the transfers go
+        through pinned buffers that are reused while the frame size stays
+        the same, and the work runs on dedicated streams instead of the
+        default one.
+
+        Args:
+            images: Input images (N, H, W, 3), BGR, uint8
+            passes: Number of times to apply the model
+            output_size: Final (width, height), resized on the device
+                         (None = keep the model output size)
+
+        Returns:
+            numpy.ndarray: Upscaled images (N, H', W', 3), BGR, uint8
+        """
+        import numpy as np
+        import torch
+
+        device = self.upsampler.device
+
+        if device.type == 'cuda':
+            copy_stream, compute_stream = self._cuda_streams()
+
+            pinned_in = self._pinned_buffer('in', images.shape)
+            pinned_in.numpy()[...] = images
+
+            with torch.cuda.stream(copy_stream):
+                frame = pinned_in.to(device, non_blocking=True)
+            compute_stream.wait_stream(copy_stream)
+            frame.record_stream(compute_stream)
+
+            with torch.cuda.stream(compute_stream):
+                output = self._enhance_uint8(frame, passes, output_size)
+
+                pinned_out = self._pinned_buffer('out', tuple(output.shape))
+                pinned_out.copy_(output, non_blocking=True)
+                compute_stream.synchronize()
+
+            # The pinned buffer is reused by the next frame
+            return pinned_out.numpy().copy()
+
+        # from_numpy can't take negative strides (e.g. a reversed-channel view)
+        return self._enhance_uint8(torch.from_numpy(np.ascontiguousarray(images)), passes, output_size).numpy()
+
+    def upscale_uint8_tensor(
+        self,
+        images: torch.Tensor,
+        passes: int = 1,
+        output_size: Optional[tuple] = None
+    ) -> torch.Tensor:
+        """
+        Upscale uint8 frames that are already torch tensors on the device
+
+        For callers that decode straight into device memory: no host round
+        trip, and the conversion to and from float happens on the device.
+
+        Args:
+            images: BGR uint8 tensor, (3, H, W) or (N, 3, H, W), on the
+                    model device
+            passes: Number of times to apply the model
+            output_size: Final (width, height) (None = model output size)
+
+        Returns:
+            torch.Tensor: Upscaled BGR uint8 tensor on the device, same
+                          layout as the input
+        """
+        import torch
+
+        single = images.dim() == 3
+        if single:
+            images = images.unsqueeze(0)
+
+        if self._trunk_cache is not None:
+            self._trunk_cache.next_frame()
+
+        with torch.inference_mode():
+            # NCHW -> NHWC view, the layout _enhance_uint8 works on
+            output = self._enhance_uint8(images.permute(0, 2, 3, 1), passes, output_size)
+        output = output.permute(0, 3, 1, 2)
+
+        return output[0] if single else output
+
+    def _enhance_uint8(self, frame, passes: int = 1, output_size: Optional[tuple] = None):
+        """
+        Network pass on BGR uint8 frames already on the model device
+
+        Args:
+            frame: Input tensor (N, H, W, 3), BGR, uint8
+            passes: Number of times to apply the model
+            output_size: Final (width, height) (None = model output size)
+
+        Returns:
+            torch.Tensor: Output tensor (N, H', W', 3), BGR, uint8, contiguous
+        """
+        import torch
+        import torch.nn.functional as F
+
+        upsampler = self.upsampler
+        use_cuda = frame.device.type == 'cuda'
+
+        # NHWC BGR uint8 -> NCHW RGB in [0, 1]. A permuted NHWC tensor
+        # already has channels_last strides, matching the CUDA weights (no
+        # copy then); the CPU model keeps the default layout
+        img = frame.flip(-1).permute(0, 3, 1, 2)
+        img = img.float().div_(255).to(self.dtype)
+        if use_cuda:
+            img = img.contiguous(memory_format=torch.channels_last)
+        else:
+            img = img.contiguous()
+
+        for pass_index in range(passes):
+            # Same padding as RealESRGANer.pre_process
+            if upsampler.pre_pad != 0:
+                img = F.pad(img, (0, upsampler.pre_pad, 0, upsampler.pre_pad), 'reflect')
+
+            upsampler.mod_scale = {2: 2, 1: 4}.get(upsampler.scale)
+            if upsampler.mod_scale is not None:
+                _, _, h, w = img.shape
+                upsampler.mod_pad_h = (upsampler.mod_scale - h % upsampler.mod_scale) % upsampler.mod_scale
+                upsampler.mod_pad_w = (upsampler.mod_scale - w % upsampler.mod_scale) % upsampler.mod_scale
+                img = F.pad(img, (0, upsampler.mod_pad_w, 0, upsampler.mod_pad_h), 'reflect')
+
+            upsampler.img = img
+            if self.tile_shape is not None:
+                upsampler.output = self._tile_process(img, pass_index)
+            else:
+                upsampler.output = self._run_network(img)
+
+            # Chained passes stay on the device, in the model's input range
+            img = upsampler.post_process().clamp_(0, 1)
+
+        output = img
+        if output_size is not None and tuple(output.shape[-2:]) != (output_size[1], output_size[0]):
+            if output_size[1] <= output.shape[-2] and output_size[0] <= output.shape[-1]:
+                # Downscaling the AI output (e.g. 4× model for a 3×
+                # target): area averaging, like cv2.INTER_AREA
+                output = F.interpolate(output.float(), size=(output_size[1], output_size[0]), mode='area')
+            else:
+                output = F.interpolate(
+                    output.float(),
+                    size=(output_size[1], output_size[0]),
+                    mode='bicubic',
+                    align_corners=False,
+                    antialias=True
+                )
+
+        # NCHW RGB float -> NHWC BGR uint8
+        output = output.float().clamp_(0, 1).mul_(255).round_().to(torch.uint8)
+        output = output.flip(1).permute(0, 2, 3, 1).contiguous()
+
+        return output
+
+    def _tile_process(self, img, slot: int = 0):
+        """
+        Run the network tile by tile with rectangular tiles
+
+        Like RealESRGANer.tile_process, but tiles are tile_shape
+        (height, width) instead of square, and the output tensor is
+        preallocated once per slot and reused while the input size stays
+        the same.
+
+        Args:
+            img: Padded input (N, C, H, W) on the model device
+            slot: Output buffer slot (one per chained pass)
+
+        Returns:
+            torch.Tensor: Network output (N, C, H * scale, W * scale)
+        """
+        upsampler = self.upsampler
+        scale = upsampler.scale
+        tile_pad = upsampler.tile_pad
+        tile_h, tile_w = self.tile_shape
+
+        batch, channel, height, width = img.shape
+        output_shape = (batch, channel, height * scale, width * scale)
+
+        output = self._tile_outputs.get(slot)
+        if (output is None or tuple(output.shape) != output_shape
+                or output.dtype != img.dtype or output.device != img.device):
+            output = img.new_empty(output_shape)
+            self._tile_outputs[slot] = output
+
+        for y in range(0, height, tile_h):
+            for x in range(0, width, tile_w):
+                end_y = min(y + tile_h, height)
+                end_x = min(x + tile_w, width)
+
+                # Input tile with its context padding
+                pad_y = max(y - tile_pad, 0)
+                pad_x = max(x - tile_pad, 0)
+                input_tile = img[:, :, pad_y:min(end_y + tile_pad, height), pad_x:min(end_x + tile_pad, width)]
+
+                output_tile = self._run_network(input_tile)
+
+                # Drop the padding and place the tile
+                off_y = (y - pad_y) * scale
+                off_x = (x - pad_x) * scale
+                output[:, :, y * scale:end_y * scale, x * scale:end_x * scale] = output_tile[
+                    :, :, off_y:off_y + (end_y - y) * scale, off_x:off_x + (end_x - x) * scale]
+
+        return output
+
+    def _run_network(self, img):
+        """
+        Run the network, replaying a CUDA graph for input shapes seen before
+
+        Within a video every frame (or tile) has the same shape, so after a
+        warm-up call per shape the forward pass is captured once and then
+        replayed: one launch instead of hundreds of kernel launches. The
+        returned tensor is the graph's static output and is overwritten by
+        the next replay of that shape. Shapes seen only once (e.g. the last,
+        partial batch) are never captured.
+
+        At most CUDA_GRAPH_CACHE_SIZE shapes are captured; any further shapes
+        stay eager. Nothing is evicted: a tiled frame cycles through one
+        shape per tile variant, so evicting would recapture on every frame,
+        which costs more than it saves.
+
+        Args:
+            img: Network input (N, C, H, W) on the model device
+
+        Returns:
+            torch.Tensor: Network output
+        """
+        import torch
+
+        model = self.upsampler.model
+
+        # torch.compile builds its own graphs; the residual cache branches
+        # on the host per frame and can't be captured
+        if (not self.use_cuda_graphs or self.compiled or self._trunk_cache is not None
+                or img.device.type != 'cuda'):
+            return model(img)
+
+        key = (tuple(img.shape), tuple(img.stride()), img.dtype)
+        entry = self._cuda_graphs.get(key)
+
+        if entry is None:
+            # First call of this shape: run eagerly so cuDNN autotuning
+            # and allocator warm-up happen outside the capture
+            self._cuda_graphs[key] = False
+            return model(img)
+
+        if entry is False:
+            captured = sum(1 for value in self._cuda_graphs.values() if value is not False)
+            if captured >= CUDA_GRAPH_CACHE_SIZE:
+                return model(img)
+
+            try:
+                static_input = img.clone()
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    static_output = model(static_input)
+                entry = (graph, static_input, static_output)
+                self._cuda_graphs[key] = entry
+            except Exception as e:
+                logger.warning(f"CUDA graph capture failed, staying eager: {e}")
+                self.use_cuda_graphs = False
+                self._cuda_graphs.clear()
+                return model(img)
+
+        graph, static_input, static_output = entry
+        static_input.copy_(img)
+        graph.replay()
+
+        return static_output
+
+    def set_cuda_graphs(self, enabled: bool):
+        """
+        Turn CUDA graph replay of the forward pass on or off (CUDA only)
+
+        Args:
+            enabled: Enable or disable CUDA graphs
+        """
+        self.use_cuda_graphs = enabled and self.device == 'cuda'
+        self._cuda_graphs.clear()
+
+    def clear_cuda_graphs(self):
+        """Drop all captured CUDA graphs and their memory pools (e.g. after a video)"""
+        self._cuda_graphs.clear()
+
+    def set_tile_shape(self, tile_h: int, tile_w: int):
+        """
+        Set a rectangular tile size for the batched frame path
+
+        Args:
+            tile_h: Tile height (input pixels)
+            tile_w: Tile width (input pixels)
+        """
+        self.tile_shape = (tile_h, tile_w)
+        self._tile_outputs.clear()
+        self._cuda_graphs.clear()
+
+    def _cuda_streams(self):
+        """Get the (copy, compute) CUDA streams, created on first use"""
+        import torch
+
+        if self._copy_stream is None:
+            self._copy_stream = torch.cuda.Stream()
+            self._compute_stream = torch.cuda.Stream()
+
+        return self._copy_stream, self._compute_stream
+
+    def _pinned_buffer(self, name: str, shape: tuple):
+        """
+        Get a page-locked uint8 host buffer, reused while the shape matches
+
+        Args:
+            name: Buffer slot ('in' or 'out')
+            shape: Required shape
+
+        Returns:
+            torch.Tensor: Pinned buffer
+        """
+        import torch
+
+        buffer = self._pinned.get(name)
+        if buffer is None or tuple(buffer.shape) != tuple(shape):
+            buffer = torch.empty(shape, dtype=torch.uint8, pin_memory=True)
+            self._pinned[name] = buffer
+
+        return buffer
+
     def upscale_image_pil(self, pil_image):
         """
         Upscale PIL Image
@@ -163,20 +798,270 @@ class RealESRGANModel:
         Returns:
             PIL Image: Upscaled image
         """
+        import numpy as np
         from PIL import Image
 
-        # Convert PIL to numpy (RGB -> BGR)
-        img_np = np.array(pil_image)
-        img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+        # Convert PIL to numpy (RGB -> BGR). The reversed-channel view costs
+        # no copy here; upscale_image copies it once into the model input
+        img_np = np.asarray(pil_image)
+        img_bgr = img_np[..., ::-1]
 
         # Upscale
         output_bgr = self.upscale_image(img_bgr)
 
-        # Convert back to RGB
-        output_rgb = cv2.cvtColor(output_bgr, cv2.COLOR_BGR2RGB)
+        # Convert back to RGB (view again, PIL copies it once)
+        output_rgb = output_bgr[..., ::-1]
 
         return Image.fromarray(output_rgb)
 
+    def set_residual_cache(self, enabled: bool) -> bool:
+        """
+        Turn first-block residual caching of the RRDB trunk on or off
+
+        Only meant for consecutive video frames: unrelated images gain nothing
+        and could pick up a stale trunk output. Lossy even then (a frame just
+        under the threshold gets a neighbour's trunk output), so the
+        upscaler only turns it on with the 'use_residual_cache' setting.
+
+        Args:
+            enabled: Enable or disable the cache
+
+        Returns:
+            bool: True if the cache is active
+        """
+        import torch
+        from models.residual_cache import CachedRRDBTrunk
+
+        model = self.upsampler.model
+
+        if not enabled:
+            if self._trunk_cache is not None:
+                if self._trunk_cache.calls:
+                    logger.info(f"Residual cache: reused {self._trunk_cache.hits}/{self._trunk_cache.calls} trunk passes")
+                model.body = self._trunk_cache.unwrap()
+                self._trunk_cache = None
+            return False
+
+        if self._trunk_cache is None:
+            # CUDA graph outputs are overwritten by the next replay, so the
+            # cached trunk output would not survive until the next frame
+            if self.compiled:
+                return False
+            if self.residual_diff_threshold <= 0 or not isinstance(model.body, torch.nn.Sequential):
+                return False
+            self._trunk_cache = CachedRRDBTrunk(model.body, self.residual_diff_threshold)
+            model.body = self._trunk_cache
+
+        return True
+
+    def compile_model(self) -> bool:
+        """
+        Compile the network with torch.compile
+
+        On CUDA 'reduce-overhead' mode also captures CUDA graphs, removing the
+        per-launch Python overhead of the tile loop. Shapes are compiled as
+        dynamic: rectangular tiles (set_tile_shape), edge tiles, chained
+        passes and partial batches all differ, and with static shapes each
+        one would recompile mid-video until dynamo's recompile limit left the
+        rest running eagerly. With tiling enabled, compilation happens here
+        on a dummy tile so failures fall back to eager mode instead of
+        surfacing mid-video.
+
+        Returns:
+            bool: True if the model was compiled
+        """
+        import torch
+
+        if self.compiled:
+            return True
+
+        self.set_residual_cache(False)
+        _configure_inductor_cache()
+
+        eager_model = self.upsampler.model
+        mode = 'reduce-overhead' if self.device == 'cuda' else 'default'
+
+        try:
+            compiled_model = torch.compile(eager_model, mode=mode, fullgraph=False, dynamic=True)
+
+            if self.tile_size > 0:
+                size = self.tile_size + 2 * self.upsampler.tile_pad
+                dummy = torch.zeros(1, 3, size, size, device=self.upsampler.device, dtype=self.dtype)
+                with torch.inference_mode():
+                    compiled_model(dummy)
+
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager mode: {e}")
+            return False
+
+        self.upsampler.model = compiled_model
+        self.compiled = True
+        logger.info(f"Real-ESRGAN compiled (mode={mode})")
+
+        return True
+
+    def compile_tensorrt(self, input_size: tuple, batch_size: int = 1) -> bool:
+        """
+        Compile the network to a TensorRT engine with torch_tensorrt
+
+        CUDA only, and only when torch_tensorrt is installed. TensorRT fuses
+        conv/activation/residual layers and picks tensor-core kernels for
+        the exact input shape, so the engine is built for the tile (or
+        padded frame) size of the current video and saved under the model
+        directory, keyed by model, scale, shape, precision and GPU
+        architecture. Later runs with the same key load it instead of
+        rebuilding. Any failure leaves the eager model in place.
+
+        Args:
+            input_size: Input frame size (width, height)
+            batch_size: Frames per model call
+
+        Returns:
+            bool: True if the TensorRT engine is in use
+        """
+        import torch
+
+        if self.device != 'cuda' or self.quantized:
+            return False
+        if importlib.util.find_spec('torch_tensorrt') is None:
+            logger.info("torch_tensorrt not installed, skipping TensorRT")
+            return False
+
+        import torch_tensorrt
+
+        # Shape the network actually sees: a padded tile, or the whole
+        # pre/mod-padded frame
+        if self.tile_shape is not None:
+            height = self.tile_shape[0] + 2 * self.upsampler.tile_pad
+            width = self.tile_shape[1] + 2 * self.upsampler.tile_pad
+        else:
+            mod = {2: 2, 1: 4}.get(self.scale, 1)
+            height = -(-(input_size[1] + self.upsampler.pre_pad) // mod) * mod
+            width = -(-(input_size[0] + self.upsampler.pre_pad) // mod) * mod
+
+        dtype = self.dtype
+        arch = '.'.join(map(str, torch.cuda.get_device_capability()))
+        key = f"{self.model_name}-x{self.scale}-{batch_size}x{height}x{width}-{dtype}-sm{arch}"
+        engine_path = get_model_dir().parent / 'tensorrt' / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.ep"
+
+        if self._trt_key == key:
+            return True
+        if self._trt_key is not None:
+            # Engine for another shape: rebuild from the eager model
+            self.upsampler.model = self._eager_model
+            self.compiled = False
+            self._trt_key = None
+        if self.compiled:
+            return False
+
+        self.set_residual_cache(False)
+        example = torch.zeros(batch_size, 3, height, width, device=self.upsampler.device, dtype=dtype)
+
+        try:
+            if engine_path.exists():
+                trt_model = torch_tensorrt.load(str(engine_path)).module()
+                logger.info(f"Loaded TensorRT engine: {engine_path}")
+            else:
+                logger.info(f"Building TensorRT engine for {batch_size}x{width}x{height} (first run only)...")
+                # Edge tiles are smaller than the full tile, so the height
+                # and width are dynamic up to the built size
+                trt_input = torch_tensorrt.Input(
+                    min_shape=(1, 3, 16, 16),
+                    opt_shape=tuple(example.shape),
+                    max_shape=tuple(example.shape),
+                    dtype=dtype
+                )
+                trt_model = torch_tensorrt.compile(
+                    self.upsampler.model,
+                    ir='dynamo',
+                    inputs=[trt_input],
+                    enabled_precisions={dtype}
+                )
+                engine_path.parent.mkdir(parents=True, exist_ok=True)
+                torch_tensorrt.save(trt_model, str(engine_path), inputs=[example])
+
+            with torch.inference_mode():
+                trt_model(example)
+
+        except Exception as e:
+            logger.warning(f"TensorRT compilation failed, using eager mode: {e}")
+            return False
+
+        self._eager_model = self.upsampler.model
+        self._trt_key = key
+        self.upsampler.model = trt_model
+        self.compiled = True
+        logger.info("Real-ESRGAN running on TensorRT")
+
+        return True
+
+    def quantize_int8(self, calibration_frames: List[np.ndarray]) -> bool:
+        """
+        Quantize the model to INT8 with post-training static quantization
+
+        CPU only. The RRDB trunk holds nearly all of the compute and is
+        calibrated on the given frames, then converted to quantized kernels
+        (fbgemm/x86, using VNNI where the CPU has it). The first and last
+        convolutions stay in FP32 to protect output quality.
+
+        Args:
+            calibration_frames: Representative input frames (BGR, uint8)
+
+        Returns:
+            bool: True if the model was quantized
+        """
+        import copy
+        import warnings
+        import torch
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+        if self.device != 'cpu':
+            logger.warning("INT8 quantization is only supported on CPU")
+            return False
+
+        if self.quantized or not calibration_frames:
+            return self.quantized
+
+        float_model = self.upsampler.model
+
+        try:
+            with warnings.catch_warnings():
+                # torch.ao.quantization is deprecated in favour of torchao
+                # and warns about its own observer defaults
+                warnings.simplefilter('ignore', DeprecationWarning)
+                warnings.simplefilter('ignore', UserWarning)
+
+                model = copy.deepcopy(float_model).float().eval()
+
+                # Quantized leaky_relu has no in-place kernel and warns on
+                # every call otherwise
+                for module in model.body.modules():
+                    if isinstance(module, torch.nn.LeakyReLU):
+                        module.inplace = False
+
+                example = torch.zeros(1, model.conv_first.out_channels, 32, 32)
+                model.body = prepare_fx(model.body, get_default_qconfig_mapping(), example_inputs=(example,))
+
+                # Calibrate through the regular pipeline so padding and
+                # tiling match real inference
+                self.upsampler.model = model
+                for frame in calibration_frames:
+                    self.upsampler.enhance(frame)
+
+                model.body = convert_fx(model.body)
+
+        except Exception as e:
+            self.upsampler.model = float_model
+            logger.warning(f"INT8 quantization failed, keeping FP32 model: {e}")
+            return False
+
+        self.upsampler.model = model
+        self.quantized = True
+        logger.info(f"Real-ESRGAN quantized to INT8 ({len(calibration_frames)} calibration frames)")
+
+        return True
+
     def estimate_vram_usage(self, input_resolution: tuple) -> float:
         """
         Estimate VRAM usage in GB
@@ -222,17 +1107,35 @@ class RealESRGANModel:
             return 128
 
     def clear_cache(self):
-        """Clear CUDA cache"""
+        """Clear CUDA cache, including the memory pools of captured graphs"""
+        import torch
+
+        self._cuda_graphs.clear()
+
         if self.device == 'cuda' and torch.cuda.is_available():
             torch.cuda.empty_cache()
             torch.cuda.synchronize()
 
+    def memory_pressure(self) -> float:
+        """
+        Fraction of device VRAM held by PyTorch's caching allocator
+
+        Returns:
+            float: Reserved / total memory (0.0 on CPU)
+        """
+        import torch
+
+        if self.device != 'cuda' or not torch.cuda.is_available():
+            return 0.0
+        return torch.cuda.memory_reserved() / (_total_vram_gb() * 1024**3)
+
 
 def create_realesrgan_model(
     scale: int = 4,
     device: str = 'cuda',
     fp16: bool = True,
-    tile_size: int = 0
+    tile_size: int = 0,
+    dtype: Optional[torch.dtype] = None
 ) -> RealESRGANModel:
     """
     Factory function to create Real-ESRGAN model
@@ -242,6 +1145,7 @@ def create_realesrgan_model(
         device: 'cuda' or 'cpu'
         fp16: Use half precision
         tile_size: Tile size (0 = auto)
+        dtype: Weight/compute dtype, overrides fp16 (e.g. torch.bfloat16)
 
     Returns:
         RealESRGANModel: Initialized model
@@ -257,11 +1161,9 @@ def create_realesrgan_model(
     # Auto-determine tile size if needed
     if tile_size == 0 and device == 'cuda':
         try:
-            import torch
-            if torch.cuda.is_available():
-                vram_gb = torch.cuda.get_device_properties(0).total_memory / (1024**3)
-                if vram_gb < 8:
-                    tile_size = 256
+            vram_gb = _total_vram_gb()
+            if 0 < vram_gb < 8:
+                tile_size = 256
         except:
             pass
 
@@ -270,5 +1172,6 @@ def create_realesrgan_model(
         model_name=model_name,
         device=device,
         tile_size=tile_size,
-        fp16=fp16
+        fp16=fp16,
+        dtype=dtype
     )
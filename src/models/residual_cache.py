@@ -0,0 +1,91 @@
+"""
+Residual Cache
+First-block residual caching for the RRDB trunk on video frames
+"""
+
+from collections import OrderedDict
+
+import torch
+import torch.nn as nn
+
+
+class CachedRRDBTrunk(nn.Module):
+    """
+    RRDB trunk that reuses its previous output when the input barely changed
+
+    The first RRDB block is always run. Each frame of the batch whose output
+    differs from the reference frame seen at the same position by less than
+    `threshold` (mean absolute difference, relative to the reference) gets
+    the reference's output of the remaining blocks instead of recomputing
+    them; only the other frames go through the rest of the trunk. The
+    reference is the last frame that was actually computed. Consecutive
+    video frames are highly redundant, so static shots skip most of the
+    convolution work.
+
+    Cache entries are keyed by call order within a frame and by per-frame
+    input shape, so tiled processing and chained passes each compare like
+    with like. Call next_frame() before every frame (or batch of frames).
+    """
+
+    def __init__(self, body: nn.Sequential, threshold: float = 0.05):
+        """
+        Args:
+            body: RRDBNet trunk (sequence of RRDB blocks)
+            threshold: Relative first-block difference below which the
+                       cached trunk output is reused
+        """
+        super().__init__()
+        self.first = body[0]
+        self.rest = body[1:]
+        self.threshold = threshold
+
+        self._cache = {}
+        self._slot = 0
+        self.calls = 0
+        self.hits = 0
+
+    def next_frame(self):
+        """Mark the start of a new frame"""
+        self._slot = 0
+
+    def reset(self):
+        """Drop all cached outputs (e.g. when switching videos)"""
+        self._cache.clear()
+        self._slot = 0
+
+    def unwrap(self) -> nn.Sequential:
+        """Rebuild the plain trunk"""
+        return nn.Sequential(OrderedDict([('0', self.first), *self.rest.named_children()]))
+
+    def forward(self, x):
+        first = self.first(x)
+        n = first.shape[0]
+
+        key = (self._slot, tuple(first.shape[1:]))
+        self._slot += 1
+        self.calls += n
+
+        cached = self._cache.get(key)
+        if cached is None:
+            out = self.rest(first)
+            computed = list(range(n))
+        else:
+            prev_first, prev_out = cached
+            diff = (first - prev_first).abs().mean(dim=(1, 2, 3)) / prev_first.abs().mean().clamp_min(1e-6)
+            reuse = (diff < self.threshold).tolist()
+            computed = [i for i, hit in enumerate(reuse) if not hit]
+            self.hits += n - len(computed)
+
+            if not computed:
+                return prev_out.expand(n, -1, -1, -1)
+            if len(computed) == n:
+                out = self.rest(first)
+            else:
+                out = prev_out.repeat(n, 1, 1, 1)
+                out[computed] = self.rest(first[computed])
+
+        # Keep a computed frame as reference so small drifts can't accumulate
+        last = computed[-1]
+        self._cache[key] = (first[last:last + 1], out[last:last + 1])
+
+        return out
@@ -1,367 +1,27 @@
 """
 RIFE Model Wrapper
 Real-Time Intermediate Flow Estimation for frame interpolation
-"""
-
-import torch
-import numpy as np
-import cv2
-from typing import Optional, List
-import logging
-
-logger = logging.getLogger(__name__)
-
-try:
-    # Try importing RIFE (if installed from pip or locally)
-    import sys
-    import os
-
-    # RIFE might not be available as a pip package
-    # We'll implement a basic version or require manual installation
-    RIFE_AVAILABLE = False
-
-    # Check if RIFE is available in the local installation
-    # User needs to clone: https://github.com/megvii-research/ECCV2022-RIFE
-
-except ImportError:
-    RIFE_AVAILABLE = False
-    logger.warning("RIFE not available. See installation instructions.")
-
-
-class RIFEModel:
-    """RIFE model wrapper for frame interpolation"""
-
-    def __init__(
-        self,
-        model_path: Optional[str] = None,
-        scale: float = 1.0,
-        device: str = 'cuda',
-        fp16: bool = False
-    ):
-        """
-        Initialize RIFE model
-
-        Args:
-            model_path: Path to RIFE model weights
-            scale: Scale factor for output
-            device: 'cuda' or 'cpu'
-            fp16: Use FP16 (half precision)
-        """
-        self.device = device
-        self.scale = scale
-        self.fp16 = fp16
-        self.model = None
-
-        if not RIFE_AVAILABLE:
-            logger.warning(
-                "RIFE not available. Please install RIFE:\n"
-                "  1. Clone: git clone https://github.com/megvii-research/ECCV2022-RIFE\n"
-                "  2. Follow installation instructions in the repo\n"
-                "  3. Or use the simplified version below"
-            )
-            # Use simplified interpolation as fallback
-            self._use_simple_interpolation = True
-        else:
-            self._use_simple_interpolation = False
-            self._load_model(model_path)
-
-    def _load_model(self, model_path: Optional[str] = None):
-        """
-        Load RIFE model
-
-        Args:
-            model_path: Path to model weights
-        """
-        try:
-            # This would load the actual RIFE model
-            # Since RIFE is not a simple pip package, we provide a fallback
-            logger.info("Loading RIFE model...")
-
-            # TODO: Implement actual RIFE model loading
-            # For now, we'll use optical flow-based interpolation
-            self._use_simple_interpolation = True
-
-            logger.info("RIFE model loaded (using fallback implementation)")
-
-        except Exception as e:
-            logger.error(f"Failed to load RIFE model: {e}")
-            logger.warning("Using simple interpolation fallback")
-            self._use_simple_interpolation = True
-
-    def interpolate_frames(
-        self,
-        frame1: np.ndarray,
-        frame2: np.ndarray,
-        num_intermediates: int = 1,
-        timestep: Optional[float] = None
-    ) -> List[np.ndarray]:
-        """
-        Interpolate frames between frame1 and frame2
-
-        Args:
-            frame1: First frame (BGR, numpy array)
-            frame2: Second frame (BGR, numpy array)
-            num_intermediates: Number of intermediate frames to generate
-            timestep: Specific timestep (0-1, None = evenly spaced)
-
-        Returns:
-            list: List of interpolated frames
-        """
-        if self._use_simple_interpolation:
-            return self._simple_interpolation(frame1, frame2, num_intermediates, timestep)
-        else:
-            return self._rife_interpolation(frame1, frame2, num_intermediates, timestep)
-
-    def _simple_interpolation(
-        self,
-        frame1: np.ndarray,
-        frame2: np.ndarray,
-        num_intermediates: int = 1,
-        timestep: Optional[float] = None
-    ) -> List[np.ndarray]:
-        """
-        Simple optical flow-based interpolation (fallback)
-
-        Args:
-            frame1: First frame
-            frame2: Second frame
-            num_intermediates: Number of frames to generate
-            timestep: Specific timestep (0-1)
-
-        Returns:
-            list: Interpolated frames
-        """
-        result = []
-
-        # Convert to grayscale for optical flow
-        gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-
-        # Calculate optical flow
-        flow = cv2.calcOpticalFlowFarneback(
-            gray1, gray2,
-            None,
-            pyr_scale=0.5,
-            levels=3,
-            winsize=15,
-            iterations=3,
-            poly_n=5,
-            poly_sigma=1.2,
-            flags=0
-        )
-
-        height, width = frame1.shape[:2]
-
-        if timestep is not None:
-            # Generate single frame at specific timestep
-            timesteps = [timestep]
-        else:
-            # Generate evenly spaced frames
-            timesteps = [(i + 1) / (num_intermediates + 1) for i in range(num_intermediates)]
-
-        for t in timesteps:
-            # Create mesh grid
-            x, y = np.meshgrid(np.arange(width), np.arange(height))
-
-            # Calculate warped coordinates
-            map_x = (x + flow[..., 0] * t).astype(np.float32)
-            map_y = (y + flow[..., 1] * t).astype(np.float32)
-
-            # Warp first frame forward
-            warped1 = cv2.remap(frame1, map_x, map_y, cv2.INTER_LINEAR)
-
-            # Warp second frame backward
-            map_x_back = (x - flow[..., 0] * (1 - t)).astype(np.float32)
-            map_y_back = (y - flow[..., 1] * (1 - t)).astype(np.float32)
-            warped2 = cv2.remap(frame2, map_x_back, map_y_back, cv2.INTER_LINEAR)
-
-            # Blend warped frames
-            interpolated = cv2.addWeighted(warped1, 1 - t, warped2, t, 0)
-
-            result.append(interpolated)
-
-        return result
 
-    def _rife_interpolation(
-        self,
-        frame1: np.ndarray,
-        frame2: np.ndarray,
-        num_intermediates: int = 1,
-        timestep: Optional[float] = None
-    ) -> List[np.ndarray]:
-        """
-        RIFE-based interpolation (when RIFE is available)
-
-        Args:
-            frame1: First frame
-            frame2: Second frame
-            num_intermediates: Number of frames to generate
-            timestep: Specific timestep
-
-        Returns:
-            list: Interpolated frames
-        """
-        # This would use the actual RIFE model
-        # For now, fall back to simple interpolation
-        return self._simple_interpolation(frame1, frame2, num_intermediates, timestep)
-
-    def interpolate_sequence(
-        self,
-        frames: List[np.ndarray],
-        multiplier: int = 2
-    ) -> List[np.ndarray]:
-        """
-        Interpolate a sequence of frames
-
-        Args:
-            frames: List of input frames
-            multiplier: FPS multiplier (2 = double fps, 4 = quadruple, etc.)
-
-        Returns:
-            list: Interpolated sequence
-        """
-        if multiplier == 1:
-            return frames
-
-        result = []
-        num_intermediates = multiplier - 1
-
-        for i in range(len(frames) - 1):
-            # Add original frame
-            result.append(frames[i])
-
-            # Add interpolated frames
-            interpolated = self.interpolate_frames(
-                frames[i],
-                frames[i + 1],
-                num_intermediates
-            )
-            result.extend(interpolated)
-
-        # Add last frame
-        result.append(frames[-1])
-
-        return result
-
-    def estimate_vram_usage(self, resolution: tuple) -> float:
-        """
-        Estimate VRAM usage in GB
-
-        Args:
-            resolution: (width, height)
-
-        Returns:
-            float: Estimated VRAM in GB
-        """
-        width, height = resolution
-        pixels = width * height
-
-        # Base usage
-        base_usage = 1.0
-
-        # Additional per megapixel
-        per_megapixel = 0.3 if self.fp16 else 0.5
-
-        megapixels = pixels / (1024 * 1024)
-        estimated = base_usage + (megapixels * per_megapixel)
-
-        return estimated
-
-    def clear_cache(self):
-        """Clear CUDA cache"""
-        if self.device == 'cuda' and torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            torch.cuda.synchronize()
-
-
-def create_rife_model(
-    device: str = 'cuda',
-    fp16: bool = True,
-    model_path: Optional[str] = None
-) -> RIFEModel:
-    """
-    Factory function to create RIFE model
-
-    Args:
-        device: 'cuda' or 'cpu'
-        fp16: Use half precision
-        model_path: Path to model weights
-
-    Returns:
-        RIFEModel: Initialized model
-    """
-    return RIFEModel(
-        model_path=model_path,
-        device=device,
-        fp16=fp16
-    )
-
-
-class SimpleFrameInterpolator:
-    """
-    Simple frame interpolator using OpenCV
-    Fallback when RIFE is not available
-    """
-
-    def __init__(self, device: str = 'cuda'):
-        """
-        Initialize simple interpolator
-
-        Args:
-            device: Device (not used for OpenCV)
-        """
-        self.device = device
-        logger.info("Using simple OpenCV-based frame interpolation")
-
-    def interpolate(
-        self,
-        frame1: np.ndarray,
-        frame2: np.ndarray,
-        alpha: float = 0.5
-    ) -> np.ndarray:
-        """
-        Simple linear interpolation between two frames
-
-        Args:
-            frame1: First frame
-            frame2: Second frame
-            alpha: Interpolation factor (0.5 = middle)
-
-        Returns:
-            numpy.ndarray: Interpolated frame
-        """
-        return cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
-
-    def interpolate_sequence(
-        self,
-        frames: List[np.ndarray],
-        multiplier: int = 2
-    ) -> List[np.ndarray]:
-        """
-        Interpolate a sequence of frames
-
-        Args:
-            frames: Input frames
-            multiplier: FPS multiplier
-
-        Returns:
-            list: Interpolated frames
-        """
-        if multiplier == 1:
-            return frames
+The implementation lives in models._rife_impl and is only imported when one
+of its names is looked up, so importing this module does not pull in
+torch, numpy or cv2.
+"""
 
-        result = []
-        num_intermediates = multiplier - 1
+__all__ = [
+    'RIFE_AVAILABLE',
+    'RIFEModel',
+    'SimpleFrameInterpolator',
+    'create_rife_model',
+]
 
-        for i in range(len(frames) - 1):
-            result.append(frames[i])
 
-            # Add interpolated frames
-            for j in range(1, multiplier):
-                alpha = j / multiplier
-                interpolated = self.interpolate(frames[i], frames[i + 1], alpha)
-                result.append(interpolated)
+def __getattr__(name):
+    """Load the RIFE implementation lazily (PEP 562)"""
+    if name in __all__:
+        from . import _rife_impl
+        return getattr(_rife_impl, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        result.append(frames[-1])
 
-        return result
+def __dir__():
+    return sorted(list(globals()) + __all__)
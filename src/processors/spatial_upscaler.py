@@ -5,12 +5,23 @@ Handles upscaling of entire videos frame-by-frame
 
 import time
 import os
-from typing import Dict, Optional, Callable
+import math
+import shutil
+import itertools
+from collections import deque
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Callable, Tuple
 from pathlib import Path
 import logging
 
+import cv2
+from tqdm import tqdm
+
 from models.realesrgan_model import create_realesrgan_model
-from utils.video_processor import VideoProcessor, VideoWriter
+from utils.video_processor import (
+    VideoProcessor, VideoWriter, FramePrefetcher, AsyncFrameWriter, ffmpeg_encoder_available,
+    get_video_info
+)
 from utils.system_manager import get_system_manager
 
 logger = logging.getLogger(__name__)
@@ -25,7 +36,10 @@ class SpatialUpscaler:
         self,
         model_name: str = 'realesrgan',
         scale_factor: float = 4.0,
-        device: str = 'auto'
+        device: str = 'auto',
+        batch_size: Optional[int] = None,
+        fp16: Optional[bool] = None,
+        use_compile: Optional[bool] = None
     ):
         """
         Initialize spatial upscaler
@@ -38,6 +52,12 @@ class SpatialUpscaler:
                          - 2.0, 4.0: Optimal (pure AI)
                          - Other values: Hybrid (AI + resize)
             device: 'cuda', 'cpu', or 'auto'
+            batch_size: Maximum frames per model call (None = the hardware's
+                        recommended batch size); reduced per video to fit VRAM
+            fp16: Run the model in half precision on CUDA (None = the
+                  hardware default); ignored on CPU
+            use_compile: torch.compile the model at load (None = the
+                         system default). Worth it for long-lived instances
         """
         self.model_name = model_name
         self.scale_factor = float(scale_factor)
@@ -55,15 +75,39 @@ class SpatialUpscaler:
         if self.scale_factor <= 0 or self.scale_factor > 16.0:
             raise ValueError(f"Invalid scale factor: {scale_factor}. Must be between 0.1 and 16.0.")
 
+        # Output size per input size (see _output_size)
+        self._output_sizes = {}
+
+        # Frames per model call (reduced per video to fit VRAM)
+        self.batch_size = batch_size or self.sys_manager.optimal_settings.get('batch_size', 1)
+
+        # Half precision (BF16 on Ampere+, FP16 before that)
+        self.fp16 = self.sys_manager.optimal_settings['use_fp16'] if fp16 is None else fp16
+
+        # torch.compile: slow first call, faster from then on
+        if use_compile is None:
+            use_compile = self.sys_manager.optimal_settings.get('use_compile', False)
+        self.use_compile = use_compile
+
         # Initialize model (only if upscaling with AI)
         self.model = None
         self.use_ai = self.scale_factor >= 1.5  # Use AI for scales >= 1.5x
         if self.use_ai:
             self._load_model()
 
+        self._frames_fn = self._select_frames_fn()
+
+        # Non-AI resize: bound once, it runs for every frame. Area averaging
+        # is faster than Lanczos and alias-free for downscales
+        self._resize = cv2.resize
+        self._interpolation = cv2.INTER_AREA if self.scale_factor < 1.0 else cv2.INTER_LANCZOS4
+
     def _load_model(self):
         """Load the AI model"""
-        # Determine optimal AI model scale based on target scale
+        # Determine optimal AI model scale based on target scale: the closest
+        # one, preferring 4× on a tie (downscaling the AI output keeps more
+        # detail than upscaling it). Two 2× passes never beat one 4× pass:
+        # the second pass runs at twice the resolution.
         if self.scale_factor >= 3.0:
             self.ai_model_scale = 4
             logger.info(f"Using 4× AI model for {self.scale_factor}× target scale")
@@ -78,13 +122,44 @@ class SpatialUpscaler:
                 # Get optimal settings
                 settings = self.sys_manager.optimal_settings
 
+                if self.device == 'cpu':
+                    self.sys_manager.configure_cpu_threads()
+
+                # Half precision: BF16 on Ampere and newer (tensor cores,
+                # FP32's range so no overflow to inf), FP16 before that
+                half = self.fp16 and self.device == 'cuda'
+                dtype = None
+                if half:
+                    import torch
+
+                    if torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8:
+                        dtype = torch.bfloat16
+
                 self.model = create_realesrgan_model(
                     scale=self.ai_model_scale,
                     device=self.device,
-                    fp16=settings['use_fp16'],
-                    tile_size=settings.get('tile_size', 0)
+                    # FP16 on the CPU is emulated and slower than FP32
+                    fp16=half,
+                    tile_size=settings.get('tile_size', 0),
+                    dtype=dtype
                 )
 
+                if self.device == 'cuda':
+                    import torch
+
+                    # Frame size is fixed for a whole video, so cuDNN's
+                    # autotuned conv algorithms are reused for every frame.
+                    # TF32 lets FP32 convs use tensor cores on Ampere+.
+                    torch.backends.cudnn.benchmark = True
+                    torch.backends.cudnn.allow_tf32 = True
+                    torch.backends.cuda.matmul.allow_tf32 = True
+                    torch.set_float32_matmul_precision('high')
+
+                if self.use_compile:
+                    self.model.compile_model()
+
+                self.model.set_cuda_graphs(settings.get('use_cuda_graphs', True))
+
                 logger.info(f"Real-ESRGAN {self.ai_model_scale}× model loaded successfully")
 
             else:
@@ -100,7 +175,8 @@ class SpatialUpscaler:
         output_path: str,
         start_frame: int = 0,
         end_frame: Optional[int] = None,
-        progress_callback: Optional[Callable[[int, int, float], None]] = None
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        encoder: Optional[str] = None
     ) -> Dict:
         """
         Upscale a video
@@ -111,103 +187,193 @@ class SpatialUpscaler:
             start_frame: Starting frame index
             end_frame: Ending frame index (None = all frames)
             progress_callback: Optional callback(current_frame, total_frames, eta)
+            encoder: FFmpeg video encoder (see upscale_video_with_vp)
+
+        Returns:
+            dict: Processing results with 'success', 'output_path', 'metrics'
+        """
+        try:
+            # Open input video
+            with VideoProcessor(input_path) as vp:
+                return self.upscale_video_with_vp(
+                    vp, output_path, start_frame, end_frame, progress_callback, encoder=encoder
+                )
+
+        except Exception as e:
+            logger.error(f"Error opening video: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'output_path': None,
+                'metrics': {}
+            }
+
+    def upscale_video_with_vp(
+        self,
+        vp: VideoProcessor,
+        output_path: str,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        pipe_output: bool = False,
+        include_audio: bool = True,
+        encoder: Optional[str] = None
+    ) -> Dict:
+        """
+        Upscale a video that is already open
+
+        Lets callers that have opened the video for its metadata reuse it
+        instead of opening and probing the file a second time.
+
+        Args:
+            vp: Open video processor
+            output_path: Output video path
+            start_frame: Starting frame index
+            end_frame: Ending frame index (None = all frames)
+            progress_callback: Optional callback(current_frame, total_frames, eta)
+            pipe_output: Without a hardware encoder, pipe frames into FFmpeg's
+                         libx264 (ultrafast) instead of OpenCV's MPEG-4
+                         writer. The H.264 result plays in browsers as is
+            include_audio: Copy the source audio into the output
+            encoder: FFmpeg video encoder (e.g. 'hevc_nvenc'). None = NVENC
+                     H.264 on CUDA when available, otherwise as pipe_output
 
         Returns:
             dict: Processing results with 'success', 'output_path', 'metrics'
         """
-        logger.info(f"Starting video upscaling: {input_path}")
+        logger.info(f"Starting video upscaling: {vp.video_path}")
         logger.info(f"Output: {output_path}")
         logger.info(f"Scale: {self.scale_factor}x, Model: {self.model_name}")
 
         start_time = time.time()
+        progress_bar = None
 
         try:
-            # Open input video
-            with VideoProcessor(input_path) as vp:
-                metadata = vp.get_metadata()
+            metadata = vp.get_metadata()
 
-                logger.info(f"Input resolution: {metadata['width']}x{metadata['height']}")
-                logger.info(f"FPS: {metadata['fps']}, Frames: {metadata['frame_count']}")
+            logger.info(f"Input resolution: {metadata['width']}x{metadata['height']}")
+            logger.info(f"FPS: {metadata['fps']}, Frames: {metadata['frame_count']}")
 
-                # Calculate output resolution (convert to int for OpenCV)
-                output_width = int(metadata['width'] * self.scale_factor)
-                output_height = int(metadata['height'] * self.scale_factor)
+            # Calculate output resolution (convert to int for OpenCV)
+            output_width = int(metadata['width'] * self.scale_factor)
+            output_height = int(metadata['height'] * self.scale_factor)
 
-                logger.info(f"Output resolution: {output_width}x{output_height}")
+            logger.info(f"Output resolution: {output_width}x{output_height}")
 
-                # Validate output resolution (check total megapixels, not individual dimensions)
-                # This allows portrait videos to have height > 4320 if total pixels < 8K
-                output_megapixels = (output_width * output_height) / (1024 * 1024)
-                max_megapixels = 33.2  # 8K = 7680x4320 = 33.2 MP
+            self._check_output_size(output_width, output_height)
 
-                if output_megapixels > max_megapixels:
-                    raise ValueError(
-                        f"Output resolution ({output_width}x{output_height}, {output_megapixels:.1f}MP) "
-                        f"exceeds 8K limit ({max_megapixels}MP)"
-                    )
+            # Determine frame range
+            if end_frame is None:
+                end_frame = metadata['frame_count']
 
-                logger.info(f"Output: {output_megapixels:.1f} MP (limit: {max_megapixels} MP)")
+            total_frames = end_frame - start_frame
+            logger.info(f"Processing {total_frames} frames")
 
-                # Determine frame range
-                if end_frame is None:
-                    end_frame = metadata['frame_count']
+            # Check VRAM if using GPU
+            if self.device == 'cuda':
+                estimated_vram = self.model.estimate_vram_usage((metadata['width'], metadata['height']))
+                sufficient, msg = self.sys_manager.check_vram_requirement(estimated_vram)
+                logger.info(msg)
 
-                total_frames = end_frame - start_frame
-                logger.info(f"Processing {total_frames} frames")
+                if not sufficient:
+                    logger.warning("Insufficient VRAM, but will try anyway...")
 
-                # Check VRAM if using GPU
-                if self.device == 'cuda':
-                    estimated_vram = self.model.estimate_vram_usage((metadata['width'], metadata['height']))
-                    sufficient, msg = self.sys_manager.check_vram_requirement(estimated_vram)
-                    logger.info(msg)
+            # On CUDA, decode on NVDEC and encode on NVENC through FFmpeg
+            # so the CPU isn't the bottleneck feeding the GPU
+            preset = None
+            hwaccel = self._hwaccel()
 
-                    if not sufficient:
-                        logger.warning("Insufficient VRAM, but will try anyway...")
+            if encoder and not ffmpeg_encoder_available(encoder):
+                logger.warning(f"FFmpeg encoder {encoder} is not available, choosing one automatically")
+                encoder = None
 
-                # Open output video writer
-                with VideoWriter(
-                    output_path,
-                    fps=metadata['fps'],
-                    resolution=(output_width, output_height),
-                    audio_source=input_path
-                ) as writer:
+            if (encoder is None and self.device == 'cuda'
+                    and self.sys_manager.optimal_settings.get('use_nvcodec', True)
+                    and ffmpeg_encoder_available('h264_nvenc')):
+                encoder = 'h264_nvenc'
+
+            if pipe_output and encoder is None and ffmpeg_encoder_available('libx264'):
+                encoder = 'libx264'
+
+            if pipe_output and encoder == 'libx264':
+                preset = 'ultrafast'
 
-                    # Process frames
-                    processed_count = 0
-                    frame_times = []
+            logger.info(f"Decoder: {'FFmpeg/' + hwaccel if hwaccel else 'OpenCV'}, encoder: {encoder or 'OpenCV'}")
 
-                    for frame_idx, frame in vp.extract_frames(start_frame, end_frame):
-                        frame_start = time.time()
+            # Open output video writer. Decoding and encoding run in
+            # background threads so the model never waits on file I/O.
+            # The encoder queue holds a whole batch: the previous batch is
+            # encoded while the model runs
+            queue_depth = max(4, self.batch_size)
 
-                        # Upscale frame
-                        upscaled = self._upscale_frame(frame)
+            # tqdm bar alongside the callback: the UI tracks it directly
+            progress_bar = tqdm(total=total_frames, desc="Upscaling", unit="frame", leave=False)
+
+            with VideoWriter(
+                output_path,
+                fps=metadata['fps'],
+                resolution=(output_width, output_height),
+                audio_source=vp.video_path if include_audio else None,
+                encoder=encoder,
+                preset=preset,
+                expected_frames=total_frames
+            ) as writer, AsyncFrameWriter(writer, maxsize=queue_depth) as async_writer, \
+                    closing(self._upscaled_batches(vp, start_frame, end_frame, hwaccel)) as batches:
+
+                # Process frames
+                processed_count = 0
+                batch_times = deque(maxlen=30)  # Rolling window for the ETA
+                window_time = 0.0
+                window_frames = 0
+                last_time = time.perf_counter()
+                last_progress = 0.0
+
+                for upscaled_frames in batches:
+                    for upscaled in upscaled_frames:
 
                         # Write frame
-                        writer.write_frame(upscaled)
-
-                        processed_count += 1
-                        frame_time = time.time() - frame_start
-                        frame_times.append(frame_time)
-
-                        # Calculate ETA
-                        if len(frame_times) > 0:
-                            avg_time = sum(frame_times[-30:]) / min(len(frame_times), 30)  # Rolling average
-                            remaining_frames = total_frames - processed_count
-                            eta = remaining_frames * avg_time
-                        else:
-                            eta = 0
-
-                        # Progress callback
-                        if progress_callback and processed_count % 10 == 0:
-                            progress_callback(processed_count, total_frames, eta)
-
-                        # Log progress
-                        if processed_count % 100 == 0:
-                            logger.info(f"Processed {processed_count}/{total_frames} frames ({processed_count/total_frames*100:.1f}%)")
-
-                        # Clear cache periodically
-                        if processed_count % 50 == 0:
-                            self.model.clear_cache()
+                        async_writer.write_frame(upscaled)
+
+                    previous_count = processed_count
+                    processed_count += len(upscaled_frames)
+
+                    # One timestamp per batch. Time between batches, so the
+                    # ETA reflects whichever stage is the bottleneck
+                    now = time.perf_counter()
+                    batch_time = now - last_time
+                    last_time = now
+
+                    # Running sums over the window, so the rolling average
+                    # costs O(1) per batch
+                    if len(batch_times) == batch_times.maxlen:
+                        old_time, old_frames = batch_times[0]
+                        window_time -= old_time
+                        window_frames -= old_frames
+                    batch_times.append((batch_time, len(upscaled_frames)))
+                    window_time += batch_time
+                    window_frames += len(upscaled_frames)
+
+                    # Progress counts encoded frames, so it shows finished
+                    # output rather than frames still queued for the encoder
+                    written = async_writer.frames_written
+                    avg_time = window_time / window_frames
+                    eta = (total_frames - written) * avg_time
+                    progress_bar.update(written - progress_bar.n)
+
+                    # Progress callback (rate-limited so a fast pipeline
+                    # doesn't flood the UI)
+                    if progress_callback and now - last_progress >= 0.25:
+                        progress_callback(written, total_frames, eta)
+                        last_progress = now
+
+                    # Log progress
+                    if processed_count // 100 > previous_count // 100:
+                        logger.info(f"Processed {processed_count}/{total_frames} frames ({processed_count/total_frames*100:.1f}%)")
+
+            # All frames are encoded once the writer has closed
+            progress_bar.update(processed_count - progress_bar.n)
+            if progress_callback:
+                progress_callback(processed_count, total_frames, 0.0)
 
             # Calculate metrics
             total_time = time.time() - start_time
@@ -237,6 +403,267 @@ class SpatialUpscaler:
                 'metrics': {}
             }
 
+        finally:
+            if progress_bar is not None:
+                progress_bar.close()
+
+    def _check_output_size(self, output_width: int, output_height: int):
+        """
+        Reject output resolutions above 8K
+
+        Checks total megapixels, not individual dimensions, so portrait
+        videos can have height > 4320 as long as the frame is within 8K.
+
+        Raises:
+            ValueError: If the output exceeds the limit
+        """
+        output_megapixels = (output_width * output_height) / (1024 * 1024)
+        max_megapixels = 33.2  # 8K = 7680x4320 = 33.2 MP
+
+        if output_megapixels > max_megapixels:
+            raise ValueError(
+                f"Output resolution ({output_width}x{output_height}, {output_megapixels:.1f}MP) "
+                f"exceeds 8K limit ({max_megapixels}MP)"
+            )
+
+        logger.info(f"Output: {output_megapixels:.1f} MP (limit: {max_megapixels} MP)")
+
+    def _hwaccel(self) -> Optional[str]:
+        """FFmpeg hardware decoder to read frames with (None = OpenCV)"""
+        if (self.device == 'cuda' and self.sys_manager.optimal_settings.get('use_nvcodec', True)
+                and shutil.which('ffmpeg')):
+            return 'cuda'
+        return None
+
+    def _upscaled_batches(
+        self,
+        vp: VideoProcessor,
+        start_frame: int,
+        end_frame: int,
+        hwaccel: Optional[str] = None
+    ) -> Iterator[List]:
+        """
+        Decode and upscale a frame range, yielding one batch at a time
+
+        Prepares the model for this video first (batch and tile size,
+        TensorRT engine, INT8 calibration, residual cache). Decoding runs in
+        a background thread, so the next batch is read while the model
+        works on the current one.
+
+        Args:
+            vp: Open video processor
+            start_frame: Starting frame index
+            end_frame: Ending frame index
+            hwaccel: FFmpeg hardware decoder (None = OpenCV)
+
+        Yields:
+            list: Upscaled frames (BGR) of one batch
+        """
+        metadata = vp.get_metadata()
+
+        batch_size = self._choose_batch_size(metadata['width'], metadata['height'])
+        logger.info(f"Batch size: {batch_size} frames")
+
+        if self.device == 'cuda' and self.model is not None and self.model.tile_size > 0:
+            budget = self.sys_manager.device_info['vram_available_gb'] * 0.8 / batch_size
+            tile_h, tile_w = self._choose_tile_size(metadata['height'], metadata['width'], budget)
+            self.model.set_tile_shape(tile_h, tile_w)
+            logger.info(f"Tile size: {tile_w}x{tile_h}")
+
+        # TensorRT engines are built for a fixed shape, so this waits
+        # until the frame and tile sizes are known
+        if (self.device == 'cuda' and self.model is not None
+                and self.sys_manager.optimal_settings.get('use_tensorrt', True)):
+            self.model.compile_tensorrt((metadata['width'], metadata['height']), batch_size)
+
+        # CPU: quantize to INT8, calibrated on this video's frames
+        if (self.model is not None and self.model.device == 'cpu'
+                and self.sys_manager.optimal_settings.get('use_int8', False)):
+            self._quantize_for_cpu(vp, start_frame, end_frame)
+
+        if hwaccel:
+            frame_source = vp.extract_frames_ffmpeg(start_frame, end_frame, hwaccel=hwaccel)
+        else:
+            frame_source = vp.extract_frames(start_frame, end_frame)
+
+        try:
+            # Consecutive frames: let the model reuse trunk outputs of
+            # near-identical frames (lossy, opt-in). Not with CUDA graphs,
+            # which can't capture the per-frame reuse decision
+            if (self.model is not None and not self.model.use_cuda_graphs
+                    and self.sys_manager.optimal_settings.get('use_residual_cache', False)):
+                self.model.set_residual_cache(True)
+
+            last_cache_check = time.perf_counter()
+
+            # The decode queue holds a whole batch
+            with FramePrefetcher(frame_source, maxsize=max(4, batch_size)) as frames:
+                frame_iter = (frame for _, frame in frames)
+
+                while True:
+                    batch = list(itertools.islice(frame_iter, batch_size))
+                    if not batch:
+                        break
+
+                    # Upscale frames, halving the batch size for the rest
+                    # of the video if the GPU runs out of memory
+                    upscaled_frames = None
+                    while upscaled_frames is None:
+                        try:
+                            upscaled_frames = [
+                                upscaled
+                                for start in range(0, len(batch), batch_size)
+                                for upscaled in self._upscale_frames(batch[start:start + batch_size])
+                            ]
+                        except RuntimeError as e:
+                            if 'out of memory' not in str(e) or batch_size == 1:
+                                raise
+                            batch_size //= 2
+                            self.model.clear_cache()
+                            logger.warning(f"Out of GPU memory, reducing batch size to {batch_size}")
+
+                    yield upscaled_frames
+
+                    # Clear cache only under memory pressure: empty_cache()
+                    # synchronizes the device and stalls the pipeline
+                    now = time.perf_counter()
+                    if self.model and now - last_cache_check > 5.0:
+                        if self.model.memory_pressure() > 0.9:
+                            self.model.clear_cache()
+                        last_cache_check = now
+
+        finally:
+            if self.model is not None:
+                self.model.set_residual_cache(False)
+                # Graphs are captured per shape; the next video may use
+                # other shapes, and the cached upscaler outlives this run
+                self.model.clear_cuda_graphs()
+
+    def _quantize_for_cpu(
+        self,
+        vp: VideoProcessor,
+        start_frame: int,
+        end_frame: int,
+        num_samples: int = 16,
+        crop_size: int = 96
+    ):
+        """
+        Quantize the model to INT8 for CPU inference (once per model)
+
+        Calibration uses center crops of frames spread evenly over the range
+        being processed: the observers see this video's content at a
+        fraction of the cost of full frames.
+
+        Args:
+            vp: Open video processor
+            start_frame: First frame of the processed range
+            end_frame: End of the processed range (exclusive)
+            num_samples: Number of calibration frames
+            crop_size: Side of the center crop taken from each frame
+        """
+        if self.model.quantized:
+            return
+
+        step = max(1, (end_frame - start_frame) // num_samples)
+        calibration_frames = []
+
+        for frame_idx in range(start_frame, end_frame, step)[:num_samples]:
+            frame = vp.read_frame(frame_idx)
+            if frame is None:
+                continue
+
+            height, width = frame.shape[:2]
+            y = max(0, (height - crop_size) // 2)
+            x = max(0, (width - crop_size) // 2)
+            calibration_frames.append(frame[y:y + crop_size, x:x + crop_size].copy())
+
+        logger.info(f"Calibrating INT8 model on {len(calibration_frames)} frames")
+        self.model.quantize_int8(calibration_frames)
+
+    def _choose_batch_size(self, width: int, height: int) -> int:
+        """
+        Pick how many frames to send through the model at once
+
+        Starts from the configured batch size and halves it until the
+        estimated VRAM of a batch fits in 80% of the VRAM that is free right
+        now (other processes and earlier runs included).
+
+        Args:
+            width: Input frame width
+            height: Input frame height
+
+        Returns:
+            int: Batch size (1 on CPU)
+        """
+        if self.device != 'cuda' or self.model is None:
+            return 1
+
+        import torch
+
+        base_usage = self.model.estimate_vram_usage((0, 0))
+        per_frame = self.model.estimate_vram_usage((width, height)) - base_usage
+
+        if torch.cuda.is_available():
+            # The model is already resident; memory PyTorch has cached but
+            # not handed out is free for the batch too
+            free_bytes, _ = torch.cuda.mem_get_info()
+            free_bytes += torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+            budget = free_bytes / (1024**3) * 0.8
+            base_usage = 0.0
+        else:
+            budget = self.sys_manager.device_info['vram_available_gb'] * 0.8
+
+        batch_size = max(1, self.batch_size)
+        while batch_size > 1 and base_usage + per_frame * batch_size > budget:
+            batch_size //= 2
+
+        return batch_size
+
+    def _choose_tile_size(self, height: int, width: int, vram_budget: float, max_tile_ratio: float = 2.0) -> tuple:
+        """
+        Pick a rectangular tile size for the model
+
+        Starts from the model's square tile size and balances the tiles
+        across the frame. When that leaves the tiles smaller than the square
+        one (the frame's short edge doesn't use a full tile), the tile grows
+        along the long edge, up to max_tile_ratio times the square size and
+        within the VRAM budget, so fewer tiles are needed and less of the
+        padding around each tile is computed twice.
+
+        Args:
+            height: Input frame height
+            width: Input frame width
+            vram_budget: VRAM available for one frame's tiles in GB
+            max_tile_ratio: Maximum long-edge growth relative to the tile size
+
+        Returns:
+            tuple: (tile_height, tile_width)
+        """
+        tile_size = self.model.tile_size
+        tile_pad = self.model.upsampler.tile_pad
+
+        # Largest tile area (padding included) that fits the budget
+        base_usage = self.model.estimate_vram_usage((0, 0))
+        per_pixel = (self.model.estimate_vram_usage((1024, 1024)) - base_usage) / (1024 * 1024)
+        max_area = max(tile_size * tile_size, (vram_budget - base_usage) / per_pixel)
+
+        # Balanced square tiling
+        tile_h = math.ceil(height / math.ceil(height / tile_size))
+        tile_w = math.ceil(width / math.ceil(width / tile_size))
+
+        if tile_h * tile_w < tile_size * tile_size:
+            # Grow the long edge to recover a tile
+            if width >= height:
+                limit = min(width, int(max_tile_ratio * tile_size), int(max_area / (tile_h + 2 * tile_pad)) - 2 * tile_pad)
+                if limit > tile_w:
+                    tile_w = math.ceil(width / math.ceil(width / limit))
+            else:
+                limit = min(height, int(max_tile_ratio * tile_size), int(max_area / (tile_w + 2 * tile_pad)) - 2 * tile_pad)
+                if limit > tile_h:
+                    tile_h = math.ceil(height / math.ceil(height / limit))
+
+        return tile_h, tile_w
+
     def _upscale_frame(self, frame):
         """
         Upscale a single frame with arbitrary scale factor
@@ -247,67 +674,95 @@ class SpatialUpscaler:
         Returns:
             numpy.ndarray: Upscaled/downscaled frame
         """
-        import cv2
+        return self._upscale_frames([frame])[0]
+
+    def _upscale_frames(self, frames: List) -> List:
+        """
+        Upscale a batch of same-sized frames with arbitrary scale factor
 
-        original_h, original_w = frame.shape[:2]
-        target_h = int(original_h * self.scale_factor)
-        target_w = int(original_w * self.scale_factor)
+        Args:
+            frames: Input frames (numpy arrays, BGR)
 
-        # Case 1: Downscaling (< 1.0) - use high-quality Lanczos
-        if self.scale_factor < 1.0:
-            return cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LANCZOS4)
+        Returns:
+            list: Upscaled/downscaled frames
+        """
+        return self._frames_fn(frames)
 
+    def _select_frames_fn(self) -> Callable[[List], List]:
+        """
+        Pick the per-batch upscaling method for the scale factor
+
+        The scale factor is fixed for the upscaler's lifetime, so the
+        branch is chosen once instead of on every batch.
+
+        Returns:
+            callable: Method taking and returning a list of frames
+        """
+        # Case 1: Downscaling (< 1.0) - use high-quality Lanczos
         # Case 2: Small upscaling (< 1.5) - use traditional resize
-        elif self.scale_factor < 1.5:
-            return cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LANCZOS4)
+        if self.scale_factor < 1.5:
+            return self._resize_frames
 
         # Case 3: Exact AI match (2.0 or 4.0) - use AI directly
-        elif self.scale_factor == 2.0:
-            return self.model.upscale_image(frame)
-
-        elif self.scale_factor == 4.0:
-            return self.model.upscale_image(frame)
+        elif self.scale_factor in (2.0, 4.0):
+            return self.model.upscale_batch
 
         # Case 4: Large scale (8.0+) - apply 4× AI multiple times
         elif self.scale_factor >= 8.0:
-            # Apply 4× AI repeatedly
-            times = int(self.scale_factor / 4)
-            for _ in range(times):
-                frame = self.model.upscale_image(frame)
-
-            # Handle remainder with resize
-            remainder = self.scale_factor / (4 ** times)
-            if abs(remainder - 1.0) > 0.01:  # Not exact
-                current_h, current_w = frame.shape[:2]
-                final_h = int(current_h * remainder)
-                final_w = int(current_w * remainder)
-                frame = cv2.resize(frame, (final_w, final_h), interpolation=cv2.INTER_LANCZOS4)
-
-            return frame
+            return self._chained_ai_frames
 
         # Case 5: Arbitrary scale - hybrid approach (AI + resize)
         else:
-            # Use AI upscaling first
-            frame = self.model.upscale_image(frame)
+            return self._hybrid_ai_frames
+
+    def _resize_frames(self, frames: List) -> List:
+        """Resize frames to the target size without AI (cases 1 and 2)"""
+        target_w, target_h = self._output_size(*frames[0].shape[:2])
+        return [self._resize(frame, (target_w, target_h), interpolation=self._interpolation) for frame in frames]
+
+    def _chained_ai_frames(self, frames: List) -> List:
+        """Apply the 4× AI model repeatedly, then resize to the target (case 4)"""
+        target_w, target_h = self._output_size(*frames[0].shape[:2])
+
+        # Fewest 4× passes that reach the target (8× -> 2, 16× -> 2)
+        times = math.ceil(math.log(self.scale_factor, 4) - 1e-6)
+
+        # Passes and the remainder resize run on the device; only the
+        # final frames come back to the host
+        return self.model.upscale_batch(frames, passes=times, output_size=(target_w, target_h))
+
+    def _hybrid_ai_frames(self, frames: List) -> List:
+        """AI upscale, then resize to the exact target (case 5)"""
+        target_w, target_h = self._output_size(*frames[0].shape[:2])
+
+        # The resize runs on the device (skipped when the AI output already
+        # has the target size), so the larger AI output never goes back to
+        # the host
+        return self.model.upscale_batch(frames, output_size=(target_w, target_h))
 
-            # Then resize to exact target
-            ai_scaled_h, ai_scaled_w = frame.shape[:2]
-            resize_factor = self.scale_factor / self.ai_model_scale
+    def _output_size(self, height: int, width: int) -> tuple:
+        """
+        Output (width, height) for an input frame size
 
-            final_h = int(original_h * self.scale_factor)
-            final_w = int(original_w * self.scale_factor)
+        Cached per input size: it is the same for every frame of a video.
+        """
+        size = self._output_sizes.get((height, width))
 
-            if abs(resize_factor - 1.0) > 0.01:  # Need resize
-                frame = cv2.resize(frame, (final_w, final_h), interpolation=cv2.INTER_LANCZOS4)
+        if size is None:
+            size = (int(width * self.scale_factor), int(height * self.scale_factor))
+            self._output_sizes[(height, width)] = size
 
-            return frame
+        return size
 
     def upscale_preview(
         self,
         input_path: str,
         output_path: str,
         duration: float = 5.0,
-        progress_callback: Optional[Callable[[int, int, float], None]] = None
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        pipe_output: bool = True,
+        include_audio: bool = False,
+        encoder: Optional[str] = None
     ) -> Dict:
         """
         Upscale first N seconds for preview
@@ -317,6 +772,9 @@ class SpatialUpscaler:
             output_path: Output video path
             duration: Duration in seconds to process
             progress_callback: Optional progress callback
+            pipe_output: Encode through an FFmpeg pipe (see upscale_video_with_vp)
+            include_audio: Mux the source audio into the preview
+            encoder: FFmpeg video encoder (see upscale_video_with_vp)
 
         Returns:
             dict: Processing results
@@ -324,7 +782,7 @@ class SpatialUpscaler:
         logger.info(f"Creating preview ({duration}s) of {input_path}")
 
         try:
-            # Get video metadata
+            # Get video metadata; the same handle is used for upscaling
             with VideoProcessor(input_path) as vp:
                 metadata = vp.get_metadata()
                 fps = metadata['fps']
@@ -332,14 +790,17 @@ class SpatialUpscaler:
                 # Calculate frame range
                 end_frame = min(int(fps * duration), metadata['frame_count'])
 
-            # Upscale the segment
-            return self.upscale_video(
-                input_path,
-                output_path,
-                start_frame=0,
-                end_frame=end_frame,
-                progress_callback=progress_callback
-            )
+                # Upscale the segment
+                return self.upscale_video_with_vp(
+                    vp,
+                    output_path,
+                    start_frame=0,
+                    end_frame=end_frame,
+                    progress_callback=progress_callback,
+                    pipe_output=pipe_output,
+                    include_audio=include_audio,
+                    encoder=encoder
+                )
 
         except Exception as e:
             logger.error(f"Error creating preview: {e}")
@@ -350,6 +811,49 @@ class SpatialUpscaler:
                 'metrics': {}
             }
 
+    def upscale_preview_stream(
+        self,
+        input_path: str,
+        duration: float = 5.0
+    ) -> Tuple[Dict, Iterator]:
+        """
+        Upscale the first N seconds as a stream of frames
+
+        For handing the preview to another stage (e.g. FPS interpolation)
+        in memory instead of encoding and decoding an intermediate file.
+        Frames are upscaled as they are pulled from the iterator.
+
+        Args:
+            input_path: Input video path
+            duration: Duration in seconds to process
+
+        Returns:
+            tuple: (metadata of the upscaled stream, iterator of BGR frames)
+        """
+        metadata = get_video_info(input_path)
+        fps = metadata['fps']
+        end_frame = min(int(fps * duration), metadata['frame_count'])
+
+        width, height = self._output_size(metadata['height'], metadata['width'])
+        self._check_output_size(width, height)
+        metadata.update(
+            width=width,
+            height=height,
+            frame_count=end_frame,
+            duration=end_frame / fps if fps > 0 else 0
+        )
+
+        return metadata, self._preview_frames(input_path, end_frame)
+
+    def _preview_frames(self, input_path: str, end_frame: int) -> Iterator:
+        """Upscaled frames for upscale_preview_stream"""
+        logger.info(f"Streaming preview ({end_frame} frames) of {input_path}")
+
+        with VideoProcessor(input_path) as vp, \
+                closing(self._upscaled_batches(vp, 0, end_frame, self._hwaccel())) as batches:
+            for batch in batches:
+                yield from batch
+
     def estimate_processing_time(self, input_path: str) -> Dict:
         """
         Estimate processing time for a video
@@ -361,8 +865,7 @@ class SpatialUpscaler:
             dict: Estimated times
         """
         try:
-            with VideoProcessor(input_path) as vp:
-                metadata = vp.get_metadata()
+            metadata = get_video_info(input_path)
 
             # Rough estimates based on hardware
             if self.device == 'cuda':
@@ -413,16 +916,22 @@ class SpatialUpscaler:
 
 def create_upscaler(
     model_name: str = 'realesrgan',
-    scale_factor: int = 4,
-    device: str = 'auto'
+    scale_factor: float = 4.0,
+    device: str = 'auto',
+    batch_size: Optional[int] = None,
+    fp16: Optional[bool] = None,
+    use_compile: Optional[bool] = None
 ) -> SpatialUpscaler:
     """
     Factory function to create upscaler
 
     Args:
         model_name: Model name
-        scale_factor: Scale factor (2, 4, 8)
+        scale_factor: Scale factor (0.1 to 16.0, see SpatialUpscaler)
         device: Device ('cuda', 'cpu', 'auto')
+        batch_size: Maximum frames per model call (None = auto)
+        fp16: Half precision on CUDA (None = auto)
+        use_compile: torch.compile the model (None = auto)
 
     Returns:
         SpatialUpscaler: Initialized upscaler
@@ -430,5 +939,8 @@ def create_upscaler(
     return SpatialUpscaler(
         model_name=model_name,
         scale_factor=scale_factor,
-        device=device
+        device=device,
+        batch_size=batch_size,
+        fp16=fp16,
+        use_compile=use_compile
     )
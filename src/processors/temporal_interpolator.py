@@ -4,17 +4,111 @@ Increases frame rate using frame interpolation models
 """
 
 import time
+import shutil
+import itertools
 import logging
-from typing import Dict, Optional, Callable, List
+import threading
+from collections import deque
+from typing import Dict, Optional, Callable, List, Iterable, Iterator, Tuple
 from pathlib import Path
 
-from models.rife_model import create_rife_model, SimpleFrameInterpolator
-from utils.video_processor import VideoProcessor, VideoWriter
+import cv2
+import torch
+
+from models.rife_model import create_rife_model, RIFEModel, SimpleFrameInterpolator
+from utils.video_processor import (
+    VideoProcessor, VideoWriter, FramePrefetcher, AsyncFrameWriter, ffmpeg_encoder_available,
+    get_video_info, clone_or_copy
+)
 from utils.system_manager import get_system_manager
 
 logger = logging.getLogger(__name__)
 
 
+def _frame_pairs(first, frames: Iterator) -> Iterator[Tuple]:
+    """Yield consecutive (previous, current) frame pairs"""
+    prev = first
+    for curr in frames:
+        yield prev, curr
+        prev = curr
+
+
+def _pair_difference(frame1, frame2) -> float:
+    """Mean absolute difference of two frames on 64x36 thumbnails (0-255)"""
+    thumb1 = cv2.resize(frame1, (64, 36), interpolation=cv2.INTER_AREA)
+    thumb2 = cv2.resize(frame2, (64, 36), interpolation=cv2.INTER_AREA)
+    return float(cv2.absdiff(thumb1, thumb2).mean())
+
+
+class _ProgressPoller:
+    """
+    Report interpolation progress from a background thread
+
+    The processing loop only stores the latest pair count and per-pair time;
+    the progress callback and log line run here at a fixed rate, so a slow
+    UI callback never stalls the model.
+    """
+
+    def __init__(self, total: int, callback: Optional[Callable[[int, int, float], None]] = None,
+                 interval: float = 0.5):
+        """
+        Args:
+            total: Total number of frame pairs
+            callback: Optional callback(current, total, eta)
+            interval: Seconds between reports (0.5 = 2 Hz)
+        """
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+
+        # Written by the processing loop only
+        self.count = 0
+        self.avg_time = 0.0
+
+        self._reported = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='interp-progress', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Poller thread"""
+        while not self._stop.wait(self.interval):
+            self._report()
+        self._report()
+
+    def _report(self):
+        """Send one progress update if the count moved"""
+        count = self.count
+        if count == self._reported:
+            return
+
+        eta = max(self.total - count, 0) * self.avg_time
+
+        if self.callback:
+            try:
+                self.callback(count, self.total, eta)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+        if count // 50 > self._reported // 50:
+            logger.info(f"Processed {count}/{self.total} frame pairs ({count/self.total*100:.1f}%)")
+
+        self._reported = count
+
+    def close(self):
+        """Send the final update and stop the poller thread"""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+
 class TemporalInterpolator:
     """
     Handles temporal interpolation (FPS increase) of videos
@@ -29,7 +123,7 @@ class TemporalInterpolator:
         Initialize temporal interpolator
 
         Args:
-            model_name: Model to use ('rife', 'simple')
+            model_name: Model to use ('rife', 'nvof', 'simple')
             device: 'cuda', 'cpu', or 'auto'
         """
         self.model_name = model_name
@@ -41,6 +135,15 @@ class TemporalInterpolator:
 
         self.device = device
 
+        # Frame pairs per model call
+        self.batch_size = max(1, self.sys_manager.optimal_settings.get('batch_size', 1))
+
+        # Pairs that barely change (held frames) or that cross a hard cut
+        # skip the model and repeat their first frame instead; warping
+        # across a cut only produces ghosting
+        self.static_threshold = 1.0
+        self.scene_cut_threshold = 40.0
+
         # Initialize model
         self.model = None
         self._load_model()
@@ -49,13 +152,23 @@ class TemporalInterpolator:
         """Load the interpolation model"""
         logger.info(f"Loading {self.model_name} interpolation model (device={self.device})")
 
+        if self.device == 'cpu':
+            self.sys_manager.configure_cpu_threads()
+
         try:
-            if self.model_name.lower() == 'rife':
+            if self.model_name.lower() in ('rife', 'nvof'):
+                # Without RIFE weights the model interpolates along optical
+                # flow; 'rife' picks NVIDIA hardware flow when available
                 self.model = create_rife_model(
                     device=self.device,
-                    fp16=self.sys_manager.optimal_settings.get('use_fp16', True)
+                    fp16=self._use_fp16(),
+                    flow_backend='nvof' if self.model_name.lower() == 'nvof' else 'auto'
                 )
-                logger.info("RIFE interpolation model loaded (using optical flow fallback)")
+
+                if self.sys_manager.optimal_settings.get('use_compile', False):
+                    self.model.compile_model()
+
+                logger.info(f"RIFE interpolation model loaded (using {self.model.flow_backend} optical flow fallback)")
 
             elif self.model_name.lower() == 'simple':
                 self.model = SimpleFrameInterpolator(device=self.device)
@@ -69,13 +182,68 @@ class TemporalInterpolator:
             logger.warning("Falling back to simple interpolation")
             self.model = SimpleFrameInterpolator(device=self.device)
 
+    def _use_fp16(self) -> bool:
+        """
+        Decide whether the interpolation model runs in FP16
+
+        Only on CUDA devices with tensor cores (compute capability 7.0+):
+        CPUs emulate FP16, and older GPUs run it no faster than FP32.
+
+        Returns:
+            bool: True to use half precision
+        """
+        if not self.sys_manager.optimal_settings.get('use_fp16', True):
+            return False
+
+        if self.device != 'cuda':
+            logger.info("FP16 disabled: not running on CUDA")
+            return False
+
+        if not torch.cuda.is_available():
+            return False
+
+        major, minor = torch.cuda.get_device_capability(0)
+        if major < 7:
+            logger.info(f"FP16 disabled: compute capability {major}.{minor} has no tensor cores (needs 7.0+)")
+            return False
+
+        return True
+
+    def _compute_multiplier(
+        self,
+        original_fps: float,
+        fps_multiplier: int,
+        target_fps: Optional[float] = None
+    ) -> Tuple[float, int]:
+        """
+        Resolve the target FPS and the integer frame multiplier
+
+        Args:
+            original_fps: Source FPS
+            fps_multiplier: FPS multiplier (used when target_fps is None)
+            target_fps: Target FPS (overrides multiplier)
+
+        Returns:
+            tuple: (target_fps, actual_multiplier)
+        """
+        if target_fps is None:
+            target_fps = original_fps * fps_multiplier
+
+        # Validate target FPS
+        if target_fps > 240:
+            logger.warning(f"Target FPS {target_fps} is very high, capping at 240")
+            target_fps = 240
+
+        return target_fps, int(round(target_fps / original_fps))
+
     def interpolate_video(
         self,
         input_path: str,
         output_path: str,
         fps_multiplier: int = 2,
         target_fps: Optional[float] = None,
-        progress_callback: Optional[Callable[[int, int, float], None]] = None
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        encoder: Optional[str] = None
     ) -> Dict:
         """
         Interpolate video to increase FPS
@@ -86,6 +254,7 @@ class TemporalInterpolator:
             fps_multiplier: FPS multiplier (2, 4, 8)
             target_fps: Target FPS (overrides multiplier)
             progress_callback: Optional callback(current_frame, total_frames, eta)
+            encoder: FFmpeg video encoder (see interpolate_stream)
 
         Returns:
             dict: Processing results with 'success', 'output_path', 'metrics'
@@ -97,113 +266,205 @@ class TemporalInterpolator:
         start_time = time.time()
 
         try:
-            # Open input video
-            with VideoProcessor(input_path) as vp:
-                metadata = vp.get_metadata()
-                original_fps = metadata['fps']
-
-                logger.info(f"Original FPS: {original_fps}")
-                logger.info(f"Resolution: {metadata['width']}x{metadata['height']}")
-                logger.info(f"Total frames: {metadata['frame_count']}")
-
-                # Calculate target FPS
-                if target_fps is None:
-                    target_fps = original_fps * fps_multiplier
-
-                # Validate target FPS
-                if target_fps > 240:
-                    logger.warning(f"Target FPS {target_fps} is very high, capping at 240")
-                    target_fps = 240
-                    fps_multiplier = int(target_fps / original_fps)
-
-                logger.info(f"Target FPS: {target_fps}")
-
-                # Calculate actual multiplier
-                actual_multiplier = int(round(target_fps / original_fps))
-
-                if actual_multiplier < 2:
-                    logger.warning("FPS multiplier < 2, no interpolation needed")
-                    # Just copy the video
-                    import shutil
-                    shutil.copy(input_path, output_path)
-                    return {
-                        'success': True,
-                        'output_path': output_path,
+            # Metadata comes from the probe cache, so the no-op path below
+            # never opens the video for decoding
+            metadata = get_video_info(input_path)
+            original_fps = metadata['fps']
+
+            logger.info(f"Original FPS: {original_fps}")
+            logger.info(f"Resolution: {metadata['width']}x{metadata['height']}")
+            logger.info(f"Total frames: {metadata['frame_count']}")
+
+            target_fps, actual_multiplier = self._compute_multiplier(original_fps, fps_multiplier, target_fps)
+            logger.info(f"Target FPS: {target_fps}")
+
+            if actual_multiplier < 2:
+                logger.warning("FPS multiplier < 2, no interpolation needed")
+                # Just copy the video (cloned when the filesystem supports it)
+                clone_or_copy(input_path, output_path)
+                return {
+                    'success': True,
+                    'output_path': output_path,
+                    'original_fps': original_fps,
+                    'new_fps': original_fps,
+                    'metrics': {
+                        'total_time': time.time() - start_time,
+                        'frames_processed': metadata['frame_count'],
                         'original_fps': original_fps,
-                        'new_fps': original_fps,
-                        'metrics': {
-                            'total_time': time.time() - start_time,
-                            'frames_processed': metadata['frame_count'],
-                            'original_fps': original_fps,
-                            'new_fps': original_fps
-                        }
+                        'new_fps': original_fps
                     }
+                }
 
-                # Open output video writer
-                output_frame_count = (metadata['frame_count'] - 1) * actual_multiplier + 1
-
-                with VideoWriter(
+            # Decoding runs in a background thread (see interpolate_stream)
+            with VideoProcessor(input_path) as vp:
+                return self.interpolate_stream(
+                    self._frame_source(vp),
+                    metadata,
                     output_path,
-                    fps=target_fps,
-                    resolution=(metadata['width'], metadata['height']),
-                    audio_source=input_path
-                ) as writer:
+                    target_fps,
+                    audio_source=input_path,
+                    progress_callback=progress_callback,
+                    encoder=encoder
+                )
+
+        except Exception as e:
+            logger.error(f"Error during FPS interpolation: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': str(e),
+                'output_path': None,
+                'original_fps': None,
+                'new_fps': None,
+                'metrics': {}
+            }
 
-                    # Process frames in batches
-                    processed_count = 0
-                    output_frame_count_actual = 0
-                    frame_times = []
+    def interpolate_stream(
+        self,
+        frames: Iterable,
+        metadata: Dict,
+        output_path: str,
+        target_fps: float,
+        audio_source: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        encoder: Optional[str] = None
+    ) -> Dict:
+        """
+        Interpolate a stream of decoded frames into a video
 
-                    # Extract all frames first (for better interpolation)
-                    logger.info("Extracting frames...")
-                    frames = vp.extract_frames_list(max_frames=metadata['frame_count'])
+        Shared by interpolate_video and interpolate_preview. Frames are
+        pulled lazily, so only the current batch is held in memory and the
+        stream can end before metadata['frame_count'].
 
-                    logger.info(f"Interpolating {len(frames)} frames to {len(frames) * actual_multiplier} frames...")
+        Args:
+            frames: Decoded BGR frames in display order
+            metadata: Metadata of the stream ('width', 'height', 'fps',
+                      'frame_count'; the count is only used for progress)
+            output_path: Output video path
+            target_fps: Output FPS, at least twice the source FPS
+            audio_source: Optional video to copy the audio track from
+            progress_callback: Optional callback(current_frame, total_frames, eta)
+            encoder: FFmpeg video encoder (e.g. 'hevc_nvenc'). None = NVENC
+                     H.264 on CUDA when available, otherwise OpenCV
 
-                    # Process frame pairs
-                    for i in range(len(frames) - 1):
-                        frame_start = time.time()
+        Returns:
+            dict: Processing results with 'success', 'output_path', 'metrics'
+        """
+        start_time = time.time()
 
+        try:
+            original_fps = metadata['fps']
+            actual_multiplier = int(round(target_fps / original_fps))
+            if actual_multiplier < 2:
+                raise ValueError(f"FPS multiplier must be at least 2 (got {target_fps / original_fps:.2f})")
+
+            output_frame_count = (metadata['frame_count'] - 1) * actual_multiplier + 1
+
+            # TensorRT warp engine for this resolution (built once, then cached)
+            if (self.device == 'cuda' and isinstance(self.model, RIFEModel)
+                    and self.sys_manager.optimal_settings.get('use_tensorrt', True)):
+                self.model.compile_tensorrt(
+                    (metadata['width'], metadata['height']),
+                    self.batch_size,
+                    actual_multiplier - 1
+                )
+
+            # Decoding and encoding run in background threads, so the
+            # model never waits on file I/O. Queues hold a batch of input
+            # frames / the output of a batch
+            # On CUDA, encode on NVENC when FFmpeg has it
+            if encoder and not ffmpeg_encoder_available(encoder):
+                logger.warning(f"FFmpeg encoder {encoder} is not available, choosing one automatically")
+                encoder = None
+
+            if (encoder is None and self.device == 'cuda'
+                    and self.sys_manager.optimal_settings.get('use_nvcodec', True)
+                    and ffmpeg_encoder_available('h264_nvenc')):
+                encoder = 'h264_nvenc'
+
+            logger.info(f"Encoder: {encoder or 'OpenCV'}")
+
+            total_pairs = max(metadata['frame_count'] - 1, 1)
+
+            with VideoWriter(
+                output_path,
+                fps=target_fps,
+                resolution=(metadata['width'], metadata['height']),
+                audio_source=audio_source,
+                encoder=encoder,
+                expected_frames=output_frame_count
+            ) as video_writer, \
+                    AsyncFrameWriter(video_writer, maxsize=max(8, self.batch_size * actual_multiplier)) as writer, \
+                    FramePrefetcher(frames, maxsize=max(8, self.batch_size + 1)) as prefetched, \
+                    _ProgressPoller(total_pairs, progress_callback) as progress:
+
+                # Process frames as a sliding pair: only the frames of
+                # the current batch are held, and output starts before
+                # decoding finishes
+                processed_count = 0
+                skipped_pairs = 0
+                output_frame_count_actual = 0
+                frame_times = deque(maxlen=10)  # Last 10 pair times for the ETA
+                running_sum = 0.0
+
+                frame_iter = iter(prefetched)
+                first = next(frame_iter, None)
+                if first is None:
+                    raise ValueError("No frames could be read from the video")
+
+                pair_iter = _frame_pairs(first, frame_iter)
+                last = first
+
+                logger.info(f"Interpolating {metadata['frame_count']} frames to {output_frame_count} frames...")
+
+                # Process frame pairs, batch_size pairs per model call
+                while True:
+                    pairs = list(itertools.islice(pair_iter, self.batch_size))
+                    if not pairs:
+                        break
+
+                    batch_start = time.time()
+
+                    results = [[frame1] * (actual_multiplier - 1) for frame1, _ in pairs]
+                    moving = [
+                        i for i, (frame1, frame2) in enumerate(pairs)
+                        if self.static_threshold <= _pair_difference(frame1, frame2) <= self.scene_cut_threshold
+                    ]
+                    skipped_pairs += len(pairs) - len(moving)
+
+                    if moving:
+                        interpolated = self.model.interpolate_frames_batched(
+                            [pairs[i] for i in moving],
+                            num_intermediates=actual_multiplier - 1
+                        )
+                        for i, frames in zip(moving, interpolated):
+                            results[i] = frames
+
+                    for (frame, _), interpolated in zip(pairs, results):
                         # Write original frame
-                        writer.write_frame(frames[i])
+                        writer.write_frame(frame)
                         output_frame_count_actual += 1
 
-                        # Interpolate between this frame and next
-                        if actual_multiplier > 1:
-                            interpolated = self.model.interpolate_frames(
-                                frames[i],
-                                frames[i + 1],
-                                num_intermediates=actual_multiplier - 1
-                            )
-
-                            # Write interpolated frames
-                            for interp_frame in interpolated:
-                                writer.write_frame(interp_frame)
-                                output_frame_count_actual += 1
-
-                        processed_count += 1
-                        frame_time = time.time() - frame_start
-                        frame_times.append(frame_time)
-
-                        # Calculate ETA
-                        if len(frame_times) > 0:
-                            avg_time = sum(frame_times[-10:]) / min(len(frame_times), 10)
-                            remaining_frames = len(frames) - 1 - processed_count
-                            eta = remaining_frames * avg_time
-                        else:
-                            eta = 0
-
-                        # Progress callback
-                        if progress_callback and processed_count % 5 == 0:
-                            progress_callback(processed_count, len(frames) - 1, eta)
-
-                        # Log progress
-                        if processed_count % 50 == 0:
-                            logger.info(f"Processed {processed_count}/{len(frames)-1} frame pairs ({processed_count/(len(frames)-1)*100:.1f}%)")
-
-                    # Write last frame
-                    writer.write_frame(frames[-1])
-                    output_frame_count_actual += 1
+                        # Write interpolated frames
+                        for interp_frame in interpolated:
+                            writer.write_frame(interp_frame)
+                            output_frame_count_actual += 1
+
+                    last = pairs[-1][1]
+                    processed_count += len(pairs)
+                    pair_time = (time.time() - batch_start) / len(pairs)
+                    for _ in pairs:
+                        if len(frame_times) == frame_times.maxlen:
+                            running_sum -= frame_times[0]
+                        frame_times.append(pair_time)
+                        running_sum += pair_time
+
+                    # Hand off to the progress thread
+                    progress.avg_time = running_sum / len(frame_times)
+                    progress.count = processed_count
+
+                # Write last frame
+                writer.write_frame(last)
+                output_frame_count_actual += 1
 
             # Calculate metrics
             total_time = time.time() - start_time
@@ -211,6 +472,7 @@ class TemporalInterpolator:
             logger.info(f"FPS interpolation completed in {total_time:.2f}s")
             logger.info(f"Original frames: {metadata['frame_count']}")
             logger.info(f"Output frames: {output_frame_count_actual}")
+            logger.info(f"Static/scene-cut pairs skipped: {skipped_pairs}")
             logger.info(f"FPS: {original_fps:.2f} -> {target_fps:.2f}")
 
             return {
@@ -221,6 +483,7 @@ class TemporalInterpolator:
                 'metrics': {
                     'total_time': total_time,
                     'frames_processed': processed_count,
+                    'skipped_pairs': skipped_pairs,
                     'original_frame_count': metadata['frame_count'],
                     'output_frame_count': output_frame_count_actual,
                     'original_fps': original_fps,
@@ -241,13 +504,39 @@ class TemporalInterpolator:
                 'metrics': {}
             }
 
+    def _frame_source(self, vp: VideoProcessor, end_frame: Optional[int] = None) -> Iterator:
+        """
+        Pick the decoder for a video
+
+        On CUDA, frames are decoded by NVDEC through FFmpeg so the CPU is
+        left to optical flow; otherwise (or without FFmpeg) OpenCV decodes.
+        The flow estimation runs on host frames either way, so decoded
+        frames are returned as numpy arrays.
+
+        Args:
+            vp: Open video processor
+            end_frame: Stop before this frame (None = whole video)
+
+        Returns:
+            iterator: Decoded BGR frames
+        """
+        if (self.device == 'cuda' and self.sys_manager.optimal_settings.get('use_nvcodec', True)
+                and shutil.which('ffmpeg')):
+            logger.info("Decoder: FFmpeg/cuda")
+            return (frame for _, frame in vp.extract_frames_ffmpeg(end_frame=end_frame, hwaccel='cuda'))
+
+        logger.info("Decoder: OpenCV")
+        return vp.iter_frames(end_frame=end_frame)
+
     def interpolate_preview(
         self,
         input_path: str,
         output_path: str,
         fps_multiplier: int = 2,
         duration: float = 5.0,
-        progress_callback: Optional[Callable[[int, int, float], None]] = None
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        include_audio: bool = False,
+        encoder: Optional[str] = None
     ) -> Dict:
         """
         Interpolate first N seconds for preview
@@ -258,6 +547,8 @@ class TemporalInterpolator:
             fps_multiplier: FPS multiplier
             duration: Duration in seconds to process
             progress_callback: Optional progress callback
+            include_audio: Mux the source audio into the preview
+            encoder: FFmpeg video encoder (see interpolate_stream)
 
         Returns:
             dict: Processing results
@@ -265,29 +556,25 @@ class TemporalInterpolator:
         logger.info(f"Creating FPS interpolation preview ({duration}s) of {input_path}")
 
         try:
-            # Create temporary segment
-            import tempfile
-            temp_segment = tempfile.mktemp(suffix='_segment.mp4')
-
-            # Extract segment
+            # Decoded frames of the first seconds go straight into the
+            # interpolation, without an intermediate segment file
             with VideoProcessor(input_path) as vp:
-                fps = vp.get_fps()
-                vp.extract_segment(0, duration, temp_segment)
-
-            # Interpolate segment
-            result = self.interpolate_video(
-                temp_segment,
-                output_path,
-                fps_multiplier=fps_multiplier,
-                progress_callback=progress_callback
-            )
+                metadata = vp.get_metadata()
+                end_frame = min(int(round(metadata['fps'] * duration)), metadata['frame_count'])
+                metadata['frame_count'] = end_frame
+                metadata['duration'] = end_frame / metadata['fps'] if metadata['fps'] > 0 else 0
 
-            # Clean up
-            import os
-            if os.path.exists(temp_segment):
-                os.remove(temp_segment)
+                target_fps, _ = self._compute_multiplier(metadata['fps'], fps_multiplier)
 
-            return result
+                return self.interpolate_stream(
+                    self._frame_source(vp, end_frame=end_frame),
+                    metadata,
+                    output_path,
+                    target_fps,
+                    audio_source=input_path if include_audio else None,
+                    progress_callback=progress_callback,
+                    encoder=encoder
+                )
 
         except Exception as e:
             logger.error(f"Error creating preview: {e}")
@@ -300,6 +587,51 @@ class TemporalInterpolator:
                 'metrics': {}
             }
 
+    def interpolate_frames(
+        self,
+        frames: Iterable,
+        metadata: Dict,
+        output_path: str,
+        fps_multiplier: int = 2,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        encoder: Optional[str] = None
+    ) -> Dict:
+        """
+        Interpolate frames produced in memory (e.g. by the upscaler)
+
+        `frames` is closed afterwards if it has a close() method.
+
+        Args:
+            frames: BGR frames in display order
+            metadata: Metadata of the stream (see interpolate_stream)
+            output_path: Output video path
+            fps_multiplier: FPS multiplier
+            progress_callback: Optional progress callback
+            encoder: FFmpeg video encoder (see interpolate_stream)
+
+        Returns:
+            dict: Processing results
+        """
+        try:
+            target_fps, _ = self._compute_multiplier(metadata['fps'], fps_multiplier)
+
+            return self.interpolate_stream(
+                frames,
+                metadata,
+                output_path,
+                target_fps,
+                progress_callback=progress_callback,
+                encoder=encoder
+            )
+
+        finally:
+            # A generator (e.g. from upscale_preview_stream) may hold a
+            # decoder and worker threads; release them now, also when the
+            # interpolation stopped early, instead of at garbage collection
+            close = getattr(frames, 'close', None)
+            if close is not None:
+                close()
+
     def detect_source_fps(self, video_path: str) -> float:
         """
         Detect source video FPS
@@ -310,8 +642,7 @@ class TemporalInterpolator:
         Returns:
             float: FPS
         """
-        with VideoProcessor(video_path) as vp:
-            return vp.get_fps()
+        return get_video_info(video_path)['fps']
 
     def estimate_processing_time(self, input_path: str, fps_multiplier: int = 2) -> Dict:
         """
@@ -325,8 +656,7 @@ class TemporalInterpolator:
             dict: Estimated times
         """
         try:
-            with VideoProcessor(input_path) as vp:
-                metadata = vp.get_metadata()
+            metadata = get_video_info(input_path)
 
             # Rough estimates based on hardware
             if self.device == 'cuda':
@@ -382,7 +712,7 @@ def create_interpolator(
     Factory function to create interpolator
 
     Args:
-        model_name: Model name ('rife', 'simple')
+        model_name: Model name ('rife', 'nvof', 'simple')
         device: Device ('cuda', 'cpu', 'auto')
 
     Returns:
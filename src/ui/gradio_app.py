@@ -2,12 +2,18 @@
 Gradio UI for Video Upscaler Pro
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import gradio as gr
-import torch
 import sys
 import os
 import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
 import logging
 
 # Setup logging
@@ -19,24 +25,247 @@ logger = logging.getLogger(__name__)
 
 # Import our modules
 from utils.system_manager import get_system_manager
-from utils.video_processor import VideoProcessor, format_duration
-from processors.spatial_upscaler import create_upscaler
-from processors.temporal_interpolator import create_interpolator
+from utils.video_processor import get_video_info, format_duration
+
+# The processors (and the model code behind them) are imported on first
+# use, so the interface comes up without loading them
 
 # Global state
 current_upscaler = None
 current_interpolator = None
 processing_cancelled = False
 
+# System tab text as (time, text), filled when the tab is first opened
+SYSTEM_INFO_TTL = 5.0
+_system_info = None
+
+# AI model dropdown labels -> model names (None = not implemented yet)
+MODEL_MAP = {
+    "Real-ESRGAN (Fast, Excellent Quality)": "realesrgan",
+    "SwinIR (Slow, Maximum Quality) - Coming Soon": None,
+    "SeedVR2 (Temporal Coherence, High VRAM) - Coming Soon": None,
+}
+DEFAULT_MODEL = "Real-ESRGAN (Fast, Excellent Quality)"
+
+# Processing device radio labels -> device names
+DEVICE_MAP = {
+    "Auto (Recommended)": "auto",
+    "GPU (CUDA)": "cuda",
+    "CPU": "cpu",
+}
+
+# Video encoder dropdown labels -> FFmpeg encoders (None = automatic:
+# NVENC H.264 on CUDA when FFmpeg has it, otherwise the processor default)
+ENCODER_MAP = {
+    "Auto (Recommended)": None,
+    "H.264 NVENC (NVIDIA GPU)": "h264_nvenc",
+    "HEVC NVENC (NVIDIA GPU)": "hevc_nvenc",
+    "H.264 libx264 (CPU)": "libx264",
+}
+
+# Shown when Real-ESRGAN can't be imported
+REALESRGAN_MISSING_MSG = "\n".join([
+    "❌ Real-ESRGAN not available",
+    "",
+    "📦 **Installation Required:**",
+    "",
+    "**Option 1 (Recommended):** Use Python 3.10-3.12",
+    "  • Download: https://www.python.org/downloads/",
+    "  • Run: install.bat",
+    "",
+    "**Option 2:** Manual install for Python 3.13",
+    "  • See: PYTHON_313_WORKAROUND.md",
+    "  • Or run: pip install realesrgan basicsr",
+    "",
+    "💡 **Alternative:** RIFE interpolation works without Real-ESRGAN",
+    "  • Enable 'FPS Interpolation' and try without upscaling",
+])
+
+# Processed videos and previews; previews overwrite one file per input
+OUTPUT_DIR = Path(tempfile.gettempdir()) / "video_upscaler_outputs"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Loaded upscalers keyed by (model_name, scale_factor, fp16, device), most
+# recently used last, so preview -> full runs and switching back and forth
+# between two settings skip reloading the weights. The lock keeps a click
+# and the startup warm-up from loading twice
+UPSCALER_CACHE_SIZE = 2
+_upscaler_cache = OrderedDict()
+_upscaler_lock = threading.Lock()
+
+# Cleared while the startup warm-up runs its test frame through a cached
+# upscaler; the click handlers wait for it, so two runs never share the
+# model's staging buffers and CUDA graph outputs at the same time
+_warm_up_done = threading.Event()
+_warm_up_done.set()
+
+# Loaded interpolators keyed by (model_name, device)
+_interpolator_cache = {}
+_interpolator_lock = threading.Lock()
+
+
+def _throttle(callback, interval: float = 0.1):
+    """
+    Rate-limit a progress callback(current, total, eta) to one call per interval
+
+    Every gr.Progress update is a websocket message to the browser, while
+    the processors can report many times per second. The final update
+    always goes through.
+    """
+    last_call = [0.0]
+
+    def throttled(current, total, eta):
+        now = time.monotonic()
+        if current >= total or now - last_call[0] >= interval:
+            last_call[0] = now
+            callback(current, total, eta)
+
+    return throttled
+
+
+def _get_upscaler(
+    model_name: str,
+    scale_factor: float,
+    fp16: bool,
+    batch_size: Optional[int] = None,
+    device: str = 'auto'
+):
+    """
+    Return the upscaler for these settings, loading it on first use
+
+    Up to UPSCALER_CACHE_SIZE upscalers stay loaded. Loading another one
+    first evicts the least recently used and releases its VRAM. On CUDA the cached
+    model is compiled with torch.compile, which pays off from the second
+    run on; not when TensorRT is installed, whose engine is faster still
+    and is only built for an uncompiled model.
+
+    Half precision is ignored on the CPU, which has no fast FP16 convs.
+    The batch size is not part of the key: it is read at the start of each
+    run, so a cached upscaler just takes the new value (None keeps the
+    current one).
+    """
+    global current_upscaler
+
+    import torch
+    from processors.spatial_upscaler import create_upscaler
+
+    if device == 'auto':
+        device = get_system_manager().get_device()
+
+    # Half precision only exists on CUDA; CPU runs share one entry
+    fp16 = bool(fp16) and device == 'cuda'
+    key = (model_name, float(scale_factor), fp16, device)
+
+    with _upscaler_lock:
+        upscaler = _upscaler_cache.get(key)
+        if upscaler is not None:
+            _upscaler_cache.move_to_end(key)
+            if batch_size:
+                upscaler.batch_size = int(batch_size)
+        else:
+            if len(_upscaler_cache) >= UPSCALER_CACHE_SIZE:
+                _, evicted = _upscaler_cache.popitem(last=False)
+                if evicted is current_upscaler:
+                    current_upscaler = None
+                del evicted
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+
+            upscaler = create_upscaler(
+                model_name=model_name,
+                scale_factor=float(scale_factor),
+                device=device,
+                fp16=fp16,
+                batch_size=batch_size,
+                use_compile=device == 'cuda' and importlib.util.find_spec('torch_tensorrt') is None
+            )
+            _upscaler_cache[key] = upscaler
+
+        current_upscaler = upscaler
+        return upscaler
+
+
+def _warm_up():
+    """
+    Prepare the default upscaler for the first click, in the background
+
+    Loads the upscaler for the default settings (Real-ESRGAN, 4x, half
+    precision, automatic device) into the cache, downloading the weights
+    if needed, and runs one small frame through it. On CUDA this also
+    creates the context and lets cuDNN pick its kernels before the user
+    presses Preview; on the CPU it still saves the import and weight load.
+    """
+    try:
+        import numpy as np
+
+        upscaler = _get_upscaler('realesrgan', 4.0, True)
+        if upscaler.model is not None:
+            upscaler.model.upscale_image(np.zeros((64, 64, 3), dtype=np.uint8))
+        logger.info(f"Warm-up done ({upscaler.device})")
+
+    except Exception as e:
+        logger.info(f"Warm-up skipped: {e}")
+
+    finally:
+        _warm_up_done.set()
+
+
+def _get_interpolator(model_name: str, device: str):
+    """Return the interpolator for these settings, loading it on first use"""
+    global current_interpolator
+
+    from processors.temporal_interpolator import create_interpolator
+
+    key = (model_name, device)
+
+    with _interpolator_lock:
+        interpolator = _interpolator_cache.get(key)
+        if interpolator is None:
+            interpolator = create_interpolator(model_name=model_name, device=device)
+            _interpolator_cache[key] = interpolator
+
+        current_interpolator = interpolator
+        return interpolator
+
+
+def _cached_output_path(video: str, label: str, *settings) -> Path:
+    """
+    Output path for a video processed with the given settings
+
+    The name is the input's name and `label`, plus a hash of the input's
+    path, size and modification time together with the settings, so
+    processing an unchanged video again with the same settings finds the
+    earlier result.
+    """
+    stat = os.stat(video)
+    identity = (os.path.abspath(video), stat.st_size, stat.st_mtime_ns, settings)
+    key = hashlib.sha1(repr(identity).encode()).hexdigest()[:12]
+
+    return OUTPUT_DIR / f"{Path(video).stem}_{label}_{key}.mp4"
+
 
 def get_system_info():
-    """Get system information for display"""
+    """
+    Get system information for display
+
+    Cached for SYSTEM_INFO_TTL seconds, so switching back to the System
+    tab or clicking Refresh repeatedly doesn't query the hardware again.
+    """
+    global _system_info
+
+    now = time.monotonic()
+    if _system_info is not None and now - _system_info[0] < SYSTEM_INFO_TTL:
+        return _system_info[1]
+
     try:
         sys_manager = get_system_manager()
-        return sys_manager.get_info_string()
+        info = sys_manager.get_info_string()
     except Exception as e:
         return f"Error getting system info: {e}"
 
+    _system_info = (now, info)
+    return info
+
 
 def on_video_upload(video):
     """Called when a video is uploaded"""
@@ -45,14 +274,15 @@ def on_video_upload(video):
 
     try:
         # Get video info
-        with VideoProcessor(video) as vp:
-            metadata = vp.get_metadata()
+        metadata = get_video_info(video, fast=True)
 
         # Format info
-        info = f"📹 Resolution: {metadata['width']}x{metadata['height']}\n"
-        info += f"🎞️ FPS: {metadata['fps']:.2f}\n"
-        info += f"⏱️ Duration: {format_duration(metadata['duration'])}\n"
-        info += f"🎬 Frames: {metadata['frame_count']:,}"
+        info = "\n".join([
+            f"📹 Resolution: {metadata['width']}x{metadata['height']}",
+            f"🎞️ FPS: {metadata['fps']:.2f}",
+            f"⏱️ Duration: {format_duration(metadata['duration'])}",
+            f"🎬 Frames: {metadata['frame_count']:,}",
+        ])
 
         # Default output resolution (4x)
         output_res = f"{metadata['width']*4}x{metadata['height']*4} (4K)"
@@ -64,34 +294,30 @@ def on_video_upload(video):
         return f"Error: {e}", "", gr.update(value=f"Error: {e}")
 
 
-def update_output_resolution(video, scale):
-    """Update output resolution based on video and scale"""
-    if video is None:
-        return ""
-
-    try:
-        with VideoProcessor(video) as vp:
-            metadata = vp.get_metadata()
-
-        output_width = metadata['width'] * int(scale)
-        output_height = metadata['height'] * int(scale)
-
-        # Add resolution name
-        if output_width >= 7680:
-            res_name = "8K"
-        elif output_width >= 3840:
-            res_name = "4K"
-        elif output_width >= 2560:
-            res_name = "2K"
-        elif output_width >= 1920:
-            res_name = "Full HD"
-        else:
-            res_name = "HD"
-
-        return f"{output_width}x{output_height} ({res_name})"
-
-    except:
-        return "Unknown"
+# Output resolution for the scale slider, computed in the browser from the
+# dimensions on_video_upload already wrote into the info box. The slider
+# fires on every drag step, and this saves a server round trip each time
+OUTPUT_RESOLUTION_JS = """
+(info, scale) => {
+    const match = /Resolution: (\\d+)x(\\d+)/.exec(info || "");
+    if (!match) {
+        return "";
+    }
+    const width = Math.trunc(parseInt(match[1]) * scale);
+    const height = Math.trunc(parseInt(match[2]) * scale);
+    let name = "HD";
+    if (width >= 7680) {
+        name = "8K";
+    } else if (width >= 3840) {
+        name = "4K";
+    } else if (width >= 2560) {
+        name = "2K";
+    } else if (width >= 1920) {
+        name = "Full HD";
+    }
+    return `${width}x${height} (${name})`;
+}
+"""
 
 
 def toggle_interpolation(enabled, video):
@@ -104,8 +330,7 @@ def toggle_interpolation(enabled, video):
         )
 
     try:
-        with VideoProcessor(video) as vp:
-            source_fps = vp.get_fps()
+        source_fps = get_video_info(video, fast=True)['fps']
 
         target = source_fps * 2  # Default 2x multiplier
         fps_text = f"{source_fps:.1f} FPS → {target:.1f} FPS"
@@ -129,8 +354,7 @@ def update_target_fps(video, multiplier):
         return ""
 
     try:
-        with VideoProcessor(video) as vp:
-            source_fps = vp.get_fps()
+        source_fps = get_video_info(video, fast=True)['fps']
 
         target_fps = source_fps * int(multiplier)
         return f"{source_fps:.1f} FPS → {target_fps:.1f} FPS"
@@ -138,8 +362,13 @@ def update_target_fps(video, multiplier):
         return ""
 
 
-def process_preview(video, model, scale, interp_enabled, interp_model, fps_mult, progress=gr.Progress()):
-    """Process video preview (first 5 seconds)"""
+async def process_preview(video, model, scale, interp_enabled, interp_model, fps_mult, use_fp16=True, batch_size=4, device_choice="Auto (Recommended)", encoder_choice="Auto (Recommended)", progress=gr.Progress(track_tqdm=True)):
+    """
+    Process video preview (first 5 seconds)
+
+    Model loading and processing run in a worker thread so the event loop
+    keeps serving the lighter callbacks (upload, scale change) meanwhile.
+    """
     global current_upscaler, current_interpolator
 
     if video is None:
@@ -149,121 +378,114 @@ def process_preview(video, model, scale, interp_enabled, interp_model, fps_mult,
         progress(0, desc="Initializing...")
 
         # Parse model name
-        if "Real-ESRGAN" in model:
-            model_name = "realesrgan"
-        elif "SwinIR" in model:
-            return None, "❌ SwinIR not yet implemented"
-        elif "SeedVR2" in model:
-            return None, "❌ SeedVR2 not yet implemented"
-        else:
-            model_name = "realesrgan"
+        model_name = MODEL_MAP.get(model, "realesrgan")
+        if model_name is None:
+            return None, f"❌ {model.split(' (')[0]} not yet implemented"
+
+        device = DEVICE_MAP.get(device_choice, "auto")
+        if device == "auto":
+            device = get_system_manager().get_device()
+        elif device == "cuda" and not get_system_manager().device_info['has_cuda']:
+            return None, "❌ No CUDA GPU available, choose Auto or CPU"
 
-        # Create temp paths
-        upscaled_path = tempfile.mktemp(suffix='_upscaled.mp4')
-        output_path = tempfile.mktemp(suffix='_preview.mp4')
+        encoder = ENCODER_MAP.get(encoder_choice)
 
-        # Progress callback
-        def update_progress(current, total, eta):
-            pct = current / total if total > 0 else 0
-            progress(0.1 + 0.45 * pct, desc=f"Processing frame {current}/{total} (ETA: {int(eta)}s)")
+        # The preview outlives this call (Gradio serves it) and is
+        # overwritten by the next preview of the same video
+        output_path = str(OUTPUT_DIR / f"{Path(video).stem}_preview.mp4")
 
-        # Step 1: Upscale
+        # Step 1: Load models
         progress(0.1, desc="Loading upscaling model...")
+        await asyncio.to_thread(_warm_up_done.wait)
         try:
-            upscaler = create_upscaler(
-                model_name=model_name,
-                scale_factor=float(scale),
-                device='auto'
-            )
+            upscaler = await asyncio.to_thread(_get_upscaler, model_name, scale, use_fp16, int(batch_size), device)
         except ImportError as ie:
             if "Real-ESRGAN not available" in str(ie):
-                error_msg = "❌ Real-ESRGAN not available\n\n"
-                error_msg += "📦 **Installation Required:**\n\n"
-                error_msg += "**Option 1 (Recommended):** Use Python 3.10-3.12\n"
-                error_msg += "  • Download: https://www.python.org/downloads/\n"
-                error_msg += "  • Run: install.bat\n\n"
-                error_msg += "**Option 2:** Manual install for Python 3.13\n"
-                error_msg += "  • See: PYTHON_313_WORKAROUND.md\n"
-                error_msg += "  • Or run: pip install realesrgan basicsr\n\n"
-                error_msg += "💡 **Alternative:** RIFE interpolation works without Real-ESRGAN\n"
-                error_msg += "  • Enable 'FPS Interpolation' and try without upscaling"
-                return None, error_msg
+                return None, REALESRGAN_MISSING_MSG
             raise
 
-        progress(0.15, desc="Upscaling preview (5 seconds)...")
-        upscale_result = upscaler.upscale_preview(
-            video,
-            upscaled_path if interp_enabled else output_path,
-            duration=5.0,
-            progress_callback=update_progress
-        )
-
-        if not upscale_result['success']:
-            return None, f"❌ Upscaling error: {upscale_result.get('error', 'Unknown error')}"
-
-        # Step 2: Interpolate (if enabled)
         if interp_enabled:
-            progress(0.55, desc="Loading interpolation model...")
+            progress(0.12, desc="Loading interpolation model...")
 
-            interpolator = create_interpolator(
+            interpolator = await asyncio.to_thread(
+                _get_interpolator,
                 model_name='rife',  # Using RIFE
-                device='auto'
+                device=device
             )
 
+            # Step 2: Upscale and interpolate in one pass. Upscaled frames
+            # go straight into the interpolator, so only the final video
+            # is encoded
+            @_throttle
             def interp_progress(current, total, eta):
                 pct = current / total if total > 0 else 0
-                progress(0.6 + 0.4 * pct, desc=f"Interpolating {current}/{total} pairs (ETA: {int(eta)}s)")
-
-            progress(0.6, desc=f"Interpolating FPS ({fps_mult}x)...")
-            interp_result = interpolator.interpolate_preview(
-                upscaled_path,
+                progress(0.15 + 0.85 * pct, desc=f"Upscaling + interpolating {current}/{total} pairs (ETA: {int(eta)}s)")
+
+            progress(0.15, desc=f"Upscaling and interpolating FPS ({fps_mult}x)...")
+            source = get_video_info(video, fast=True)
+            metadata, frames = await asyncio.to_thread(upscaler.upscale_preview_stream, video, duration=5.0)
+            interp_result = await asyncio.to_thread(
+                interpolator.interpolate_frames,
+                frames,
+                metadata,
                 output_path,
                 fps_multiplier=int(fps_mult),
-                duration=5.0,
-                progress_callback=interp_progress
+                progress_callback=interp_progress,
+                encoder=encoder
             )
 
-            # Clean up temp file
-            if os.path.exists(upscaled_path):
-                os.remove(upscaled_path)
-
             if not interp_result['success']:
-                return None, f"❌ Interpolation error: {interp_result.get('error', 'Unknown error')}"
+                return None, f"❌ Processing error: {interp_result.get('error', 'Unknown error')}"
 
-            # Combine metrics
-            metrics = upscale_result['metrics']
             interp_metrics = interp_result['metrics']
-
-            status = f"✅ Preview completed!\n\n"
-            status += f"📐 Upscaling:\n"
-            status += f"  Input: {metrics['input_resolution']}\n"
-            status += f"  Output: {metrics['output_resolution']}\n"
-            status += f"  Time: {metrics['total_time']:.1f}s\n\n"
-            status += f"🎞️ Interpolation:\n"
-            status += f"  FPS: {interp_metrics.get('original_fps', 'N/A'):.1f} → {interp_metrics.get('new_fps', 'N/A'):.1f}\n"
-            status += f"  Time: {interp_metrics['total_time']:.1f}s\n\n"
-            status += f"⏱️ Total time: {metrics['total_time'] + interp_metrics['total_time']:.1f}s"
+            status = "\n".join([
+                "✅ Preview completed!",
+                "",
+                "📐 Upscaling:",
+                f"  Input: {source['width']}x{source['height']}",
+                f"  Output: {metadata['width']}x{metadata['height']}",
+                "",
+                "🎞️ Interpolation:",
+                f"  FPS: {interp_metrics.get('original_fps', 'N/A'):.1f} → {interp_metrics.get('new_fps', 'N/A'):.1f}",
+                "",
+                f"⏱️ Total time: {interp_metrics['total_time']:.1f}s",
+            ])
 
             return output_path, status
-        else:
-            # Only upscaling
-            metrics = upscale_result['metrics']
-            status = f"✅ Preview completed!\n\n"
-            status += f"⏱️ Processing time: {metrics['total_time']:.1f}s\n"
-            status += f"🎬 Frames processed: {metrics['frames_processed']}\n"
-            status += f"📐 Input: {metrics['input_resolution']}\n"
-            status += f"📐 Output: {metrics['output_resolution']}\n"
-            status += f"⚡ Avg per frame: {metrics['avg_time_per_frame']:.3f}s"
 
-            return output_path, status
+        # Step 2: Upscale only
+        progress(0.15, desc="Upscaling preview (5 seconds)...")
+        upscale_result = await asyncio.to_thread(
+            upscaler.upscale_preview,
+            video,
+            output_path,
+            duration=5.0,
+            encoder=encoder
+        )
+
+        if not upscale_result['success']:
+            return None, f"❌ Upscaling error: {upscale_result.get('error', 'Unknown error')}"
+
+        metrics = upscale_result['metrics']
+        status = "\n".join([
+            "✅ Preview completed!",
+            "",
+            f"⏱️ Processing time: {metrics['total_time']:.1f}s",
+            f"🎬 Frames processed: {metrics['frames_processed']}",
+            f"📐 Input: {metrics['input_resolution']}",
+            f"📐 Output: {metrics['output_resolution']}",
+            f"⚡ Avg per frame: {metrics['avg_time_per_frame']:.3f}s",
+        ])
+
+        return output_path, status
 
     except Exception as e:
         logger.error(f"Error in preview: {e}", exc_info=True)
         return None, f"❌ Error: {str(e)}"
 
 
-def process_full_video(video, model, scale, interp_enabled, interp_model, fps_mult, temporal, progress=gr.Progress()):
-    """Process full video"""
+async def process_full_video(video, model, scale, interp_enabled, interp_model, fps_mult, temporal, use_fp16=True, batch_size=4, device_choice="Auto (Recommended)", encoder_choice="Auto (Recommended)", progress=gr.Progress(track_tqdm=True)):
+    """Process full video (blocking work runs in a worker thread, see process_preview)"""
     global current_upscaler
 
     if video is None:
@@ -273,74 +495,68 @@ def process_full_video(video, model, scale, interp_enabled, interp_model, fps_mu
         progress(0, desc="Initializing...")
 
         # Parse model name
-        if "Real-ESRGAN" in model:
-            model_name = "realesrgan"
-        elif "SwinIR" in model:
-            return None, "❌ SwinIR not yet implemented", []
-        elif "SeedVR2" in model:
-            return None, "❌ SeedVR2 not yet implemented", []
-        else:
-            model_name = "realesrgan"
+        model_name = MODEL_MAP.get(model, "realesrgan")
+        if model_name is None:
+            return None, f"❌ {model.split(' (')[0]} not yet implemented", []
+
+        device = DEVICE_MAP.get(device_choice, "auto")
+        if device == "auto":
+            device = get_system_manager().get_device()
+        elif device == "cuda" and not get_system_manager().device_info['has_cuda']:
+            return None, "❌ No CUDA GPU available, choose Auto or CPU", []
+
+        encoder = ENCODER_MAP.get(encoder_choice)
+
+        # Same video, same settings: the earlier result is still valid
+        fp16 = bool(use_fp16) and device == "cuda"
+        output_path = str(_cached_output_path(
+            video, f"upscaled_{scale}x", model_name, float(scale), fp16, device, encoder
+        ))
+        if os.path.exists(output_path):
+            logger.info(f"Reusing existing output: {output_path}")
+            progress(1.0, desc="Already processed")
+            status = f"✅ Video already processed with these settings\n\n💾 Output:\n{output_path}"
+            return output_path, status, []
 
         # Create upscaler
         progress(0.05, desc="Loading AI model...")
+        await asyncio.to_thread(_warm_up_done.wait)
         try:
-            upscaler = create_upscaler(
-                model_name=model_name,
-                scale_factor=float(scale),
-                device='auto'
-            )
+            upscaler = await asyncio.to_thread(_get_upscaler, model_name, scale, use_fp16, int(batch_size), device)
         except ImportError as ie:
             if "Real-ESRGAN not available" in str(ie):
-                error_msg = "❌ Real-ESRGAN not available\n\n"
-                error_msg += "📦 **Installation Required:**\n\n"
-                error_msg += "**Option 1 (Recommended):** Use Python 3.10-3.12\n"
-                error_msg += "  • Download: https://www.python.org/downloads/\n"
-                error_msg += "  • Run: install.bat\n\n"
-                error_msg += "**Option 2:** Manual install for Python 3.13\n"
-                error_msg += "  • See: PYTHON_313_WORKAROUND.md\n"
-                error_msg += "  • Or run: pip install realesrgan basicsr\n\n"
-                error_msg += "💡 **Alternative:** RIFE interpolation works without Real-ESRGAN\n"
-                error_msg += "  • Enable 'FPS Interpolation' and try without upscaling"
-                return None, error_msg, []
+                return None, REALESRGAN_MISSING_MSG, []
             raise
 
         # Get estimate
-        estimate = upscaler.estimate_processing_time(video)
+        estimate = await asyncio.to_thread(upscaler.estimate_processing_time, video)
         estimated_time = estimate.get('estimated_total_time_formatted', 'Unknown')
 
         logger.info(f"Estimated processing time: {estimated_time}")
 
-        # Create output path
-        output_dir = Path(tempfile.gettempdir()) / "video_upscaler_outputs"
-        output_dir.mkdir(exist_ok=True)
-
-        input_name = Path(video).stem
-        output_path = str(output_dir / f"{input_name}_upscaled_{scale}x.mp4")
-
-        # Progress callback
-        def update_progress(current, total, eta):
-            pct = current / total if total > 0 else 0
-            progress(0.05 + 0.95 * pct, desc=f"Processing {current}/{total} frames (ETA: {int(eta)}s)")
-
-        # Process video
+        # Process video. Written under a partial name and renamed once
+        # complete, so an interrupted run is never mistaken for a result
         progress(0.05, desc=f"Processing full video (est. {estimated_time})...")
-        result = upscaler.upscale_video(
-            video,
-            output_path,
-            progress_callback=update_progress
-        )
+        partial_path = output_path[:-len('.mp4')] + '.partial.mp4'
+        # Frame progress comes from the upscaler's tqdm bar
+        result = await asyncio.to_thread(upscaler.upscale_video, video, partial_path, encoder=encoder)
 
         if result['success']:
+            os.replace(partial_path, output_path)
+
             metrics = result['metrics']
 
-            status = f"✅ Video upscaling completed!\n\n"
-            status += f"💾 Output saved to:\n{output_path}\n\n"
-            status += f"📊 Statistics:\n"
-            status += f"⏱️ Total time: {metrics['total_time']:.1f}s ({metrics['total_time']/60:.1f} min)\n"
-            status += f"🎬 Frames: {metrics['frames_processed']:,}\n"
-            status += f"📐 Resolution: {metrics['input_resolution']} → {metrics['output_resolution']}\n"
-            status += f"⚡ Speed: {metrics['avg_time_per_frame']:.3f}s per frame"
+            status = "\n".join([
+                "✅ Video upscaling completed!",
+                "",
+                f"💾 Output saved to:\n{output_path}",
+                "",
+                "📊 Statistics:",
+                f"⏱️ Total time: {metrics['total_time']:.1f}s ({metrics['total_time']/60:.1f} min)",
+                f"🎬 Frames: {metrics['frames_processed']:,}",
+                f"📐 Resolution: {metrics['input_resolution']} → {metrics['output_resolution']}",
+                f"⚡ Speed: {metrics['avg_time_per_frame']:.3f}s per frame",
+            ])
 
             # Metrics table
             metrics_data = [
@@ -354,6 +570,8 @@ def process_full_video(video, model, scale, interp_enabled, interp_model, fps_mu
 
             return output_path, status, metrics_data
         else:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
             error_msg = f"❌ Processing failed: {result.get('error', 'Unknown error')}"
             return None, error_msg, []
 
@@ -413,13 +631,9 @@ def create_interface():
                             gr.Markdown("### ⚙️ Upscaling Settings")
 
                             spatial_model = gr.Dropdown(
-                                choices=[
-                                    "Real-ESRGAN (Fast, Excellent Quality)",
-                                    "SwinIR (Slow, Maximum Quality) - Coming Soon",
-                                    "SeedVR2 (Temporal Coherence, High VRAM) - Coming Soon"
-                                ],
+                                choices=list(MODEL_MAP),
                                 label="AI Model",
-                                value="Real-ESRGAN (Fast, Excellent Quality)",
+                                value=DEFAULT_MODEL,
                                 info="Choose the model based on your needs and hardware"
                             )
 
@@ -574,33 +788,46 @@ def create_interface():
                     gr.Markdown("#### 🖥️ Performance")
 
                     device_choice = gr.Radio(
-                        choices=[
-                            "Auto (Recommended)",
-                            "GPU (CUDA)",
-                            "CPU"
-                        ],
+                        choices=list(DEVICE_MAP),
                         value="Auto (Recommended)",
                         label="Processing Device",
-                        interactive=False
+                        interactive=True
                     )
 
                     use_fp16 = gr.Checkbox(
-                        label="Use FP16 (Faster, slight quality loss)",
+                        label="Use Half Precision (Faster; BF16 on RTX 30 series and newer, FP16 otherwise)",
                         value=True,
-                        interactive=False
+                        interactive=True
+                    )
+
+                    batch_size = gr.Slider(
+                        minimum=1,
+                        maximum=16,
+                        step=1,
+                        value=4,
+                        label="GPU Batch Size",
+                        info="Frames per model call. Higher = faster but more VRAM (reduced automatically to fit)"
+                    )
+
+                    encoder_choice = gr.Dropdown(
+                        choices=list(ENCODER_MAP),
+                        value="Auto (Recommended)",
+                        label="Video Encoder",
+                        info="NVENC encodes on the GPU alongside the model; falls back to Auto if unavailable"
                     )
 
             # ============================================================
             # TAB 4: SYSTEM INFO
             # ============================================================
-            with gr.Tab("💻 System"):
+            with gr.Tab("💻 System") as system_tab:
                 gr.Markdown("### System Information")
 
+                # Filled when the tab is opened, not while building the UI
                 system_info = gr.Textbox(
                     label="Detected Configuration",
                     lines=15,
                     interactive=False,
-                    value=get_system_info()
+                    value=""
                 )
 
                 refresh_btn = gr.Button("🔄 Refresh Information")
@@ -633,9 +860,10 @@ def create_interface():
 
         # Scale change
         scale_factor.change(
-            fn=update_output_resolution,
-            inputs=[video_input, scale_factor],
-            outputs=[output_resolution]
+            fn=None,
+            inputs=[video_info, scale_factor],
+            outputs=[output_resolution],
+            js=OUTPUT_RESOLUTION_JS
         )
 
         # Interpolation toggle
@@ -645,8 +873,9 @@ def create_interface():
             outputs=[interpolation_model, fps_multiplier, target_fps]
         )
 
-        # FPS multiplier change
-        fps_multiplier.change(
+        # FPS multiplier change. On release, not on change: dragging fires
+        # change for every step, each a server round trip through the queue
+        fps_multiplier.release(
             fn=update_target_fps,
             inputs=[video_input, fps_multiplier],
             outputs=[target_fps]
@@ -661,9 +890,16 @@ def create_interface():
                 scale_factor,
                 enable_interpolation,
                 interpolation_model,
-                fps_multiplier
+                fps_multiplier,
+                use_fp16,
+                batch_size,
+                device_choice,
+                encoder_choice
             ],
-            outputs=[video_preview, status_text]
+            outputs=[video_preview, status_text],
+            # One GPU job at a time, shared with the process button
+            concurrency_limit=1,
+            concurrency_id="gpu"
         )
 
         # Process button
@@ -676,9 +912,21 @@ def create_interface():
                 enable_interpolation,
                 interpolation_model,
                 fps_multiplier,
-                temporal_method
+                temporal_method,
+                use_fp16,
+                batch_size,
+                device_choice,
+                encoder_choice
             ],
-            outputs=[video_output, status_text, metrics_display]
+            outputs=[video_output, status_text, metrics_display],
+            concurrency_limit=1,
+            concurrency_id="gpu"
+        )
+
+        # System info, detected on demand
+        system_tab.select(
+            fn=get_system_info,
+            outputs=[system_info]
         )
 
         # Refresh system info
@@ -687,6 +935,10 @@ def create_interface():
             outputs=[system_info]
         )
 
+    # Overlap the model start-up with the user reading the page
+    _warm_up_done.clear()
+    threading.Thread(target=_warm_up, name='warm-up', daemon=True).start()
+
     return app
 
 
@@ -6,8 +6,17 @@ Handles GPU/CPU detection and provides optimal settings recommendations
 import torch
 import platform
 import os
+import logging
 from typing import Dict, Tuple
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 
 class SystemManager:
     """Manages system detection and optimization settings"""
@@ -16,6 +25,7 @@ class SystemManager:
         """Initialize system manager and detect hardware"""
         self.device_info = self._detect_device()
         self.optimal_settings = self._calculate_optimal_settings()
+        self._cpu_threads_configured = False
 
     def _detect_device(self) -> Dict:
         """
@@ -32,9 +42,15 @@ class SystemManager:
             'vram_total_gb': 0.0,
             'vram_available_gb': 0.0,
             'cpu_count': os.cpu_count() or 1,
+            'physical_cores': os.cpu_count() or 1,
+            'cpu_capability': 'unknown',
             'ram_total_gb': 0.0
         }
 
+        # SIMD level PyTorch dispatches CPU kernels to (e.g. AVX2, AVX512)
+        if hasattr(torch.backends, 'cpu') and hasattr(torch.backends.cpu, 'get_cpu_capability'):
+            info['cpu_capability'] = torch.backends.cpu.get_cpu_capability()
+
         if torch.cuda.is_available():
             info['device_count'] = torch.cuda.device_count()
             info['device_name'] = torch.cuda.get_device_name(0)
@@ -43,10 +59,10 @@ class SystemManager:
             info['vram_available_gb'] = self._get_available_vram()
 
         # Get RAM info
-        try:
-            import psutil
+        if PSUTIL_AVAILABLE:
             info['ram_total_gb'] = psutil.virtual_memory().total / (1024**3)
-        except ImportError:
+            info['physical_cores'] = psutil.cpu_count(logical=False) or info['cpu_count']
+        else:
             # psutil not available, estimate
             info['ram_total_gb'] = 16.0
 
@@ -82,6 +98,12 @@ class SystemManager:
             'device': 'cpu',
             'batch_size': 1,
             'use_fp16': False,
+            'use_compile': False,  # torch.compile the model (slow first run)
+            'use_tensorrt': True,  # TensorRT engine if torch_tensorrt is installed (CUDA only)
+            'use_cuda_graphs': True,  # Replay the forward pass as a CUDA graph (CUDA only)
+            'use_residual_cache': False,  # Reuse trunk outputs of near-identical frames (lossy, opt-in)
+            'use_int8': True,  # INT8 quantization (CPU only)
+            'use_nvcodec': True,  # NVDEC/NVENC through FFmpeg (CUDA only)
             'recommended_model': 'realesrgan',
             'max_scale_factor': 2,
             'enable_temporal_coherence': False,
@@ -174,6 +196,29 @@ class SystemManager:
         """
         return self.optimal_settings['device']
 
+    def configure_cpu_threads(self):
+        """
+        Size PyTorch's CPU thread pools for inference
+
+        PyTorch starts one intra-op thread per logical CPU. Hyperthreads
+        share the core's vector units and caches, so past the physical core
+        count extra threads only add contention. Only the first call has
+        an effect.
+        """
+        if self._cpu_threads_configured:
+            return
+        self._cpu_threads_configured = True
+
+        threads = self.device_info['physical_cores']
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:
+            # Only allowed before any inter-op parallel work has started
+            pass
+
+        logger.info(f"CPU inference: {threads} threads, {self.device_info['cpu_capability']} kernels")
+
     def get_info_string(self) -> str:
         """
         Get formatted system information string
@@ -196,7 +241,7 @@ class SystemManager:
             lines.append(f"CUDA: Not available (CPU mode)")
 
         lines.extend([
-            f"CPU Cores: {info['cpu_count']}",
+            f"CPU Cores: {info['physical_cores']} physical / {info['cpu_count']} logical ({info['cpu_capability']})",
             f"RAM: {info['ram_total_gb']:.1f} GB",
             "",
             "Recommended Settings:",
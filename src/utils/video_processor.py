@@ -6,16 +6,181 @@ Extract frames, get metadata, and encode videos
 import cv2
 import numpy as np
 import os
+import platform
+import functools
+import json
 import subprocess
 import tempfile
 import shutil
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Generator
+from typing import Dict, List, Tuple, Optional, Generator, Iterable, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def ffmpeg_encoder_available(encoder: str) -> bool:
+    """
+    Check that FFmpeg can actually encode with a given encoder
+
+    Hardware encoders (e.g. h264_nvenc) are listed by `ffmpeg -encoders`
+    even without a usable GPU or driver, so this encodes one test frame.
+    Cached for the lifetime of the process.
+
+    Args:
+        encoder: FFmpeg encoder name
+
+    Returns:
+        bool: True if the encoder works
+    """
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=c=black:s=256x256',
+        '-frames:v', '1', '-c:v', encoder,
+        '-f', 'null', '-'
+    ]
+
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+        return result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _read_metadata(cap: cv2.VideoCapture) -> Dict:
+    """Read the metadata dict from an opened capture"""
+    metadata = {
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': cap.get(cv2.CAP_PROP_FPS),
+        'frame_count': int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        'codec': int(cap.get(cv2.CAP_PROP_FOURCC)),
+    }
+
+    metadata['duration'] = metadata['frame_count'] / metadata['fps'] if metadata['fps'] > 0 else 0
+    metadata['resolution'] = (metadata['width'], metadata['height'])
+
+    return metadata
+
+
+def _parse_rate(rate: str) -> float:
+    """Parse an FFmpeg rational such as '30000/1001'"""
+    num, _, den = (rate or '0').partition('/')
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _parse_duration(value) -> float:
+    """Parse an FFmpeg duration in seconds ('12.5') or as a tag ('00:00:12.500000000')"""
+    try:
+        seconds = 0.0
+        for part in str(value).split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return 0.0
+
+
+def _ffprobe_metadata(path: str, fast: bool = False) -> Optional[Dict]:
+    """
+    Read video metadata with a single ffprobe call
+
+    Much cheaper than a cv2.VideoCapture, which initialises the decoder
+    just to answer a few property queries. The dict matches
+    _read_metadata(); None if ffprobe is missing or can't read the file.
+
+    With fast=True, stream probing is cut to the minimum, so only what
+    the container header declares is read (enough for MP4/MOV/MKV). If
+    the header leaves size, FPS or length unknown (e.g. MPEG-TS), the
+    full probe runs instead; None if that doesn't know them either, so
+    the caller falls back to OpenCV.
+    """
+    cmd = ['ffprobe', '-v', 'quiet']
+    if fast:
+        cmd += ['-probesize', '32', '-analyzeduration', '0']
+    cmd += [
+        '-print_format', 'json',
+        '-show_format', '-show_streams', '-select_streams', 'v:0',
+        path
+    ]
+
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=30, check=True)
+        info = json.loads(result.stdout)
+        stream = info['streams'][0]
+        width, height = int(stream['width']), int(stream['height'])
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError):
+        return None
+
+    # OpenCV applies the display rotation, so report the rotated size
+    rotation = stream.get('tags', {}).get('rotate', 0)
+    for side_data in stream.get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    if abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+
+    # r_frame_rate is derived from the timebase; for variable frame rate
+    # sources only avg_frame_rate matches the actual number of frames
+    fps = _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+
+    nb_frames = stream.get('nb_frames', '')
+    if nb_frames.isdigit():
+        frame_count = int(nb_frames)
+    else:
+        # Containers like MKV/WebM store neither a frame count nor a
+        # stream duration, only the container length or a DURATION tag
+        container = info.get('format', {})
+        duration = (
+            _parse_duration(stream.get('duration', 0))
+            or _parse_duration(container.get('duration', 0))
+            or _parse_duration(stream.get('tags', {}).get('DURATION', 0))
+        )
+        frame_count = int(round(duration * fps))
+
+    if min(width, height, fps, frame_count) <= 0:
+        return _ffprobe_metadata(path) if fast else None
+
+    metadata = {
+        'width': width,
+        'height': height,
+        'fps': fps,
+        'frame_count': frame_count,
+        'codec': int(stream.get('codec_tag', '0x0'), 16),
+    }
+
+    metadata['duration'] = metadata['frame_count'] / metadata['fps'] if metadata['fps'] > 0 else 0
+    metadata['resolution'] = (metadata['width'], metadata['height'])
+
+    return metadata
+
+
+@functools.lru_cache(maxsize=32)
+def _probe(path: str, mtime_ns: int, size: int, fast: bool = False) -> Dict:
+    """
+    Probe a video file once per version of it
+
+    Uses ffprobe when available and falls back to OpenCV. mtime and size
+    are part of the cache key so a file replaced in place is probed again.
+    Callers must not mutate the returned dict.
+    """
+    metadata = _ffprobe_metadata(path, fast)
+    if metadata is not None:
+        return metadata
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video file: {path}")
+        return _read_metadata(cap)
+    finally:
+        cap.release()
+
+
 class VideoProcessor:
     """Handle video processing operations"""
 
@@ -48,18 +213,7 @@ class VideoProcessor:
         Returns:
             dict: Video metadata
         """
-        metadata = {
-            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-            'fps': self.cap.get(cv2.CAP_PROP_FPS),
-            'frame_count': int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)),
-            'codec': int(self.cap.get(cv2.CAP_PROP_FOURCC)),
-        }
-
-        metadata['duration'] = metadata['frame_count'] / metadata['fps'] if metadata['fps'] > 0 else 0
-        metadata['resolution'] = (metadata['width'], metadata['height'])
-
-        return metadata
+        return _read_metadata(self.cap)
 
     def get_metadata(self) -> Dict:
         """
@@ -136,6 +290,100 @@ class VideoProcessor:
                 for _ in range(step - 1):
                     self.cap.read()
 
+    def iter_frames(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Iterate over decoded frames, one at a time
+
+        Only the current frame is held in memory. Without end_frame this
+        reads until the stream ends instead of trusting the container's
+        frame count, which is only an estimate for some formats.
+
+        Args:
+            start_frame: Starting frame index
+            end_frame: Ending frame index (None = until the end of the video)
+
+        Yields:
+            numpy.ndarray: Frame as BGR image
+        """
+        if start_frame:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+        frame_idx = start_frame
+        while end_frame is None or frame_idx < end_frame:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+
+            yield frame
+            frame_idx += 1
+
+    def extract_frames_ffmpeg(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        hwaccel: Optional[str] = None
+    ) -> Generator[Tuple[int, np.ndarray], None, None]:
+        """
+        Extract frames by piping raw BGR frames out of FFmpeg
+
+        With hwaccel='cuda' decoding runs on NVDEC and leaves the CPU to the
+        rest of the pipeline. If hardware decoding yields nothing (no usable
+        device, or an FFmpeg build without it), decoding is retried in
+        software.
+
+        Args:
+            start_frame: Starting frame index
+            end_frame: Ending frame index (None = all frames)
+            hwaccel: FFmpeg hardware acceleration method (None = software)
+
+        Yields:
+            tuple: (frame_index, frame_data)
+        """
+        if end_frame is None:
+            end_frame = self.get_frame_count()
+
+        width, height = self.get_resolution()
+        frame_bytes = width * height * 3
+
+        cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+        if hwaccel:
+            cmd += ['-hwaccel', hwaccel]
+        cmd += [
+            '-i', self.video_path,
+            '-map', '0:v:0',
+            '-vsync', 'passthrough',
+            '-frames:v', str(end_frame),
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-'
+        ]
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        decoded = 0
+
+        try:
+            for frame_idx in range(end_frame):
+                frame = np.empty((height, width, 3), dtype=np.uint8)
+                if process.stdout.readinto(memoryview(frame).cast('B')) != frame_bytes:
+                    break
+                decoded += 1
+
+                # Frames before the range are decoded anyway: seeking by
+                # timestamp isn't frame-accurate
+                if frame_idx >= start_frame:
+                    yield frame_idx, frame
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+
+        if hwaccel and decoded == 0 and end_frame > 0:
+            logger.warning(f"Hardware decoding ({hwaccel}) failed, decoding in software")
+            yield from self.extract_frames_ffmpeg(start_frame, end_frame)
+
     def extract_frames_list(
         self,
         start_frame: int = 0,
@@ -264,7 +512,10 @@ class VideoWriter:
         fps: float,
         resolution: Tuple[int, int],
         codec: str = 'mp4v',
-        audio_source: Optional[str] = None
+        audio_source: Optional[str] = None,
+        encoder: Optional[str] = None,
+        preset: Optional[str] = None,
+        expected_frames: Optional[int] = None
     ):
         """
         Initialize video writer
@@ -275,34 +526,93 @@ class VideoWriter:
             resolution: (width, height)
             codec: Video codec fourcc
             audio_source: Path to video with audio to copy
+            encoder: FFmpeg video encoder (e.g. 'h264_nvenc'). Frames are
+                     piped straight into FFmpeg, which muxes the audio in
+                     the same pass. None = OpenCV writer with `codec`
+            preset: Encoder speed preset (e.g. 'ultrafast' for libx264),
+                    FFmpeg encoders only. None = the encoder's default
+            expected_frames: Number of frames that will be written, if
+                             known. A small video-only intermediate for
+                             the audio copy is then kept in RAM (see
+                             scratch_path) instead of next to the output
         """
         self.output_path = output_path
         self.fps = fps
         self.resolution = resolution
         self.audio_source = audio_source
+        self.encoder = encoder
+        self.preset = preset
+        self.process = None
+        self.writer = None
 
         # Create temporary file for video without audio
         self.temp_path = None
-        if audio_source:
-            self.temp_path = output_path.replace('.mp4', '_temp.mp4')
-            actual_output = self.temp_path
+
+        if encoder:
+            # FFmpeg writes the final file directly, audio included
+            self._open_ffmpeg(encoder)
+
         else:
-            actual_output = output_path
-
-        # Initialize VideoWriter
-        fourcc = cv2.VideoWriter_fourcc(*codec)
-        self.writer = cv2.VideoWriter(
-            actual_output,
-            fourcc,
-            fps,
-            resolution
-        )
+            if audio_source:
+                self.temp_path = self._temp_path(expected_frames)
+                actual_output = self.temp_path
+            else:
+                actual_output = output_path
+
+            # Initialize VideoWriter
+            fourcc = cv2.VideoWriter_fourcc(*codec)
+            self.writer = cv2.VideoWriter(
+                actual_output,
+                fourcc,
+                fps,
+                resolution
+            )
 
-        if not self.writer.isOpened():
-            raise ValueError(f"Cannot create video writer for: {output_path}")
+            if not self.writer.isOpened():
+                raise ValueError(f"Cannot create video writer for: {output_path}")
 
         self.frame_count = 0
 
+    def _temp_path(self, expected_frames: Optional[int]) -> str:
+        """Path for the video written before the audio is copied in"""
+        size = None
+        if expected_frames:
+            # Rough upper bound for OpenCV's MPEG-4 at its default quality
+            width, height = self.resolution
+            size = width * height * 3 * expected_frames // 8
+
+        return scratch_path('.mp4', size) or self.output_path.replace('.mp4', '_temp.mp4')
+
+    def _open_ffmpeg(self, encoder: str):
+        """
+        Start an FFmpeg process that encodes raw BGR frames from stdin
+
+        Args:
+            encoder: FFmpeg video encoder
+        """
+        width, height = self.resolution
+
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}', '-r', str(self.fps),
+            '-i', '-'
+        ]
+        if self.audio_source:
+            cmd += ['-i', self.audio_source, '-map', '0:v:0', '-map', '1:a:0?', '-c:a', 'aac', '-shortest']
+        cmd += ['-c:v', encoder]
+        if self.preset:
+            cmd += ['-preset', self.preset]
+        if 'hevc' in encoder or encoder == 'libx265':
+            # hvc1 tag: Apple players and browsers won't play hev1-tagged MP4s
+            cmd += ['-tag:v', 'hvc1']
+        cmd += ['-pix_fmt', 'yuv420p', self.output_path]
+
+        try:
+            self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise ValueError(f"FFmpeg not found, cannot encode with {encoder}")
+
     def write_frame(self, frame: np.ndarray):
         """
         Write a single frame
@@ -314,7 +624,17 @@ class VideoWriter:
         if frame.shape[1] != self.resolution[0] or frame.shape[0] != self.resolution[1]:
             frame = cv2.resize(frame, self.resolution)
 
-        self.writer.write(frame)
+        if self.process is not None:
+            try:
+                self.process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+            except BrokenPipeError:
+                process, self.process = self.process, None
+                error = process.stderr.read().decode(errors='replace')
+                process.wait()
+                raise RuntimeError(f"FFmpeg ({self.encoder}) stopped: {error.strip()}")
+        else:
+            self.writer.write(frame)
+
         self.frame_count += 1
 
     def write_frames(self, frames: List[np.ndarray]):
@@ -338,9 +658,23 @@ class VideoWriter:
             self.writer.release()
             self.writer = None
 
+        if self.process is not None:
+            process, self.process = self.process, None
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            error = process.stderr.read().decode(errors='replace')
+            if process.wait() != 0:
+                logger.error(f"FFmpeg ({self.encoder}) failed: {error.strip()}")
+
         # Copy audio if source provided
-        if copy_audio and self.audio_source and self.temp_path:
-            self._copy_audio()
+        if self.temp_path and os.path.exists(self.temp_path):
+            if copy_audio:
+                self._copy_audio()
+            else:
+                # Error path: don't leave a partial intermediate behind
+                os.remove(self.temp_path)
 
     def _copy_audio(self):
         """Copy audio from source video using FFmpeg"""
@@ -393,18 +727,252 @@ class VideoWriter:
         self.close(copy_audio=False)
 
 
-def get_video_info(video_path: str) -> Dict:
+# End-of-stream marker for the background frame queues
+_END = object()
+
+
+class FramePrefetcher:
+    """
+    Read frames ahead in a background thread
+
+    Wraps a frame iterator (e.g. VideoProcessor.extract_frames) so decoding
+    overlaps with whatever the consumer does with each frame. Errors raised
+    by the source are re-raised in the consuming thread.
+    """
+
+    def __init__(self, source: Iterable, maxsize: int = 4):
+        """
+        Initialize prefetcher
+
+        Args:
+            source: Frame iterator to drain
+            maxsize: Maximum number of frames read ahead
+        """
+        self._source = source
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='frame-prefetch', daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Queue an item, giving up if the consumer has closed the prefetcher"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        """Producer thread"""
+        try:
+            for item in self._source:
+                if not self._put(item):
+                    return
+        except Exception as e:
+            self._put(e)
+            return
+
+        self._put(_END)
+
+    def __iter__(self) -> Iterator:
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        """Stop reading ahead and wait for the producer thread"""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+
+class AsyncFrameWriter:
+    """
+    Write frames to a VideoWriter from a background thread
+
+    write_frame() only queues the frame, so encoding overlaps with producing
+    the next one. Frames are written in order; an encoding error is raised
+    from the next write_frame() or from close(). frames_written counts the
+    frames already handed to the encoder, for progress reporting.
+    """
+
+    def __init__(self, writer: 'VideoWriter', maxsize: int = 4):
+        """
+        Initialize async writer
+
+        Args:
+            writer: Open VideoWriter (closed by its owner, not here)
+            maxsize: Maximum number of frames waiting to be encoded
+        """
+        self.writer = writer
+        self.frames_written = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='frame-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Consumer thread"""
+        while True:
+            frame = self._queue.get()
+            if frame is _END:
+                return
+            if self._error is not None:
+                # Keep draining so producers never block on a dead writer
+                continue
+            try:
+                self.writer.write_frame(frame)
+                self.frames_written += 1
+            except Exception as e:
+                self._error = e
+
+    def write_frame(self, frame: np.ndarray):
+        """
+        Queue a single frame for writing
+
+        Args:
+            frame: Frame to write (BGR format, not modified afterwards)
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def close(self):
+        """Flush queued frames and wait for the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(_END)
+            self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: flush, but don't mask the original error
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+def get_video_info(video_path: str, fast: bool = False) -> Dict:
     """
     Get video information without opening VideoProcessor
 
+    Results are cached per (path, mtime, size), so repeated lookups of the
+    same file (UI callbacks, FPS detection, time estimates) don't reopen it.
+
     Args:
         video_path: Path to video file
+        fast: Read only the container header (for display; falls back to
+              a full probe when the header is incomplete)
 
     Returns:
         dict: Video information
+
+    Raises:
+        FileNotFoundError: If video file doesn't exist
+        ValueError: If video file cannot be opened
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    return _probe(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size, fast).copy()
+
+
+# Largest intermediate kept in RAM by scratch_path
+SCRATCH_MAX_SIZE = 512 * 1024 ** 2
+
+
+def scratch_path(suffix: str, size: Optional[int]) -> Optional[str]:
+    """
+    Create an empty file in RAM for a small, short-lived intermediate
+
+    Uses /dev/shm (RAM-backed), so the intermediate is written and read
+    back without touching the disk. Only for files of a known size up to
+    SCRATCH_MAX_SIZE that leave at least as much again free: a full
+    /dev/shm means memory pressure, and writers such as OpenCV's fail
+    silently on ENOSPC. Container /dev/shm mounts are often only 64 MB.
+    The caller removes the file.
+
+    Args:
+        suffix: File name suffix (e.g. '.mp4')
+        size: Expected file size in bytes (None = unknown)
+
+    Returns:
+        Path to the new file, or None if the caller should use the disk
+    """
+    if size is None or size > SCRATCH_MAX_SIZE or not os.path.isdir('/dev/shm'):
+        return None
+
+    try:
+        if shutil.disk_usage('/dev/shm').free < 2 * size:
+            return None
+        with tempfile.NamedTemporaryFile(suffix=suffix, dir='/dev/shm', delete=False) as f:
+            return f.name
+    except OSError:
+        return None
+
+
+def clone_or_copy(src: str, dst: str):
+    """
+    Make dst a copy of src, without moving any bytes when possible
+
+    Tries a copy-on-write clone (`cp --reflink=auto`, btrfs/xfs) and falls
+    back to a plain copy. Never a hardlink: the writers here truncate an
+    existing output in place, which would then overwrite the source too.
+    dst is replaced atomically, so an existing output is never left
+    half-written.
+
+    Args:
+        src: Source file
+        dst: Destination file (overwritten if it exists)
     """
-    with VideoProcessor(video_path) as vp:
-        return vp.get_metadata()
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+
+    try:
+        cloned = False
+        if platform.system() == 'Linux' and shutil.which('cp'):
+            try:
+                subprocess.run(
+                    ['cp', '--reflink=auto', src, tmp_path],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+                )
+                cloned = True
+            except (OSError, subprocess.CalledProcessError):
+                pass
+
+        if not cloned:
+            shutil.copyfile(src, tmp_path)
+
+        os.replace(tmp_path, dst)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def format_duration(seconds: float) -> str:
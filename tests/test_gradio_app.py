@@ -0,0 +1,84 @@
+"""
+Tests for the helpers of the Gradio UI (output reuse, progress throttling)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('gradio')
+
+from ui import gradio_app
+from ui.gradio_app import OUTPUT_DIR, _cached_output_path, _throttle
+
+
+def test_warm_up_releases_waiting_handlers(monkeypatch):
+    seen = []
+
+    def get_upscaler(*args, **kwargs):
+        # Handlers must still be held back while the test frame runs
+        seen.append(gradio_app._warm_up_done.is_set())
+        raise RuntimeError("no weights")
+
+    monkeypatch.setattr(gradio_app, '_get_upscaler', get_upscaler)
+    gradio_app._warm_up_done.clear()
+
+    gradio_app._warm_up()
+
+    assert seen == [False]
+    assert gradio_app._warm_up_done.is_set()
+
+
+def test_cached_output_path_is_stable(tmp_path):
+    video = tmp_path / 'clip.mp4'
+    video.write_bytes(b'video')
+
+    path = _cached_output_path(str(video), 'upscaled_2.0x', 'realesrgan', 2.0, True, 'cuda', None)
+
+    assert path.parent == OUTPUT_DIR
+    assert path.name.startswith('clip_upscaled_2.0x_') and path.suffix == '.mp4'
+    assert path == _cached_output_path(str(video), 'upscaled_2.0x', 'realesrgan', 2.0, True, 'cuda', None)
+
+
+def test_cached_output_path_changes_with_settings(tmp_path):
+    video = tmp_path / 'clip.mp4'
+    video.write_bytes(b'video')
+
+    base = _cached_output_path(str(video), 'upscaled_2.0x', 'realesrgan', 2.0, True, 'cuda', None)
+
+    assert base != _cached_output_path(str(video), 'upscaled_2.0x', 'realesrgan', 2.0, False, 'cuda', None)
+    assert base != _cached_output_path(str(video), 'upscaled_2.0x', 'realesrgan', 2.0, True, 'cuda', 'hevc_nvenc')
+
+
+def test_cached_output_path_changes_with_the_file(tmp_path):
+    video = tmp_path / 'clip.mp4'
+    video.write_bytes(b'video')
+    before = _cached_output_path(str(video), 'upscaled_2.0x')
+
+    # Replaced in place by another upload
+    video.write_bytes(b'another video')
+    stat = video.stat()
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert _cached_output_path(str(video), 'upscaled_2.0x') != before
+
+
+def test_throttle(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(gradio_app.time, 'monotonic', lambda: now[0])
+
+    calls = []
+    throttled = _throttle(lambda current, total, eta: calls.append(current), interval=0.1)
+
+    throttled(1, 10, 0)
+    throttled(2, 10, 0)      # within 0.1 s: dropped
+    now[0] += 0.2
+    throttled(3, 10, 0)
+    throttled(10, 10, 0)     # the final update always goes through
+
+    assert calls == [1, 3, 10]
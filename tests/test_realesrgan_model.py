@@ -0,0 +1,218 @@
+"""
+Tests for models.realesrgan_model on the CPU
+
+Model tests use randomly initialised weights, so no download is needed:
+they check that the network actually runs, not the quality of its output.
+"""
+
+import contextlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+torch = pytest.importorskip('torch')
+
+from models.realesrgan_model import CUDA_GRAPH_CACHE_SIZE, RealESRGANModel, create_realesrgan_model
+from utils.model_downloader import MODEL_URLS
+
+
+def _image(height=12, width=16, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _bare_model(**attributes):
+    """RealESRGANModel without a network, for testing the batching logic"""
+    model = RealESRGANModel.__new__(RealESRGANModel)
+    model.device = 'cpu'
+    model.max_batch_size = 16
+    model._trunk_cache = None
+    model._cuda_graphs = {}
+    model.__dict__.update(attributes)
+    return model
+
+
+@pytest.fixture(scope='module')
+def model(tmp_path_factory):
+    """4x model on the CPU with random weights"""
+    pytest.importorskip('basicsr')
+    pytest.importorskip('realesrgan')
+    from basicsr.archs.rrdbnet_arch import RRDBNet
+
+    model_dir = tmp_path_factory.mktemp('models')
+    torch.manual_seed(0)
+    network = RRDBNet(num_in_ch=3, num_out_ch=3, num_feat=64, num_block=23, num_grow_ch=32, scale=4)
+    torch.save({'params_ema': network.state_dict()}, model_dir / MODEL_URLS['realesrgan_x4plus']['filename'])
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('VIDEO_UPSCALER_MODEL_DIR', str(model_dir))
+        yield create_realesrgan_model(scale=4, device='cpu', fp16=False)
+
+
+def test_upscale_image_accepts_non_contiguous_input(model):
+    image = _image()
+
+    output = model.upscale_image(image[..., ::-1])
+
+    assert output.shape == (48, 64, 3)
+    np.testing.assert_array_equal(output, model.upscale_image(np.ascontiguousarray(image[..., ::-1])))
+
+
+def test_upscale_image_pil_runs_the_model(model):
+    rgb = _image()
+
+    output = np.asarray(model.upscale_image_pil(Image.fromarray(rgb)))
+
+    # Same result as the BGR array path, and not the Lanczos fallback
+    expected = model.upscale_image(np.ascontiguousarray(rgb[..., ::-1]))[..., ::-1]
+    lanczos = cv2.resize(rgb, (64, 48), interpolation=cv2.INTER_LANCZOS4)
+
+    assert output.shape == (48, 64, 3)
+    np.testing.assert_array_equal(output, expected)
+    assert not np.array_equal(output, lanczos)
+
+
+def test_upscale_batch_oom_retry_keeps_every_frame():
+    model = _bare_model(max_batch_size=8)
+    batch_sizes = []
+
+    def enhance(images, passes, output_size):
+        # Runs out of memory above 3 frames; the output tags each frame
+        batch_sizes.append(len(images))
+        if len(images) > 3:
+            raise torch.cuda.OutOfMemoryError("out of memory")
+        return [image * 2 for image in images]
+
+    model._enhance_tensor = enhance
+    frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(16)]
+
+    outputs = model.upscale_batch(frames)
+
+    assert len(outputs) == 16
+    assert [int(output[0, 0, 0]) for output in outputs] == [2 * i for i in range(16)]
+    assert model.max_batch_size == 2
+    assert max(batch_sizes[batch_sizes.index(2):]) <= 2
+
+
+class _FakeCudaInput:
+    """Stands in for a CUDA tensor of a given shape"""
+
+    device = SimpleNamespace(type='cuda')
+    dtype = 'float16'
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    def stride(self):
+        return (1,) * len(self.shape)
+
+    def clone(self):
+        return _FakeCudaInput(self.shape)
+
+    def copy_(self, other):
+        pass
+
+
+class _FakeGraph:
+    captures = 0
+
+    def __init__(self):
+        _FakeGraph.captures += 1
+        self.replays = 0
+
+    def replay(self):
+        self.replays += 1
+
+
+@pytest.fixture
+def graph_model(monkeypatch):
+    """Model whose _run_network captures fake CUDA graphs around a counting network"""
+    _FakeGraph.captures = 0
+    monkeypatch.setattr(torch.cuda, 'CUDAGraph', _FakeGraph)
+    monkeypatch.setattr(torch.cuda, 'graph', lambda graph: contextlib.nullcontext())
+
+    network_calls = []
+    model = _bare_model(
+        use_cuda_graphs=True,
+        compiled=False,
+        upsampler=SimpleNamespace(model=lambda img: network_calls.append(img.shape) or img.shape)
+    )
+    return model, network_calls
+
+
+def test_cuda_graphs_capture_repeated_shapes_once(graph_model):
+    model, network_calls = graph_model
+    shape = (2, 3, 64, 64)
+
+    for _ in range(10):
+        model._run_network(_FakeCudaInput(shape))
+
+    # One eager warm-up call, the capture, then replays only
+    assert _FakeGraph.captures == 1
+    assert network_calls == [shape, shape]
+
+
+def test_cuda_graphs_cap_does_not_recapture(graph_model):
+    model, network_calls = graph_model
+    # A 3x3 tile grid: edge tiles have their own padded shapes
+    tile_shapes = [(1, 3, h, w) for h in (344, 354, 342) for w in (344, 354, 342)]
+
+    for _ in range(10):
+        for shape in tile_shapes:
+            model._run_network(_FakeCudaInput(shape))
+
+    assert _FakeGraph.captures == CUDA_GRAPH_CACHE_SIZE
+    assert sum(1 for entry in model._cuda_graphs.values() if entry is not False) == CUDA_GRAPH_CACHE_SIZE
+
+    # Shapes past the cap run eagerly every frame instead of recapturing
+    eager_shapes = len(tile_shapes) - CUDA_GRAPH_CACHE_SIZE
+    assert len(network_calls) == len(tile_shapes) + CUDA_GRAPH_CACHE_SIZE + 9 * eager_shapes
+
+
+def test_cuda_graphs_cleared_with_cache(graph_model):
+    model, _ = graph_model
+    for _ in range(2):
+        model._run_network(_FakeCudaInput((1, 3, 32, 32)))
+
+    model.clear_cache()
+
+    assert model._cuda_graphs == {}
+
+
+def test_compile_model_uses_dynamic_shapes(monkeypatch, tmp_path):
+    # Tiles, edge tiles, passes and partial batches all have other shapes
+    compile_calls = []
+
+    def fake_compile(model, **kwargs):
+        compile_calls.append(kwargs)
+        return model
+
+    monkeypatch.setattr(torch, 'compile', fake_compile)
+    monkeypatch.setenv('TORCHINDUCTOR_CACHE_DIR', str(tmp_path))
+
+    network = torch.nn.Conv2d(3, 3, 3, padding=1)
+    model = _bare_model(
+        compiled=False,
+        tile_size=0,
+        dtype=torch.float32,
+        upsampler=SimpleNamespace(model=network, device=torch.device('cpu'), tile_pad=10)
+    )
+
+    assert model.compile_model()
+    assert compile_calls[0]['dynamic'] is True
+    assert model.compiled
+
+
+def test_upscale_batch_passes_and_output_size(model):
+    frames = [_image(8, 10), _image(8, 10)]
+
+    outputs = model.upscale_batch(frames, passes=2, output_size=(80, 64))
+
+    assert [frame.shape for frame in outputs] == [(64, 80, 3)] * 2
@@ -0,0 +1,77 @@
+"""
+Tests for the per-frame trunk output reuse in models.residual_cache
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+torch = pytest.importorskip('torch')
+nn = torch.nn
+
+from models.residual_cache import CachedRRDBTrunk
+
+
+class _Counting(nn.Module):
+    """Doubles its input and records how many frames it ran on"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def forward(self, x):
+        self.batches.append(x.shape[0])
+        return x * 2
+
+
+def _trunk(threshold=0.05):
+    rest = _Counting()
+    return CachedRRDBTrunk(nn.Sequential(nn.Identity(), rest), threshold=threshold), rest
+
+
+def test_residual_cache_reuses_only_unchanged_frames():
+    trunk, rest = _trunk()
+    frames = torch.ones(3, 2, 4, 4)
+    trunk(frames)
+
+    moved = frames.clone()
+    moved[1] += 1.0
+    trunk.next_frame()
+    out = trunk(moved)
+
+    # Only the moved frame goes through the rest of the trunk
+    assert rest.batches == [3, 1]
+    assert trunk.hits == 2
+    torch.testing.assert_close(out, moved * 2)
+
+
+def test_residual_cache_computes_changed_batches():
+    trunk, rest = _trunk()
+    trunk(torch.ones(2, 2, 4, 4))
+
+    trunk.next_frame()
+    out = trunk(torch.full((2, 2, 4, 4), 3.0))
+
+    assert rest.batches == [2, 2]
+    assert trunk.hits == 0
+    torch.testing.assert_close(out, torch.full((2, 2, 4, 4), 6.0))
+
+
+def test_residual_cache_keys_by_call_order():
+    # Two tiles per frame: each compares with the tile at the same position
+    trunk, rest = _trunk()
+    tiles = [torch.ones(1, 2, 4, 4), torch.full((1, 2, 4, 4), 5.0)]
+    for tile in tiles:
+        trunk(tile)
+
+    trunk.next_frame()
+    outputs = [trunk(tile) for tile in tiles]
+
+    assert rest.batches == [1, 1]
+    assert trunk.hits == 2
+    for tile, out in zip(tiles, outputs):
+        torch.testing.assert_close(out, tile * 2)
@@ -0,0 +1,63 @@
+"""
+Tests for the batched warp/blend of models.rife_model on the CPU
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('torch')
+
+from models._rife_impl import RIFEModel
+
+
+def _pairs(count, height=24, width=32):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count + 1)]
+    return list(zip(frames[:-1], frames[1:]))
+
+
+def _gray(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+@pytest.fixture
+def trt_model():
+    """CPU model with a stand-in TensorRT engine built for 2 pairs of 24x32"""
+    model = RIFEModel(device='cpu', flow_backend='farneback')
+    calls = []
+
+    def engine(first, *args):
+        calls.append(tuple(first.shape))
+        return model._warp_blend(first, *args, model._trt_timesteps)
+
+    model._trt_warp = engine
+    model._trt_timesteps = (0.5,)
+    model._trt_shape = (24, 32, 2)
+    return model, calls
+
+
+def test_warp_pairs_uses_trt_engine_for_its_shape(trt_model):
+    model, calls = trt_model
+
+    results = model._warp_pairs_gpu(_pairs(2), 1, _gray)
+
+    assert calls == [(2, 3, 24, 32)]
+    assert len(results) == 2 and results[0][0].shape == (24, 32, 3)
+
+
+@pytest.mark.parametrize('pairs', [_pairs(2, height=48, width=64), _pairs(3)])
+def test_warp_pairs_falls_back_outside_trt_shape(trt_model, pairs):
+    model, calls = trt_model
+
+    results = model._warp_pairs_gpu(pairs, 1, _gray)
+
+    assert calls == []
+    assert len(results) == len(pairs)
+    assert results[0][0].shape == pairs[0][0].shape
@@ -0,0 +1,87 @@
+"""
+Tests for the scale factor handling of processors.spatial_upscaler
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('torch')
+pytest.importorskip('tqdm')
+
+from processors.spatial_upscaler import SpatialUpscaler
+
+
+class _RecordingModel:
+    """Stands in for the 4x model and records how it was called"""
+
+    def __init__(self):
+        self.calls = []
+
+    def upscale_batch(self, frames, passes=1, output_size=None):
+        self.calls.append((passes, output_size))
+        width, height = output_size
+        return [np.zeros((height, width, 3), dtype=np.uint8) for _ in frames]
+
+
+def _upscaler(scale_factor):
+    """Upscaler with the recording model, without loading weights"""
+    upscaler = SpatialUpscaler.__new__(SpatialUpscaler)
+    upscaler.scale_factor = scale_factor
+    upscaler.model = _RecordingModel()
+    upscaler._output_sizes = {}
+    return upscaler
+
+
+@pytest.mark.parametrize('scale_factor, passes', [
+    (8.0, 2),   # 16x, resized down to 8x
+    (12.0, 2),
+    (16.0, 2),  # exactly two 4x passes
+])
+def test_chained_ai_passes(scale_factor, passes):
+    upscaler = _upscaler(scale_factor)
+    frame = np.zeros((10, 20, 3), dtype=np.uint8)
+
+    (output,) = upscaler._chained_ai_frames([frame])
+
+    assert upscaler.model.calls == [(passes, (int(20 * scale_factor), int(10 * scale_factor)))]
+    assert output.shape == (int(10 * scale_factor), int(20 * scale_factor), 3)
+
+
+@pytest.mark.parametrize('scale_factor, method', [
+    (0.5, '_resize_frames'),
+    (1.2, '_resize_frames'),
+    (2.5, '_hybrid_ai_frames'),
+    (3.0, '_hybrid_ai_frames'),
+    (8.0, '_chained_ai_frames'),
+])
+def test_frames_fn_for_scale(scale_factor, method):
+    upscaler = _upscaler(scale_factor)
+
+    assert upscaler._select_frames_fn() == getattr(upscaler, method)
+
+
+def test_exact_scale_uses_model_directly():
+    upscaler = _upscaler(4.0)
+
+    assert upscaler._select_frames_fn() == upscaler.model.upscale_batch
+
+
+@pytest.mark.parametrize('scale_factor, size, interpolation', [
+    (0.5, (24, 32, 3), cv2.INTER_AREA),
+    (1.2, (57, 76, 3), cv2.INTER_LANCZOS4),
+])
+def test_resize_frames(scale_factor, size, interpolation):
+    # No model is loaded below 1.5x
+    upscaler = SpatialUpscaler(scale_factor=scale_factor, device='cpu')
+
+    (output,) = upscaler._resize_frames([np.zeros((48, 64, 3), dtype=np.uint8)])
+
+    assert upscaler._interpolation == interpolation
+    assert output.shape == size
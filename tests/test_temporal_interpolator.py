@@ -0,0 +1,102 @@
+"""
+Tests for the static and scene-cut pair skipping of processors.temporal_interpolator
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('torch')
+
+from processors import temporal_interpolator
+from processors.temporal_interpolator import TemporalInterpolator, _pair_difference
+from utils.system_manager import get_system_manager
+
+
+class _RecordingModel:
+    """Stands in for the interpolation model and records the pairs it gets"""
+
+    def __init__(self):
+        self.pairs = []
+
+    def interpolate_frames_batched(self, pairs, num_intermediates=1):
+        self.pairs.extend(pairs)
+        marker = np.full_like(pairs[0][0], 7)
+        return [[marker] * num_intermediates for _ in pairs]
+
+
+class _RecordingWriter:
+    """Stands in for VideoWriter and keeps the written frames"""
+
+    frames = []
+
+    def __init__(self, *args, **kwargs):
+        _RecordingWriter.frames = []
+
+    def write_frame(self, frame):
+        _RecordingWriter.frames.append(frame)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def _interpolator():
+    """CPU interpolator with the recording model, without loading one"""
+    interpolator = TemporalInterpolator.__new__(TemporalInterpolator)
+    interpolator.model_name = 'rife'
+    interpolator.sys_manager = get_system_manager()
+    interpolator.device = 'cpu'
+    interpolator.batch_size = 8
+    interpolator.static_threshold = 1.0
+    interpolator.scene_cut_threshold = 40.0
+    interpolator.model = _RecordingModel()
+    return interpolator
+
+
+def _frame(value):
+    return np.full((36, 64, 3), value, dtype=np.uint8)
+
+
+def test_pair_difference():
+    assert _pair_difference(_frame(10), _frame(10)) == 0.0
+    assert _pair_difference(_frame(10), _frame(30)) == pytest.approx(20.0)
+
+
+def test_static_and_scene_cut_pairs_skip_the_model(monkeypatch):
+    monkeypatch.setattr(temporal_interpolator, 'VideoWriter', _RecordingWriter)
+    interpolator = _interpolator()
+    # held frame, motion, hard cut, motion
+    frames = [_frame(10), _frame(10), _frame(20), _frame(200), _frame(210)]
+    metadata = {'width': 64, 'height': 36, 'fps': 24.0, 'frame_count': len(frames)}
+
+    result = interpolator.interpolate_stream(iter(frames), metadata, 'out.mp4', 48.0)
+
+    assert result['success']
+    assert result['metrics']['skipped_pairs'] == 2
+    assert [(int(a[0, 0, 0]), int(b[0, 0, 0])) for a, b in interpolator.model.pairs] == [(10, 20), (200, 210)]
+
+    # Skipped pairs repeat their first frame
+    written = [int(frame[0, 0, 0]) for frame in _RecordingWriter.frames]
+    assert written == [10, 10, 10, 7, 20, 20, 200, 7, 210]
+
+
+def test_thresholds_can_disable_skipping(monkeypatch):
+    monkeypatch.setattr(temporal_interpolator, 'VideoWriter', _RecordingWriter)
+    interpolator = _interpolator()
+    interpolator.static_threshold = 0.0
+    interpolator.scene_cut_threshold = 255.0
+    frames = [_frame(10), _frame(10), _frame(200)]
+    metadata = {'width': 64, 'height': 36, 'fps': 24.0, 'frame_count': len(frames)}
+
+    result = interpolator.interpolate_stream(iter(frames), metadata, 'out.mp4', 48.0)
+
+    assert result['metrics']['skipped_pairs'] == 0
+    assert len(interpolator.model.pairs) == 2
@@ -0,0 +1,194 @@
+"""
+Tests for the video metadata probe and file helpers in utils.video_processor
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import video_processor
+from utils.video_processor import (
+    _ffprobe_metadata, _parse_duration, _parse_rate, VideoWriter, clone_or_copy, get_video_info,
+    scratch_path
+)
+
+
+def _fake_ffprobe(monkeypatch, stream, container=None):
+    """Make ffprobe answer with the given stream/format JSON, recording the calls"""
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        output = {'streams': [stream], 'format': container or {}}
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(output).encode())
+
+    monkeypatch.setattr(video_processor.subprocess, 'run', run)
+    return calls
+
+
+def _write_video(path, frames=12, fps=24.0, size=(64, 48)):
+    """Write a small MPEG-4 test video with OpenCV"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 10, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def test_parse_rate():
+    assert _parse_rate('30000/1001') == pytest.approx(29.97, abs=0.01)
+    assert _parse_rate('25') == 25.0
+    assert _parse_rate('0/0') == 0.0
+    assert _parse_rate(None) == 0.0
+
+
+def test_parse_duration():
+    assert _parse_duration('12.5') == 12.5
+    assert _parse_duration('00:01:02.500000000') == pytest.approx(62.5)
+    assert _parse_duration('N/A') == 0.0
+    assert _parse_duration(0) == 0.0
+
+
+def test_probe_mp4_frame_count(monkeypatch):
+    _fake_ffprobe(monkeypatch, {
+        'width': 1920, 'height': 1080, 'r_frame_rate': '30/1', 'avg_frame_rate': '30/1',
+        'nb_frames': '300', 'duration': '10.0', 'codec_tag': '0x31637661'
+    })
+
+    metadata = _ffprobe_metadata('video.mp4')
+
+    assert metadata['resolution'] == (1920, 1080)
+    assert metadata['fps'] == 30.0
+    assert metadata['frame_count'] == 300
+    assert metadata['duration'] == pytest.approx(10.0)
+
+
+def test_probe_mkv_duration_tag(monkeypatch):
+    # Matroska: no nb_frames and no stream duration, only a DURATION tag
+    _fake_ffprobe(monkeypatch, {
+        'width': 1280, 'height': 720, 'r_frame_rate': '25/1', 'avg_frame_rate': '25/1',
+        'tags': {'DURATION': '00:00:04.000000000'}
+    })
+
+    metadata = _ffprobe_metadata('video.mkv')
+
+    assert metadata['frame_count'] == 100
+    assert metadata['duration'] == pytest.approx(4.0)
+
+
+def test_probe_webm_container_duration(monkeypatch):
+    _fake_ffprobe(
+        monkeypatch,
+        {'width': 640, 'height': 360, 'r_frame_rate': '30/1', 'avg_frame_rate': '30/1'},
+        {'duration': '2.000000'}
+    )
+
+    assert _ffprobe_metadata('video.webm')['frame_count'] == 60
+
+
+def test_probe_vfr_prefers_average_rate(monkeypatch):
+    # r_frame_rate is the timebase-derived rate on variable frame rate files
+    _fake_ffprobe(monkeypatch, {
+        'width': 1280, 'height': 720, 'r_frame_rate': '120/1', 'avg_frame_rate': '30/1',
+        'duration': '5.0'
+    })
+
+    metadata = _ffprobe_metadata('phone.mp4')
+
+    assert metadata['fps'] == 30.0
+    assert metadata['frame_count'] == 150
+
+
+def test_probe_rotation_swaps_size(monkeypatch):
+    _fake_ffprobe(monkeypatch, {
+        'width': 1920, 'height': 1080, 'avg_frame_rate': '30/1', 'nb_frames': '30',
+        'side_data_list': [{'rotation': -90}]
+    })
+
+    assert _ffprobe_metadata('portrait.mp4')['resolution'] == (1080, 1920)
+
+
+def test_probe_unknown_length_returns_none(monkeypatch):
+    calls = _fake_ffprobe(monkeypatch, {'width': 640, 'height': 360, 'avg_frame_rate': '25/1'})
+
+    # The fast probe retries with a full probe before giving up
+    assert _ffprobe_metadata('stream.mkv', fast=True) is None
+    assert len(calls) == 2
+    assert '-show_format' in calls[0]
+
+
+def test_get_video_info_falls_back_to_opencv(monkeypatch, tmp_path):
+    path = _write_video(tmp_path / 'clip.mp4', frames=12, fps=24.0)
+    monkeypatch.setattr(video_processor, '_ffprobe_metadata', lambda path, fast=False: None)
+    video_processor._probe.cache_clear()
+
+    metadata = get_video_info(path)
+
+    assert metadata['resolution'] == (64, 48)
+    assert metadata['frame_count'] == 12
+    assert metadata['fps'] == pytest.approx(24.0)
+
+
+def test_clone_or_copy(tmp_path):
+    src = tmp_path / 'src.bin'
+    dst = tmp_path / 'dst.bin'
+    src.write_bytes(b'video data')
+    dst.write_bytes(b'stale output')
+
+    clone_or_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == b'video data'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['dst.bin', 'src.bin']
+
+
+def test_clone_or_copy_output_is_independent(tmp_path):
+    src = tmp_path / 'src.bin'
+    dst = tmp_path / 'dst.bin'
+    src.write_bytes(b'video data')
+
+    clone_or_copy(str(src), str(dst))
+
+    # Writers truncate and rewrite an existing output in place
+    assert not os.path.samefile(src, dst)
+    with open(dst, 'r+b') as f:
+        f.truncate(0)
+        f.write(b'new output')
+
+    assert src.read_bytes() == b'video data'
+
+
+def test_scratch_path_only_for_small_known_sizes():
+    assert scratch_path('.mp4', None) is None
+    assert scratch_path('.mp4', video_processor.SCRATCH_MAX_SIZE + 1) is None
+
+    path = scratch_path('.mp4', 1024)
+    if not os.path.isdir('/dev/shm'):
+        assert path is None
+        return
+
+    try:
+        assert path.startswith('/dev/shm/') and path.endswith('.mp4')
+        assert os.path.getsize(path) == 0
+    finally:
+        os.remove(path)
+
+
+def test_video_writer_close_without_audio_removes_intermediate(tmp_path):
+    source = _write_video(tmp_path / 'source.mp4')
+    output = tmp_path / 'output.mp4'
+
+    writer = VideoWriter(str(output), 24.0, (64, 48), audio_source=source, expected_frames=2)
+    writer.write_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.close(copy_audio=False)
+
+    assert not os.path.exists(writer.temp_path)
+    assert not output.exists()